@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from DeckRenderer import DeckResult, render_deck, render_variants, warm_up
+from DeckImporter import IMPORT_FORMATS, DeckImporter
+from WordParser import load_ipa_lookup
+from IPAFontManager import IPAFontManager
+from EncodingProfiles import DEFAULT_PROFILE, ENCODING_PROFILES
+
+
+@dataclass
+class DeckSpec:
+    name: str
+    input_path: str
+    theme: str = 'green'
+    profile: str = DEFAULT_PROFILE
+    include_intro: bool = True
+    transition: Optional[str] = None
+    variants: Optional[Dict[str, str]] = None  # Word list path per variant (replaces input_path)
+
+
+def collect_decks(input_path: str, theme: str = 'green', profile: str = DEFAULT_PROFILE,
+                  include_intro: bool = True, transition: Optional[str] = None) -> List[DeckSpec]:
+    """
+    Collect the decks to render from a directory or a JSON manifest.
+
+    A directory renders every word list (*.txt) and word bank (*.csv,
+    *.xlsx, *.jsonl, see DeckImporter) in it. A manifest is a JSON
+    list of objects with an "input" path and optional "name", "theme",
+    "profile", "include_intro" and "transition" keys; relative paths are resolved
+    against the manifest's folder. Instead of "input", an object may give
+    "variants": {"vi": "unit8_vi.txt", "en": "unit8_en.txt"}, word lists of
+    the same words with different meanings, rendered together so the
+    variants share audio and card layers.
+
+    Every deck renders into output_root/<name>, so names must be unique:
+    files of a directory sharing a stem are named <stem>_<extension>, and
+    a manifest naming two decks the same is rejected.
+    """
+    path = Path(input_path)
+    if path.is_dir():
+        files = [file for file in sorted(path.iterdir()) if file.suffix.lower() in IMPORT_FORMATS]
+        stems = Counter(file.stem.casefold() for file in files)
+        return [DeckSpec(name=file.stem if stems[file.stem.casefold()] == 1
+                         else f"{file.stem}_{file.suffix[1:].lower()}",
+                         input_path=str(file), theme=theme,
+                         profile=profile, include_intro=include_intro, transition=transition)
+                for file in files]
+
+    if path.suffix.lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        decks = []
+        def resolve(deck_input: str) -> Path:
+            deck_input = Path(deck_input)
+            return deck_input if deck_input.is_absolute() else path.parent / deck_input
+
+        for item in manifest:
+            variants = None
+            if 'variants' in item:
+                variants = {variant: str(resolve(file)) for variant, file in item['variants'].items()}
+                deck_input = Path(next(iter(variants.values()), ''))
+            else:
+                deck_input = resolve(item['input'])
+            decks.append(DeckSpec(
+                name=item.get('name', deck_input.stem),
+                input_path=str(deck_input),
+                variants=variants,
+                theme=item.get('theme', theme),
+                profile=item.get('profile', profile),
+                include_intro=item.get('include_intro', include_intro),
+                transition=item.get('transition', transition)
+            ))
+        _check_unique_names(decks)
+        return decks
+
+    raise ValueError(f"Expected a directory of word lists or a JSON manifest: {input_path}")
+
+
+def _check_unique_names(decks: List[DeckSpec]):
+    # Case-insensitive, as output folders are on Windows
+    seen: Dict[str, DeckSpec] = {}
+    for deck in decks:
+        other = seen.setdefault(deck.name.casefold(), deck)
+        if other is not deck:
+            raise ValueError(f"Duplicate deck name '{deck.name}' ({other.input_path} and "
+                             f"{deck.input_path}); give each deck a unique \"name\"")
+
+
+def _read_text(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _render_spec(spec: DeckSpec, output_root: str) -> List[DeckResult]:
+    """Worker entry point: read one word list, word bank or set of variants and render it"""
+    output_dir = os.path.join(output_root, spec.name)
+    options = dict(theme=spec.theme, profile=spec.profile,
+                   include_intro=spec.include_intro, transition=spec.transition)
+    try:
+        if spec.variants:
+            texts = {variant: _read_text(file) for variant, file in spec.variants.items()}
+            return render_variants(spec.name, output_dir, texts, **options)
+        if spec.input_path.lower().endswith('.txt'):
+            return [render_deck(spec.name, output_dir, text=_read_text(spec.input_path), **options)]
+        deck, report = DeckImporter(load_ipa_lookup()).import_file(spec.input_path)
+    except (OSError, ValueError, RuntimeError) as e:
+        return [DeckResult(name=spec.name, status='failed', error=str(e))]
+
+    if report.errors:
+        print(f"Warning: {spec.name}: {report.summary()}")
+    return [render_deck(spec.name, output_dir, entries=deck, **options)]
+
+
+def run_batch(decks: List[DeckSpec], output_root: str, workers: Optional[int] = None,
+              data_dir: str = ".") -> dict:
+    """
+    Render decks across a pool of worker processes.
+
+    Each worker loads dictionaries, fonts and the card template once and
+    reuses them for every deck it renders.
+
+    Returns:
+        Summary with per-deck timings and failures (also saved as
+        batch_summary.json in the output folder)
+    """
+    os.makedirs(output_root, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    started = datetime.now()
+    start = time.perf_counter()
+
+    results = []
+    finished = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up,
+                             initargs=(data_dir,)) as executor:
+        futures = {executor.submit(_render_spec, spec, output_root): spec for spec in decks}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                spec_results = future.result()
+            except Exception as e:
+                spec_results = [DeckResult(name=spec.name, status='failed', error=str(e))]
+            finished += 1
+            for result in spec_results:
+                results.append((decks.index(spec), result))
+                print(f"[{finished}/{len(decks)}] {result.name}: {result.status}"
+                      + (f" ({result.render_seconds:.1f}s)" if result.status == 'ok' else f" - {result.error}"))
+
+    # Manifest order; variants keep their order within a deck
+    results = [result for _, result in sorted(results, key=lambda item: item[0])]
+    text_cache_hits = sum(r.text_cache_hits for r in results)
+    text_cache_lookups = text_cache_hits + sum(r.text_cache_misses for r in results)
+    summary = {
+        'started': started.isoformat(),
+        'total_seconds': time.perf_counter() - start,
+        'workers': workers,
+        'decks': len(results),
+        'succeeded': sum(1 for r in results if r.status == 'ok'),
+        'failed': sum(1 for r in results if r.status != 'ok'),
+        'text_cache_hit_rate': text_cache_hits / text_cache_lookups if text_cache_lookups else 0.0,
+        'results': [r.to_dict() for r in results]
+    }
+    with open(os.path.join(output_root, "batch_summary.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render flashcard videos for many word lists')
+    parser.add_argument('input', help='Directory of word lists / word banks or a JSON manifest')
+    parser.add_argument('--output', default='batch_output', help='Output folder (default: batch_output)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--theme', default='green', help='Card theme (default: green)')
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, choices=list(ENCODING_PROFILES.keys()),
+                        help=f'Encoding profile (default: {DEFAULT_PROFILE})')
+    parser.add_argument('--no-intro', action='store_true', help='Skip intro and outro')
+    parser.add_argument('--transition', choices=['fade', 'slide', 'zoom'], default=None,
+                        help='Transition between cards (default: none)')
+    parser.add_argument('--data-dir', default='.', help='Folder containing en_UK.txt / en_US.txt')
+    args = parser.parse_args()
+
+    try:
+        decks = collect_decks(args.input, args.theme, args.profile, not args.no_intro, args.transition)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    if not decks:
+        print(f"No word lists or word banks found in {args.input}")
+        sys.exit(1)
+
+    # Download the IPA font now, if missing, rather than in every worker
+    if not IPAFontManager().ensure_font():
+        print("Warning: No IPA font available; pronunciations may not render correctly")
+
+    summary = run_batch(decks, args.output, args.workers, args.data_dir)
+    print(f"\nRendered {summary['succeeded']}/{summary['decks']} decks "
+          f"in {summary['total_seconds']:.1f}s ({summary['failed']} failed)")
+    sys.exit(1 if summary['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+from PIL import ImageFont
+
+from FontRegistry import load_face
+
+
+@dataclass(frozen=True)
+class TextBox:
+    center_y: int
+    max_width: int
+    max_height: int
+    max_lines: int = 1
+
+
+@dataclass(frozen=True)
+class FittedText:
+    lines: Tuple[str, ...]
+    size: int
+    line_height: int
+    fits: bool  # False when even the minimum size overflows the box
+
+    def line_centers(self, center_y: int) -> Tuple[int, ...]:
+        """Vertical centre of every line for a block centred on center_y"""
+        offset = (len(self.lines) - 1) / 2
+        return tuple(int(center_y + (i - offset) * self.line_height) for i in range(len(self.lines)))
+
+
+class LayoutEngine:
+    """
+    Wraps and sizes card text to fit its box.
+
+    The largest font size that fits is found by binary search (a bounded
+    number of wrap attempts), string widths are measured once per
+    (text, font, size) and finished layouts are memoized per
+    (text, font, size range, box).
+    """
+
+    def __init__(self, max_layouts: int = 2048, max_measurements: int = 16384):
+        self.max_layouts = max_layouts
+        self.max_measurements = max_measurements
+        self._layouts: 'OrderedDict[tuple, FittedText]' = OrderedDict()
+        self._widths: 'OrderedDict[tuple, int]' = OrderedDict()
+        self.measurements = 0  # textbbox calls actually made
+
+    def width(self, text: str, font: ImageFont.FreeTypeFont) -> int:
+        """Rendered width of a single line (cached)"""
+        key = (text, font.path, font.size)
+        if key in self._widths:
+            self._widths.move_to_end(key)
+            return self._widths[key]
+        left, _, right, _ = font.getbbox(text)
+        self.measurements += 1
+        self._widths[key] = right - left
+        if len(self._widths) > self.max_measurements:
+            self._widths.popitem(last=False)
+        return self._widths[key]
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def line_height(font_path: str, size: int) -> int:
+        ascent, descent = load_face(font_path, size).getmetrics()
+        return ascent + descent
+
+    def wrap(self, text: str, font: ImageFont.FreeTypeFont, max_width: int,
+             max_lines: int) -> Optional[Tuple[str, ...]]:
+        """
+        Greedy word wrap.
+
+        Returns:
+            The lines, or None if the text needs more than max_lines lines or
+            a single word is wider than max_width
+        """
+        lines = []
+        current = ''
+        for word in text.split():
+            candidate = f"{current} {word}" if current else word
+            if self.width(candidate, font) <= max_width:
+                current = candidate
+                continue
+            if not current or len(lines) + 1 >= max_lines:
+                return None
+            lines.append(current)
+            current = word
+            if self.width(current, font) > max_width:
+                return None
+        lines.append(current)
+        return tuple(lines)
+
+    def _try_size(self, text: str, font_path: str, size: int,
+                  box: TextBox) -> Optional[FittedText]:
+        lines = self.wrap(text, load_face(font_path, size), box.max_width, box.max_lines)
+        if lines is None:
+            return None
+        line_height = self.line_height(font_path, size)
+        if len(lines) > 1 and len(lines) * line_height > box.max_height:
+            return None
+        return FittedText(lines, size, line_height, True)
+
+    def fit(self, text: str, font_path: str, size: int, box: TextBox,
+            min_size: Optional[int] = None) -> FittedText:
+        """
+        Largest layout of `text` in `box`, at most at `size`.
+
+        Args:
+            text: String to lay out
+            font_path: Font file
+            size: Preferred (maximum) font size
+            box: Width, height and line limit of the text's slot
+            min_size: Smallest acceptable size (default: half of size)
+
+        Returns:
+            The fitted lines; when nothing fits, the text on one line at
+            min_size with fits=False
+        """
+        min_size = min_size or max(8, size // 2)
+        key = (text, font_path, size, min_size, box)
+        if key in self._layouts:
+            self._layouts.move_to_end(key)
+            return self._layouts[key]
+
+        fitted = self._try_size(text, font_path, size, box)
+        if fitted is None:
+            # Binary search for the largest size that fits
+            low, high = min_size, size - 1
+            while low <= high:
+                middle = (low + high) // 2
+                attempt = self._try_size(text, font_path, middle, box)
+                if attempt is None:
+                    high = middle - 1
+                else:
+                    fitted, low = attempt, middle + 1
+        if fitted is None:
+            fitted = FittedText((text,), min_size, self.line_height(font_path, min_size), False)
+
+        self._layouts[key] = fitted
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return fitted
+
+
+@lru_cache(maxsize=1)
+def get_layout_engine() -> LayoutEngine:
+    """Layout engine shared by every card rendered in this process"""
+    return LayoutEngine()
@@ -0,0 +1,299 @@
+import json
+import os
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import numpy as np
+
+from WordEntry import WordEntry
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only the Parquet methods need it
+    pa = None
+    pq = None
+
+STRING_COLUMNS = ('word', 'word_type', 'meaning', 'pronunciation', 'irregular_forms')
+NO_NUMBER = -1  # Stored number of entries without one
+FORM_SEPARATOR = " - "  # Irregular forms are stored joined, as written in word lists
+
+
+class StringPool:
+    """
+    Interned strings addressed by integer codes; code 0 is None.
+
+    Word types, pronunciations and meanings repeat heavily across a word
+    bank, so every distinct string is stored once and columns hold codes.
+    """
+
+    def __init__(self):
+        self._strings: List[Optional[str]] = [None]
+        self._codes: Dict[str, int] = {}
+        self._ranks: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, code: int) -> Optional[str]:
+        return self._strings[code]
+
+    def code(self, text: Optional[str]) -> int:
+        """Code of a string, adding it to the pool if new"""
+        if text is None:
+            return 0
+        code = self._codes.get(text)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(sys.intern(text))
+            self._codes[text] = code
+            self._ranks = None
+        return code
+
+    def find(self, text: Optional[str]) -> Optional[int]:
+        """Code of a string already in the pool, or None"""
+        return 0 if text is None else self._codes.get(text)
+
+    def ranks(self) -> np.ndarray:
+        """Sort rank of every code (None first), recomputed when strings are added"""
+        if self._ranks is None or len(self._ranks) != len(self._strings):
+            order = sorted(range(1, len(self._strings)), key=self._strings.__getitem__)
+            ranks = np.zeros(len(self._strings), dtype=np.int64)
+            ranks[order] = np.arange(1, len(order) + 1)
+            self._ranks = ranks
+        return self._ranks
+
+    def evaluate(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """predicate applied once per distinct string (False for None), indexed by code"""
+        return np.fromiter((text is not None and bool(predicate(text)) for text in self._strings),
+                           dtype=bool, count=len(self._strings))
+
+
+class Deck:
+    """
+    Columnar, memory-compact list of word entries.
+
+    Strings are interned in a StringPool shared by every deck derived from
+    this one; each column is an array of codes (numbers an array of ints),
+    about 28 bytes per entry plus each distinct string once. Decks behave
+    like sequences of WordEntry (len, iteration, indexing and slicing), so
+    they can be passed wherever entry lists are accepted, and filter, sort
+    and dedupe work on whole columns instead of entry objects.
+    """
+
+    def __init__(self, pool: Optional[StringPool] = None):
+        self.pool = pool or StringPool()
+        self._columns: Dict[str, array] = {name: array('i') for name in STRING_COLUMNS}
+        self._numbers = array('q')
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[WordEntry], pool: Optional[StringPool] = None) -> 'Deck':
+        deck = cls(pool)
+        deck.extend(entries)
+        return deck
+
+    # Sequence interface
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __iter__(self) -> Iterator[WordEntry]:
+        for index in range(len(self)):
+            yield self._entry(index)
+
+    def __getitem__(self, index: Union[int, slice, Sequence[int], np.ndarray]) -> Union[WordEntry, 'Deck']:
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("Deck index out of range")
+            return self._entry(int(index))
+        if isinstance(index, slice):
+            return self._take(np.arange(len(self))[index])
+        index = np.asarray(index)
+        if index.dtype == bool:
+            if len(index) != len(self):
+                raise IndexError(f"Mask of {len(index)} values for a deck of {len(self)} entries")
+            return self.filter(index)
+        return self._take(index)
+
+    def __repr__(self) -> str:
+        return f"Deck({len(self)} entries, {len(self.pool)} distinct strings)"
+
+    def _entry(self, index: int) -> WordEntry:
+        pool = self.pool
+        forms = pool[self._columns['irregular_forms'][index]]
+        number = self._numbers[index]
+        return WordEntry(
+            word=pool[self._columns['word'][index]],
+            word_type=pool[self._columns['word_type'][index]],
+            meaning=pool[self._columns['meaning'][index]],
+            pronunciation=pool[self._columns['pronunciation'][index]],
+            number=None if number == NO_NUMBER else number,
+            irregular_forms=forms.split(FORM_SEPARATOR) if forms is not None else None
+        )
+
+    def to_entries(self) -> List[WordEntry]:
+        return list(self)
+
+    # Building
+
+    def append(self, entry: WordEntry):
+        code = self.pool.code
+        columns = self._columns
+        columns['word'].append(code(entry.word))
+        columns['word_type'].append(code(entry.word_type))
+        columns['meaning'].append(code(entry.meaning))
+        columns['pronunciation'].append(code(entry.pronunciation))
+        columns['irregular_forms'].append(
+            code(FORM_SEPARATOR.join(entry.irregular_forms)) if entry.irregular_forms else 0)
+        self._numbers.append(NO_NUMBER if entry.number is None else entry.number)
+
+    def extend(self, entries: Iterable[WordEntry]):
+        for entry in entries:
+            self.append(entry)
+
+    # Columns
+
+    def codes(self, column: str) -> np.ndarray:
+        """String codes of a column (a read-only view, no copy)"""
+        if column not in self._columns:
+            raise ValueError(f"Column '{column}' not found. Available columns: {list(STRING_COLUMNS)}")
+        return np.frombuffer(self._columns[column], dtype=np.intc)
+
+    def numbers(self) -> np.ndarray:
+        """Entry numbers (NO_NUMBER where missing, a read-only view)"""
+        return np.frombuffer(self._numbers, dtype=np.int64)
+
+    def column(self, column: str) -> List:
+        """Values of one column as a list"""
+        if column == 'number':
+            return [None if n == NO_NUMBER else n for n in self._numbers]
+        pool = self.pool
+        return [pool[code] for code in self._columns[column]]
+
+    def _sort_key(self, column: str) -> np.ndarray:
+        if column == 'number':
+            return self.numbers()
+        return self.pool.ranks()[self.codes(column)]
+
+    # Vectorized operations
+
+    def isin(self, column: str, values: Iterable[Optional[str]]) -> np.ndarray:
+        """Mask of entries whose column equals one of values"""
+        if column == 'number':
+            return np.isin(self.numbers(), [NO_NUMBER if v is None else v for v in values])
+        codes = [self.pool.find(value) for value in values]
+        return np.isin(self.codes(column), [code for code in codes if code is not None])
+
+    def matches(self, column: str, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Mask of entries whose column satisfies predicate (evaluated once per distinct string)"""
+        return self.pool.evaluate(predicate)[self.codes(column)]
+
+    def filter(self, mask: np.ndarray) -> 'Deck':
+        """Entries where mask is True, in order"""
+        return self._take(np.flatnonzero(mask))
+
+    def sort(self, by: Union[str, Sequence[str]] = 'word', descending: bool = False) -> 'Deck':
+        """Stable sort by one or more columns"""
+        columns = [by] if isinstance(by, str) else list(by)
+        # lexsort treats the last key as the primary one; descending negates
+        # the keys (rather than reversing the order) so ties keep their order
+        keys = [self._sort_key(column) for column in reversed(columns)]
+        order = np.lexsort([-key for key in keys] if descending else keys)
+        return self._take(order)
+
+    def dedupe(self, by: Sequence[str] = ('word', 'word_type')) -> 'Deck':
+        """Keep the first entry of every distinct combination of the given columns"""
+        if not len(self):
+            return self._take(np.arange(0))
+        keys = np.stack([self.numbers() if column == 'number' else self.codes(column).astype(np.int64)
+                         for column in by], axis=1)
+        _, first = np.unique(keys, axis=0, return_index=True)
+        return self._take(np.sort(first))
+
+    def concat(self, other: 'Deck') -> 'Deck':
+        """This deck followed by other (re-coded into this deck's pool if needed)"""
+        if other.pool is not self.pool:
+            other = Deck.from_entries(other, self.pool)
+        deck = self._take(np.arange(len(self)))
+        for name in STRING_COLUMNS:
+            deck._columns[name].extend(other._columns[name])
+        deck._numbers.extend(other._numbers)
+        return deck
+
+    def _take(self, indices: np.ndarray) -> 'Deck':
+        deck = Deck(self.pool)
+        indices = indices.astype(np.intp, copy=False)
+        for name in STRING_COLUMNS:
+            deck._columns[name].frombytes(self.codes(name)[indices].tobytes())
+        deck._numbers.frombytes(self.numbers()[indices].tobytes())
+        return deck
+
+    # Serialization
+
+    def write_jsonl(self, path: str):
+        """Write one JSON object per entry, streaming"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self:
+                f.write(json.dumps(entry_to_dict(entry), ensure_ascii=False))
+                f.write("\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read_jsonl(cls, path: str, pool: Optional[StringPool] = None) -> 'Deck':
+        return cls.from_entries(iter_jsonl(path), pool)
+
+    def write_parquet(self, path: str, row_group_size: int = 16384):
+        """Write the deck as Parquet (dictionary-encoded strings), one row group at a time"""
+        _require_pyarrow()
+        schema = pa.schema([(name, pa.string()) for name in STRING_COLUMNS[:-1]]
+                           + [('number', pa.int64()), ('irregular_forms', pa.list_(pa.string()))])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for start in range(0, len(self), row_group_size):
+                part = self[start:start + row_group_size]
+                columns = {name: part.column(name) for name in STRING_COLUMNS[:-1]}
+                columns['number'] = part.column('number')
+                columns['irregular_forms'] = [entry.irregular_forms for entry in part]
+                writer.write_table(pa.table(columns, schema=schema))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read_parquet(cls, path: str, pool: Optional[StringPool] = None,
+                     batch_size: int = 16384) -> 'Deck':
+        """Read a deck written by write_parquet, one batch at a time"""
+        _require_pyarrow()
+        deck = cls(pool)
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            deck.extend(WordEntry(**row) for row in batch.to_pylist())
+        return deck
+
+
+def entry_to_dict(entry: WordEntry) -> dict:
+    return {
+        'word': entry.word,
+        'word_type': entry.word_type,
+        'meaning': entry.meaning,
+        'pronunciation': entry.pronunciation,
+        'number': entry.number,
+        'irregular_forms': entry.irregular_forms
+    }
+
+
+def iter_jsonl(path: str) -> Iterator[WordEntry]:
+    """Entries of a JSONL deck file, one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield WordEntry(**json.loads(line))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Invalid deck entry on line {line_number} of {path}: {e}") from e
+
+
+def _require_pyarrow():
+    if pq is None:
+        raise RuntimeError("Parquet decks need pyarrow: pip install pyarrow")
@@ -0,0 +1,299 @@
+import csv
+import json
+import os
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from WordEntry import WordEntry
+from WordParser import WordParser
+from OpenDictIPA import OpenDictIPA
+from Deck import Deck
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # openpyxl is optional; only .xlsx imports need it
+    load_workbook = None
+
+IMPORT_FORMATS = {'.txt': 'text', '.csv': 'csv', '.xlsx': 'xlsx', '.jsonl': 'jsonl'}
+
+# Header names (lowercased) accepted for each field
+COLUMN_ALIASES = {
+    'word': ('word', 'term', 'vocabulary', 'từ', 'từ vựng'),
+    'word_type': ('word_type', 'type', 'pos', 'part of speech', 'loại từ'),
+    'meaning': ('meaning', 'definition', 'translation', 'nghĩa'),
+    'pronunciation': ('pronunciation', 'ipa', 'phiên âm'),
+    'number': ('number', 'no', 'no.', '#', 'stt')
+}
+_HEADER_FIELDS = {alias: name for name, aliases in COLUMN_ALIASES.items() for alias in aliases}
+# Column order of spreadsheets without a header row
+POSITIONAL_FIELDS = ('word', 'word_type', 'meaning', 'pronunciation')
+TWO_COLUMN_FIELDS = ('word', 'meaning')  # Headerless banks with just two columns
+
+_SPACES = re.compile(r'\s+')
+_WORD_TYPE = re.compile(r'^\(?\s*([a-z]+)\.?\s*\)?$')
+_PRONUNCIATION = re.compile(r'^/?\s*([^/]+?)\s*/?$')
+_NUMBER = re.compile(r'^\d+(?:\.0+)?$')  # Spreadsheets often store numbers as floats
+
+
+@dataclass
+class RowError:
+    row: int  # Line (text, CSV, JSONL) or sheet row (XLSX), 1-based
+    message: str
+
+
+@dataclass
+class ImportReport:
+    source: str
+    rows: int = 0
+    imported: int = 0
+    enriched: int = 0  # Pronunciations filled in from the dictionary
+    seconds: float = 0.0
+    errors: List[RowError] = field(default_factory=list)
+
+    def summary(self, max_errors: int = 5) -> str:
+        """One line per problem, for logs and the UI"""
+        lines = [f"Imported {self.imported}/{self.rows} rows from {os.path.basename(self.source)} "
+                 f"in {self.seconds:.1f}s ({self.enriched} pronunciations looked up, "
+                 f"{len(self.errors)} rows skipped)"]
+        lines += [f"Row {error.row}: {error.message}" for error in self.errors[:max_errors]]
+        if len(self.errors) > max_errors:
+            lines.append(f"... and {len(self.errors) - max_errors} more")
+        return "\n".join(lines)
+
+
+class DeckImporter:
+    """
+    Streaming import of word banks into a Deck.
+
+    Rows are read one at a time from text word lists, CSV, XLSX or JSONL,
+    validated and normalized with precompiled patterns and collected in
+    chunks; each chunk's missing pronunciations are looked up once per
+    distinct word before the chunk is appended to the deck. Invalid rows
+    are skipped and reported with their row number instead of failing
+    the whole import.
+    """
+
+    def __init__(self, ipa_lookup: Optional[OpenDictIPA] = None, chunk_size: int = 1000):
+        """
+        Args:
+            ipa_lookup: Dictionary for missing pronunciations (None: no lookup)
+            chunk_size: Rows validated and enriched per batch
+        """
+        self.ipa_lookup = ipa_lookup
+        self.chunk_size = chunk_size
+        # Text rows are split by the word list parser; lookup happens per chunk
+        self._line_parser = WordParser()
+        self._ipa_parser = WordParser(ipa_lookup=ipa_lookup)
+        self._pronunciations: Dict[str, Optional[str]] = {}
+
+    def import_file(self, path: str, deck: Optional[Deck] = None,
+                    progress: Optional[Callable[[int], None]] = None) -> Tuple[Deck, ImportReport]:
+        """
+        Import a word bank file.
+
+        Args:
+            path: .txt, .csv, .xlsx or .jsonl file
+            deck: Deck to append to (default: a new one)
+            progress: Optional callback receiving the number of rows read after each chunk
+
+        Returns:
+            The deck and a report of imported rows and row errors
+        """
+        file_format = IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise ValueError(f"Unsupported word bank format: {path}. "
+                             f"Supported: {', '.join(IMPORT_FORMATS)}")
+        rows = getattr(self, f"_{file_format}_rows")(path)
+        return self._import(rows, path, deck, progress)
+
+    def import_text(self, text: str, deck: Optional[Deck] = None) -> Tuple[Deck, ImportReport]:
+        """Import word list text (the format typed into the app)"""
+        return self._import(self._text_lines(text.split("\n")), "text", deck, None)
+
+    def _import(self, rows: Iterator[Tuple[int, Union[str, dict]]], source: str,
+                deck: Optional[Deck], progress: Optional[Callable[[int], None]]) -> Tuple[Deck, ImportReport]:
+        start = time.perf_counter()
+        deck = deck if deck is not None else Deck()
+        report = ImportReport(source=source)
+        chunk: List[WordEntry] = []
+        for row_number, row in rows:
+            report.rows += 1
+            try:
+                entry = self.normalize(row, report.rows)
+            except ValueError as e:
+                report.errors.append(RowError(row_number, str(e)))
+                continue
+            chunk.append(entry)
+            if len(chunk) >= self.chunk_size:
+                report.enriched += self._flush(chunk, deck)
+                if progress:
+                    progress(report.rows)
+        report.enriched += self._flush(chunk, deck)
+        if progress:
+            progress(report.rows)
+        report.imported = report.rows - len(report.errors)
+        report.seconds = time.perf_counter() - start
+        return deck, report
+
+    def _flush(self, chunk: List[WordEntry], deck: Deck) -> int:
+        enriched = self.enrich(chunk)
+        deck.extend(chunk)
+        chunk.clear()
+        return enriched
+
+    # Row readers: yield (row number, raw line or field dict)
+
+    def _text_lines(self, lines) -> Iterator[Tuple[int, str]]:
+        for row_number, line in enumerate(lines, 1):
+            if line.strip():
+                yield row_number, line
+
+    def _text_rows(self, path: str) -> Iterator[Tuple[int, str]]:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            yield from self._text_lines(f)
+
+    def _csv_rows(self, path: str) -> Iterator[Tuple[int, dict]]:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            yield from self._table_rows(csv.reader(f, dialect))
+
+    def _xlsx_rows(self, path: str) -> Iterator[Tuple[int, dict]]:
+        if load_workbook is None:
+            raise RuntimeError("Importing .xlsx word banks needs openpyxl: pip install openpyxl")
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from self._table_rows(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    def _jsonl_rows(self, path: str) -> Iterator[Tuple[int, dict]]:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for row_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = {'_error': f"Invalid JSON: {e}"}
+                if not isinstance(row, dict):
+                    row = {'_error': "Expected a JSON object"}
+                yield row_number, {_HEADER_FIELDS.get(str(key).strip().lower(), key): value
+                                   for key, value in row.items()}
+
+    def _table_rows(self, rows) -> Iterator[Tuple[int, dict]]:
+        """Rows of a sheet: named by its header row, or positional without one"""
+        fields = None
+        positional = False
+        for row_number, values in enumerate(rows, 1):
+            values = ['' if value is None else str(value) for value in values]
+            if not any(value.strip() for value in values):
+                continue
+            if fields is None:
+                header = [_HEADER_FIELDS.get(value.strip().lower()) for value in values]
+                if 'word' in header:
+                    fields = header
+                    continue
+                positional = True
+            if positional:
+                # Trailing empty cells (e.g. unused sheet columns) don't count
+                while not values[-1].strip():
+                    values.pop()
+                fields = TWO_COLUMN_FIELDS if len(values) == 2 else POSITIONAL_FIELDS
+            yield row_number, {name: value for name, value in zip(fields, values) if name}
+
+    # Validation
+
+    def normalize(self, row: Union[str, dict], index: int) -> WordEntry:
+        """
+        Validate one raw row and build its entry.
+
+        Args:
+            row: A word list line or a dict of fields
+            index: Position of the row among non-empty rows (default entry number)
+
+        Raises:
+            ValueError: The row is missing a word or meaning or has an invalid field
+        """
+        if isinstance(row, str):
+            return self._line_parser.parse_line(row, index)
+        if '_error' in row:
+            raise ValueError(row['_error'])
+
+        word = _clean(row.get('word'))
+        meaning = _clean(row.get('meaning'))
+        if not word:
+            raise ValueError("Missing word")
+        if not meaning:
+            raise ValueError(f"Missing meaning for '{word}'")
+
+        word_type = _clean(row.get('word_type'))
+        if word_type:
+            match = _WORD_TYPE.match(word_type.lower())
+            if not match:
+                raise ValueError(f"Invalid word type '{word_type}'")
+            word_type = match.group(1)
+
+        pronunciation = _clean(row.get('pronunciation'))
+        if pronunciation:
+            match = _PRONUNCIATION.match(pronunciation)
+            if not match:
+                raise ValueError(f"Invalid pronunciation '{pronunciation}'")
+            pronunciation = self._ipa_parser.normalize_pronunciation(match.group(1))
+
+        number = _clean(row.get('number'))
+        if number:
+            if not _NUMBER.match(number):
+                raise ValueError(f"Invalid number '{number}'")
+            number = int(float(number))
+        else:
+            number = None
+
+        irregular_forms = row.get('irregular_forms')
+        if not irregular_forms and " - " in word:
+            irregular_forms = [form.strip() for form in word.split(" - ")]
+        return WordEntry(word=word, word_type=word_type or None, meaning=meaning,
+                         pronunciation=pronunciation or None, number=index if number is None else number,
+                         irregular_forms=irregular_forms or None)
+
+    # Enrichment
+
+    def enrich(self, entries: List[WordEntry]) -> int:
+        """
+        Fill in missing pronunciations, looking up each distinct word once.
+
+        Irregular forms get the forms' pronunciations joined with '-' (only
+        when every form is found).
+
+        Returns:
+            Number of entries that received a pronunciation
+        """
+        if self.ipa_lookup is None:
+            return 0
+        missing = [entry for entry in entries if not entry.pronunciation]
+        words = {form for entry in missing for form in (entry.irregular_forms or [entry.word])}
+        for word in words - self._pronunciations.keys():
+            found = self._ipa_parser.get_pronunciation(word)
+            self._pronunciations[word] = self._ipa_parser.normalize_pronunciation(found[0]) if found else None
+
+        enriched = 0
+        for entry in missing:
+            forms = [self._pronunciations[form] for form in (entry.irregular_forms or [entry.word])]
+            if all(forms):
+                entry.pronunciation = "-".join(forms)
+                enriched += 1
+        return enriched
+
+
+def _clean(value) -> str:
+    """Field value as NFC text with collapsed whitespace"""
+    if value is None:
+        return ''
+    return _SPACES.sub(' ', unicodedata.normalize('NFC', str(value))).strip()
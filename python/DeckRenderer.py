@@ -0,0 +1,271 @@
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from WordEntry import WordEntry
+from WordParser import WordParser, load_ipa_lookup
+from FlashcardGenerator import FlashcardGenerator, RenderCancelled
+from EnhancedFlashcardGenerator import EnhancedFlashcardGenerator
+from EncodingProfiles import DEFAULT_PROFILE
+from PreviewRenderer import PreviewRenderer
+from TextRasterCache import get_text_cache
+
+
+@dataclass
+class DeckResult:
+    name: str
+    status: str  # 'ok', 'failed' or 'cancelled'
+    output_path: Optional[str] = None
+    cards: int = 0
+    parse_seconds: float = 0.0
+    render_seconds: float = 0.0
+    error: Optional[str] = None
+    text_cache_hits: int = 0  # Text bitmaps reused from / added to the process text cache
+    text_cache_misses: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def add_text_cache_usage(self, since: Tuple[int, int]):
+        """Count the text cache lookups made since the _text_cache_counts() snapshot"""
+        hits, misses = _text_cache_counts()
+        self.text_cache_hits += hits - since[0]
+        self.text_cache_misses += misses - since[1]
+
+
+def _text_cache_counts() -> Tuple[int, int]:
+    stats = get_text_cache().stats
+    return stats.hits, stats.misses
+
+
+def warm_up(data_dir: str = ".", background_path: str = "bg.jpg"):
+    """
+    Load dictionaries, fonts and the card template once for this process.
+
+    Used as the initializer of render worker processes so every deck a
+    worker renders reuses the same loaded resources.
+    """
+    load_ipa_lookup(data_dir)
+    FlashcardGenerator.preload(background_path)
+
+
+def render_deck(name: str, output_dir: str, text: Optional[str] = None,
+                entries: Optional[Sequence[WordEntry]] = None,
+                theme: str = 'green', profile: str = DEFAULT_PROFILE,
+                include_intro: bool = True, keep_intermediate: bool = False,
+                progress: Optional[Callable[[str, float], None]] = None,
+                transition: Optional[str] = None) -> DeckResult:
+    """
+    Render one deck from word list text or already parsed entries.
+
+    Args:
+        name: Deck name used in results and logs
+        output_dir: Directory for this deck's files
+        text: Word list in the text format accepted by WordParser
+        entries: Parsed entries or a Deck (skips parsing when given)
+        theme: EnhancedFlashcardGenerator theme name
+        profile: Encoding profile name
+        include_intro: Add intro and outro sequences
+        keep_intermediate: Keep card images instead of cleaning them up
+        progress: Optional callback receiving (stage, fraction); it may raise
+                  RenderCancelled to stop the render between stages
+        transition: Optional transition between cards ('fade', 'slide' or 'zoom')
+
+    Returns:
+        DeckResult describing the output or the failure
+    """
+    result = DeckResult(name=name, status='failed')
+    generator = None
+    text_cache_counts = _text_cache_counts()
+    try:
+        start = time.perf_counter()
+        if entries is None:
+            parser = WordParser(ipa_lookup=load_ipa_lookup())
+            entries = parser.parse_deck(text or "")
+        result.parse_seconds = time.perf_counter() - start
+        result.cards = len(entries)
+        if not entries:
+            raise ValueError("No valid entries found in the input text")
+
+        start = time.perf_counter()
+        generator = EnhancedFlashcardGenerator(output_dir)
+        generator.set_theme(theme)
+        result.output_path = generator.create_video(
+            entries, include_intro=include_intro, profile=profile, progress=progress,
+            transition=transition)
+        result.render_seconds = time.perf_counter() - start
+        result.status = 'ok'
+    except RenderCancelled:
+        result.status = 'cancelled'
+    except Exception as e:
+        result.error = str(e)
+        print(f"Error rendering deck {name}: {str(e)}")
+    finally:
+        result.add_text_cache_usage(text_cache_counts)
+        if generator is not None and not keep_intermediate:
+            generator.cleanup()
+    return result
+
+
+def render_variants(name: str, output_dir: str, variants: Dict[str, str],
+                    theme: str = 'green', profile: str = DEFAULT_PROFILE,
+                    include_intro: bool = True, keep_intermediate: bool = False,
+                    progress: Optional[Callable[[str, float], None]] = None,
+                    transition: Optional[str] = None) -> List[DeckResult]:
+    """
+    Render several decks of the same words that differ only in their meanings
+    (e.g. Vietnamese meanings for students, English definitions for teachers).
+
+    Every word's head layer (background, word, type, IPA) is drawn once and
+    finished per variant with its own meaning; narration comes from the
+    shared audio cache and intro/outro segments from the segment cache, so
+    each extra variant only adds its meaning layers and its encode.
+
+    Args:
+        name: Base deck name; results are named "<name>-<variant>"
+        output_dir: Directory holding one sub-folder per variant
+        variants: Word list text per variant name; every list must contain
+                  the same words (with the same forms, types and pronunciations)
+                  in the same order
+        theme, profile, include_intro, keep_intermediate, transition: As in render_deck
+        progress: Optional callback receiving (stage, fraction); stages are
+                  'cards' for the shared card pass, then '<variant>:<stage>'
+
+    Returns:
+        One DeckResult per variant, in the order given
+    """
+    results = {variant: DeckResult(name=f"{name}-{variant}", status='failed') for variant in variants}
+    generators = {}
+    decks = {}
+    ready = False
+    text_cache_counts = _text_cache_counts()
+    try:
+        start = time.perf_counter()
+        parser = WordParser(ipa_lookup=load_ipa_lookup())
+        decks = {variant: parser.parse_deck(text or "") for variant, text in variants.items()}
+        parse_seconds = (time.perf_counter() - start) / max(1, len(variants))
+        first = next(iter(decks.values()), [])
+        if not first:
+            raise ValueError("No valid entries found in the input text")
+        # The head layer is drawn from the first variant, so everything on it must match
+        heads = lambda entries: [(e.word, FlashcardGenerator._word_text(e), e.word_type, e.pronunciation)
+                                 for e in entries]
+        for variant, entries in decks.items():
+            if heads(entries) != heads(first):
+                raise ValueError(f"Variant '{variant}' does not list the same words as the others")
+            results[variant].parse_seconds = parse_seconds
+            results[variant].cards = len(entries)
+
+        # Shared pass: narration and card heads once per word, one still per variant
+        start = time.perf_counter()
+        for variant in variants:
+            generators[variant] = EnhancedFlashcardGenerator(os.path.join(output_dir, variant))
+            generators[variant].set_theme(theme)
+        drawing = next(iter(generators.values()))
+        for idx, entry in enumerate(first, 1):
+            if progress:
+                progress('cards', (idx - 1) / len(first))
+            drawing.generate_audio(entry.word)
+            drawing.create_card_variants(
+                [(generators[variant], decks[variant][idx - 1]) for variant in variants],
+                position=(idx, len(first)))
+        shared_seconds = (time.perf_counter() - start) / len(variants)
+        ready = True
+    except RenderCancelled:
+        for result in results.values():
+            result.status = 'cancelled'
+    except Exception as e:
+        for result in results.values():
+            result.error = str(e)
+        print(f"Error rendering deck {name}: {str(e)}")
+    # The shared pass is drawn by (and counted for) the first variant
+    next(iter(results.values())).add_text_cache_usage(text_cache_counts)
+
+    # Each variant's video reuses the stills and audio drawn above
+    for variant in (variants if ready else []):
+        variant_progress = None
+        if progress:
+            variant_progress = lambda stage, fraction, variant=variant: progress(f"{variant}:{stage}", fraction)
+        result = results[variant]
+        text_cache_counts = _text_cache_counts()
+        try:
+            start = time.perf_counter()
+            result.output_path = generators[variant].create_video(
+                decks[variant], include_intro=include_intro, profile=profile,
+                progress=variant_progress, transition=transition)
+            result.render_seconds = shared_seconds + time.perf_counter() - start
+            result.status = 'ok'
+        except RenderCancelled:
+            result.add_text_cache_usage(text_cache_counts)
+            for result in results.values():
+                if result.status != 'ok':
+                    result.status = 'cancelled'
+            break
+        except Exception as e:
+            result.error = str(e)
+            print(f"Error rendering deck {result.name}: {str(e)}")
+        result.add_text_cache_usage(text_cache_counts)
+
+    if not keep_intermediate:
+        for generator in generators.values():
+            generator.cleanup()
+    return list(results.values())
+
+
+def render_preview_deck(name: str, output_dir: str, text: Optional[str] = None,
+                        entries: Optional[Sequence[WordEntry]] = None, theme: str = 'green',
+                        count: int = 6, mode: str = 'sheet',
+                        progress: Optional[Callable[[str, float], None]] = None) -> DeckResult:
+    """
+    Render a quick preview (contact sheet or low-resolution video) of a deck.
+
+    Args:
+        name: Deck name used in results and logs
+        output_dir: Directory for this preview's files
+        text: Word list in the text format accepted by WordParser
+        entries: Parsed entries or a Deck (skips parsing when given)
+        theme: EnhancedFlashcardGenerator theme name
+        count: Number of cards previewed
+        mode: 'sheet' for a contact sheet, 'video' for a preview video
+        progress: Optional callback receiving (stage, fraction)
+
+    Returns:
+        DeckResult whose output_path is the image or video
+    """
+    result = DeckResult(name=name, status='failed')
+    generator = None
+    text_cache_counts = _text_cache_counts()
+    try:
+        start = time.perf_counter()
+        if entries is None:
+            parser = WordParser(ipa_lookup=load_ipa_lookup())
+            entries = parser.parse_deck(text or "")
+        result.parse_seconds = time.perf_counter() - start
+        result.cards = len(entries)
+        if not entries:
+            raise ValueError("No valid entries found in the input text")
+        if progress:
+            progress('preview', 0.0)
+
+        start = time.perf_counter()
+        generator = EnhancedFlashcardGenerator(output_dir)
+        generator.set_theme(theme)
+        renderer = PreviewRenderer(generator, max_cards=count)
+        if mode == 'video':
+            result.output_path = renderer.create_preview_video(entries)
+        else:
+            result.output_path = renderer.create_contact_sheet(entries)
+        result.render_seconds = time.perf_counter() - start
+        result.status = 'ok'
+    except RenderCancelled:
+        result.status = 'cancelled'
+    except Exception as e:
+        result.error = str(e)
+        print(f"Error rendering preview {name}: {str(e)}")
+    finally:
+        result.add_text_cache_usage(text_cache_counts)
+        # Card images are only intermediates of the thumbnails
+        if generator is not None:
+            generator.cleanup()
+    return result
@@ -0,0 +1,255 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from moviepy.audio.AudioClip import CompositeAudioClip
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from proglog import ProgressBarLogger
+
+from SegmentCache import silent_audio
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """Named x264 settings tuned for decks of static flashcards.
+
+    Cards are still images shown for a few seconds each, so the profiles
+    drop duplicate frames (variable frame rate), place one keyframe at the
+    start of every card and use x264's stillimage tuning with a CRF target
+    instead of a fixed bitrate.
+    """
+    name: str
+    crf: int = 23
+    preset: str = 'medium'
+    tune: Optional[str] = 'stillimage'
+    fps: int = 8
+    height: Optional[int] = None  # Output height in pixels, None keeps the source size
+    variable_frame_rate: bool = True
+    codec: str = 'libx264'
+    audio_codec: str = 'aac'
+    audio_bitrate: str = '192k'
+    max_keyframe_interval: int = 60  # Seconds between keyframes when a card is very long
+
+    def ffmpeg_params(self, keyframe_times: Optional[Sequence[float]] = None) -> List[str]:
+        """Build the extra ffmpeg arguments for this profile.
+
+        Args:
+            keyframe_times: Start time (seconds) of every card, used to force
+                            exactly one keyframe per card
+
+        Returns:
+            List of ffmpeg command line arguments
+        """
+        params = ['-crf', str(self.crf)]
+        if self.tune:
+            params += ['-tune', self.tune]
+
+        filters = []
+        if self.height:
+            filters.append(f'scale=-2:{self.height}')
+        if self.variable_frame_rate:
+            # Drop the identical frames of a static card, keeping their timestamps
+            filters.append('mpdecimate')
+        if filters:
+            params += ['-vf', ','.join(filters)]
+        if self.variable_frame_rate:
+            params += ['-vsync', 'vfr']
+
+        if keyframe_times:
+            params += [
+                '-force_key_frames', ','.join(f'{t:.3f}' for t in keyframe_times),
+                '-g', str(self.fps * self.max_keyframe_interval),
+                '-sc_threshold', '0'
+            ]
+        return params
+
+
+ENCODING_PROFILES: Dict[str, EncodingProfile] = {
+    'archive': EncodingProfile(
+        name='archive',
+        crf=18,
+        preset='slow',
+        audio_bitrate='192k'
+    ),
+    'classroom': EncodingProfile(
+        name='classroom',
+        crf=23,
+        preset='medium',
+        audio_bitrate='128k'
+    ),
+    'mobile': EncodingProfile(
+        name='mobile',
+        crf=28,
+        preset='faster',
+        height=480,
+        audio_bitrate='96k'
+    ),
+    'preview': EncodingProfile(
+        name='preview',
+        crf=32,
+        preset='ultrafast',
+        height=360,
+        audio_bitrate='64k'
+    ),
+}
+
+DEFAULT_PROFILE = 'classroom'
+
+
+def get_encoding_profile(profile: Union[str, EncodingProfile]) -> EncodingProfile:
+    """Resolve a profile name (or pass through a profile object)"""
+    if isinstance(profile, EncodingProfile):
+        return profile
+    if profile not in ENCODING_PROFILES:
+        raise ValueError(f"Encoding profile '{profile}' not found. "
+                         f"Available profiles: {list(ENCODING_PROFILES.keys())}")
+    return ENCODING_PROFILES[profile]
+
+
+@dataclass
+class EncodeResult:
+    profile: str
+    output_path: str
+    encode_seconds: float
+    size_bytes: int
+    duration: float
+
+    @property
+    def size_mb(self) -> float:
+        return self.size_bytes / (1024 * 1024)
+
+    @property
+    def kbps(self) -> float:
+        """Average total bitrate of the output file"""
+        if not self.duration:
+            return 0.0
+        return self.size_bytes * 8 / 1000 / self.duration
+
+
+def pad_audio(clip):
+    """
+    clip with an audio track spanning its whole duration.
+
+    mpdecimate with variable frame rate drops the repeated frames at the
+    end of a clip, so the audio track is what keeps a still that outlasts
+    its narration on screen; it is padded with silence to the clip length.
+    """
+    audio = clip.audio
+    if audio is not None and audio.duration is not None and audio.duration >= clip.duration:
+        return clip
+    tracks = [silent_audio(clip.duration)] + ([audio] if audio is not None else [])
+    return clip.set_audio(CompositeAudioClip(tracks).set_duration(clip.duration))
+
+
+def probe_duration(path: str) -> float:
+    """Duration of an encoded file, as reported by ffmpeg"""
+    return ffmpeg_parse_infos(path)['duration']
+
+
+class EncodeProgressLogger(ProgressBarLogger):
+    """MoviePy logger forwarding the video frame progress (0-1) to a callback"""
+
+    def __init__(self, callback: Callable[[float], None]):
+        super().__init__()
+        self.on_progress = callback
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if bar == 't' and attr == 'index':
+            total = self.bars[bar].get('total') or 0
+            if total:
+                self.on_progress(min(1.0, value / total))
+
+
+def encode_clip(clip, output_path: str, profile: Union[str, EncodingProfile] = DEFAULT_PROFILE,
+                keyframe_times: Optional[Sequence[float]] = None,
+                threads: int = 4, logger=None,
+                progress: Optional[Callable[[float], None]] = None) -> EncodeResult:
+    """
+    Write a MoviePy clip to disk with an encoding profile.
+
+    Args:
+        clip: MoviePy clip to encode
+        output_path: Destination video file
+        profile: Profile name or EncodingProfile
+        keyframe_times: Start time of every card (see EncodingProfile.ffmpeg_params)
+        threads: ffmpeg thread count
+        logger: MoviePy logger (None for silent)
+        progress: Optional callback receiving the encoding progress (0-1),
+                  used instead of the logger
+
+    Returns:
+        EncodeResult with the measured encode time and output size
+    """
+    profile = get_encoding_profile(profile)
+    if progress is not None:
+        logger = EncodeProgressLogger(progress)
+
+    start = time.perf_counter()
+    clip = pad_audio(clip)
+    clip.write_videofile(
+        output_path,
+        fps=profile.fps,
+        codec=profile.codec,
+        preset=profile.preset,
+        audio_codec=profile.audio_codec,
+        audio_bitrate=profile.audio_bitrate,
+        ffmpeg_params=profile.ffmpeg_params(keyframe_times),
+        threads=threads,
+        logger=logger,
+        # MoviePy's default temp audio goes to the working directory, named
+        # after the output file, so concurrent renders of body.mp4 collide
+        temp_audiofile=f"{os.path.splitext(output_path)[0]}TEMP_MPY_wvf_snd.mp4"
+    )
+    elapsed = time.perf_counter() - start
+
+    return EncodeResult(
+        profile=profile.name,
+        output_path=output_path,
+        encode_seconds=elapsed,
+        size_bytes=os.path.getsize(output_path),
+        duration=probe_duration(output_path)
+    )
+
+
+def compare_profiles(clip, output_dir: str, profiles: Optional[Sequence[str]] = None,
+                     keyframe_times: Optional[Sequence[float]] = None,
+                     basename: str = 'profile') -> List[EncodeResult]:
+    """
+    Encode the same clip with several profiles to measure the trade-offs.
+
+    Args:
+        clip: MoviePy clip to encode
+        output_dir: Directory for the encoded files
+        profiles: Profile names to compare (default: all profiles)
+        keyframe_times: Start time of every card
+        basename: Prefix of the output filenames
+
+    Returns:
+        One EncodeResult per profile
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    for name in profiles or ENCODING_PROFILES.keys():
+        output_path = os.path.join(output_dir, f"{basename}_{name}.mp4")
+        results.append(encode_clip(clip, output_path, name, keyframe_times=keyframe_times))
+    return results
+
+
+def format_report(results: Sequence[EncodeResult]) -> str:
+    """Format encode results as a plain text table"""
+    lines = [f"{'profile':<12}{'time (s)':>10}{'size (MB)':>12}{'kbps':>10}",
+             "-" * 44]
+    for result in results:
+        lines.append(f"{result.profile:<12}{result.encode_seconds:>10.1f}"
+                     f"{result.size_mb:>12.2f}{result.kbps:>10.0f}")
+    return "\n".join(lines)
+
+
+def card_start_times(clips) -> List[float]:
+    """Start time of every clip in a concatenation, used as keyframe positions"""
+    times = []
+    current = 0.0
+    for clip in clips:
+        times.append(current)
+        current += clip.duration
+    return times
@@ -1,12 +1,56 @@
 import os
-from typing import List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import TextClip, CompositeVideoClip, AudioFileClip, ColorClip
+from moviepy.editor import CompositeVideoClip, AudioFileClip, VideoClip
 from moviepy.editor import ImageClip, concatenate_videoclips
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+import numpy as np
 from WordEntry import WordEntry
-from FlashcardGenerator import FlashcardGenerator
-from PIL.Image import Resampling  # Import the new Resampling enum
+from FlashcardGenerator import FlashcardGenerator, RenderCancelled, _load_font
+from SegmentCache import SegmentCache, concat_segments, silent_audio
+from TextRasterCache import get_text_cache
+from TransitionEngine import TransitionEngine
+from VideoOverlayManager import VideoOverlayManager
+from OverlayCompositor import OverlayCompositor
+from EncodingProfiles import (DEFAULT_PROFILE, EncodeResult, encode_clip, compare_profiles,
+                              format_report, card_start_times, get_encoding_profile, pad_audio)
+
+@lru_cache(maxsize=256)
+def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+    hex_color = hex_color.lstrip('#')
+    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
+
+
+def _shift(rgb: Tuple[int, int, int], factor: int) -> Tuple[int, int, int]:
+    return tuple(min(255, max(0, value + factor)) for value in rgb)
+
+
+@lru_cache(maxsize=16)
+def _dot_pattern(size: Tuple[int, int], rgba: Tuple[int, int, int, int],
+                 spacing: int = 40, radius: int = 2) -> Image.Image:
+    """RGBA layer with a dot centred on every grid point"""
+    width, height = size
+    # Offset of every column / row from its nearest grid line
+    dx = (np.arange(width) + spacing // 2) % spacing - spacing // 2
+    dy = (np.arange(height) + spacing // 2) % spacing - spacing // 2
+    # r * (r + 1) matches the pixels PIL fills for a (2r + 1) wide ellipse
+    mask = dy[:, None] ** 2 + dx[None, :] ** 2 <= radius * (radius + 1)
+    layer = np.zeros((height, width, 4), np.uint8)
+    layer[mask] = rgba
+    return Image.fromarray(layer, 'RGBA')
+
+
+@lru_cache(maxsize=16)
+def _gradient(size: Tuple[int, int], top: Tuple[int, int, int, int],
+              bottom: Tuple[int, int, int, int]) -> Image.Image:
+    """RGBA layer fading vertically from `top` to `bottom`"""
+    width, height = size
+    t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    rows = np.asarray(top, np.float32) * (1 - t) + np.asarray(bottom, np.float32) * t
+    layer = np.broadcast_to(np.round(rows).astype(np.uint8)[:, None], (height, width, 4))
+    return Image.fromarray(np.ascontiguousarray(layer), 'RGBA')
+
 
 @dataclass
 class ThemeColors:
@@ -15,9 +59,26 @@ class ThemeColors:
     accent: str
     secondary: str
 
+    def __post_init__(self):
+        # Resolve every color the card decorations need once, per theme
+        self.bg_rgb = _hex_to_rgb(self.bg)
+        self.text_rgb = _hex_to_rgb(self.text)
+        self.accent_rgb = _hex_to_rgb(self.accent)
+        self.secondary_rgb = _hex_to_rgb(self.secondary)
+        self.shadow_rgb = _shift(self.text_rgb, -30)
+        self.highlight_rgb = _shift(self.bg_rgb, -5)
+        self.pattern_rgba = _shift(self.bg_rgb, 10) + (30,)
+
 class EnhancedFlashcardGenerator(FlashcardGenerator):
-    def __init__(self):
-        super().__init__()
+    # Theme layer drawn over every card's background ('pattern', 'gradient' or None)
+    card_layer: Optional[str] = 'gradient'
+    INTRO_TEXT = "English Vocabulary\nFlashcards"
+    INTRO_SUBTITLE = "Created by Nguyễn Minh Nhựt\nnmnhut.en@gmail.com\ngithub.com/nmnhut-it"
+    OUTRO_TEXT = ("Thanks for watching!\n\nSubscribe for more!\n\n" +
+                  "Email: nmnhut.en@gmail.com\nGithub:github.com/nmnhut-it")
+
+    def __init__(self, output_dir: Optional[str] = None):
+        super().__init__(output_dir)
         # Define professional color schemes
         self.themes = {
             'blue': ThemeColors(
@@ -47,340 +108,490 @@ class EnhancedFlashcardGenerator(FlashcardGenerator):
         }
         self.current_theme = self.themes['green']
 
+        # Progress bar geometry and precomputed strips per (card count, theme colors)
+        self.progress_bar_size = (700, 8)
+        self.progress_bar_y = 180
+        self._progress_strips = {}
+
+        # Encoded intro/outro and transition segments shared by every render
+        self.segment_cache = SegmentCache()
+        self.transitions = TransitionEngine(self.segment_cache)
+
     def set_theme(self, theme_name: str):
         """Set the current color theme"""
         if theme_name in self.themes:
             self.current_theme = self.themes[theme_name]
+            # Stills already drawn carry the previous theme's decorations
+            self._card_bases.clear()
+            self._rendered_cards.clear()
         else:
             raise ValueError(f"Theme '{theme_name}' not found. Available themes: {list(self.themes.keys())}")
 
-    def create_intro_outro(self, duration: int = 1.0) -> Tuple[CompositeVideoClip, CompositeVideoClip]:
+    def _title_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+        """Arial (Bold) when installed, otherwise the bundled Noto Sans"""
+        for font_name in (["arialbd.ttf", "arial.ttf"] if bold else ["arial.ttf"]):
+            try:
+                return _load_font(font_name, size)
+            except OSError:
+                continue
+        return self.font_manager.get_ipa_font(size)
+
+    def _title_fonts_key(self, kind: str) -> tuple:
+        """Path, mtime and size of the fonts a title card resolves to (Arial or the fallback)"""
+        fonts = ([self._title_font(70, bold=True), self._title_font(20)] if kind == 'intro'
+                 else [self._title_font(40)])
+        key = []
+        for font in fonts:
+            path = getattr(font, 'path', None)
+            try:
+                stat = os.stat(path)
+                key.append((path, stat.st_mtime, stat.st_size))
+            except (OSError, TypeError):
+                key.append((path,))
+        return tuple(key)
+
+    def render_title_frames(self, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw the intro or outro title card with PIL.
+
+        Args:
+            kind: 'intro' or 'outro'
+
+        Returns:
+            Background frame and the frame with the title fully faded in
+        """
+        background = Image.new('RGB', (1280, 720), self.current_theme.accent)
+        title = background.copy()
+        draw = ImageDraw.Draw(title)
+        if kind == 'intro':
+            draw.multiline_text((640, 360), self.INTRO_TEXT, font=self._title_font(70, bold=True),
+                                fill='white', anchor='mm', align='center')
+            draw.multiline_text((640, 500), self.INTRO_SUBTITLE, font=self._title_font(20),
+                                fill='white', anchor='ma', align='center')
+        else:
+            draw.multiline_text((640, 360), self.OUTRO_TEXT, font=self._title_font(40),
+                                fill='white', anchor='mm', align='center')
+        return np.asarray(background), np.asarray(title)
+
+    def _title_clip(self, kind: str, duration: float, fade: float = 0.5) -> VideoClip:
+        """Title card whose text fades in over the theme color, with silent audio"""
+        background, title = self.render_title_frames(kind)
+        background = background.astype(np.float32)
+        difference = title.astype(np.float32) - background
+
+        def make_frame(t):
+            return (background + difference * min(1.0, t / fade)).astype(np.uint8)
+
+        clip = VideoClip(make_frame, duration=duration)
+        return clip.set_audio(silent_audio(duration))
+
+    def create_intro_outro(self, duration: float = 1.0) -> Tuple[VideoClip, VideoClip]:
         """Create professional intro and outro sequences"""
-        # Create background with gradient effect
-        bg = ColorClip(size=(1280, 720), color=EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.accent))
-        bg = bg.set_duration(duration)
-
-        # Create intro text with animation
-        intro_text = TextClip(
-            txt="English Vocabulary\nFlashcards",
-            fontsize=70,
-            color='white',
-            font='Arial-Bold',
-            kerning=2,
-            align='center'
-        ).set_duration(duration)
-
-        subtitle_text = TextClip(
-            txt="Created by Nguyễn Minh Nhựt\nnmnhut.en@gmail.com\ngithub.com/nmnhut-it",
-            fontsize=20,
-            color='white',
-            font='Arial',
-            kerning=1
-        ).set_duration(duration)
-
-        # Position text clips
-        intro_text = intro_text.set_position('center').crossfadein(0.5)
-        subtitle_text = subtitle_text.set_position(('center', 500)).crossfadein(0.5)
-
-        intro = CompositeVideoClip([bg, intro_text, subtitle_text])
-
-        # Create outro with call-to-action
-        outro_text = TextClip(
-            txt="Thanks for watching!\n\nSubscribe for more!\n\n" +
-                "Email: nmnhut.en@gmail.com\nGithub:github.com/nmnhut-it",
-            fontsize=40,
-            color='white',
-            font='Arial',
-            kerning=2,
-            align='center'
-        ).set_duration(duration)
-
-        outro_text = outro_text.set_position('center').crossfadein(0.5)
-        outro = CompositeVideoClip([bg, outro_text])
-
-        return intro, outro
+        return self._title_clip('intro', duration), self._title_clip('outro', duration)
+
+    def intro_outro_segments(self, profile: str = DEFAULT_PROFILE,
+                             duration: float = 1.0) -> Tuple[str, str]:
+        """
+        Encoded intro and outro for the current theme, rendered once and cached.
+
+        The cache key covers everything that changes the output: theme color,
+        resolution, texts, the fonts they resolve to, duration and encoding
+        profile.
+
+        Returns:
+            Paths of the intro and outro segments
+        """
+        profile = get_encoding_profile(profile)
+        paths = []
+        for kind in ('intro', 'outro'):
+            texts = (self.INTRO_TEXT, self.INTRO_SUBTITLE) if kind == 'intro' else (self.OUTRO_TEXT,)
+            key = (self.current_theme.accent, (1280, 720), texts, self._title_fonts_key(kind),
+                   duration, profile)
+
+            def render(path, kind=kind):
+                clip = self._title_clip(kind, duration)
+                try:
+                    encode_clip(clip, path, profile, keyframe_times=[0.0])
+                finally:
+                    clip.close()
+
+            paths.append(self.segment_cache.get_or_render(kind, key, render))
+        return paths[0], paths[1]
 
     def get_background_color(self):
         return self.current_theme.bg;
-    def create_transition(self, duration: float = 0.5, style: str = 'slide') -> Union[ColorClip, CompositeVideoClip]:
+    def create_transition(self, first: np.ndarray, second: np.ndarray,
+                          duration: float = 0.5, style: str = 'slide',
+                          profile: str = DEFAULT_PROFILE) -> str:
         """
         Create smooth, eye-friendly transition effects
 
         Args:
+            first: Outgoing card image (uint8 array)
+            second: Incoming card image
             duration: Length of transition in seconds
             style: Transition style ('fade', 'slide', or 'zoom')
+            profile: Encoding profile of the surrounding video
 
         Returns:
-            MoviePy clip with transition effect
+            Path to the encoded (and cached) transition segment
         """
-        if style == 'fade':
-            # Gentle fade to/from semi-transparent black
-            transition = ColorClip(
-                size=(1280, 720),
-                color=EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.bg)
-            ).set_opacity(0.3)
-            # Create fade in/out effect with full opacity
-            return (transition
-                    .set_duration(duration)
-                    .set_opacity(lambda t: 1 if t < duration/2 else 1 - 2*(t-duration/2)/duration))
-
-        elif style == 'slide':
-            # Sliding transition using two panels
-            left_panel = ColorClip(
-                size=(640, 720),
-                color=EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.bg)
-            )
-            right_panel = ColorClip(
-                size=(640, 720),
-                color=EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.bg)
-            )
+        return self.transitions.segment(first, second, style, duration, profile)
 
-            # Set positions with movement
-            left_panel = (left_panel
-                        .set_position(lambda t: (-(640 * t/duration), 0))
-                        .set_duration(duration))
-            right_panel = (right_panel
-                        .set_position(lambda t: (1280 - (640 * t/duration), 0))
-                        .set_duration(duration))
-
-            return CompositeVideoClip([left_panel, right_panel])
-
-        elif style == 'zoom':
-            # Subtle zoom fade transition
-            bg = ColorClip(
-                size=(1280, 720),
-                color=EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.bg)
-            )
-            bg = bg.set_duration(duration)
+    def progress_bar_strip(self, total: int) -> np.ndarray:
+        """
+        Precompute every state of the progress bar for a deck of `total` cards.
 
-            # Add zoom effect
-            bg = bg.resize(lambda t: 1 + 0.05 * t/duration)
-            bg = bg.set_position('center')
-            bg = bg.set_opacity(lambda t: 1 - t/duration)
+        Returns:
+            uint8 RGBA array of shape (total, height, width, 4); row i is the
+            bar after card i + 1. The track is the secondary color at 30%
+            opacity, the filled part the opaque accent color.
+        """
+        key = (total, self.current_theme.secondary, self.current_theme.accent)
+        if key not in self._progress_strips:
+            secondary = np.array(self.current_theme.secondary_rgb + (77,), np.uint8)
+            accent = np.array(self.current_theme.accent_rgb + (255,), np.uint8)
+
+            filled = (self.progress_bar_size[0] * np.arange(1, total + 1) / total).astype(int)
+            columns = np.arange(self.progress_bar_size[0])
+            is_filled = columns[None, :] < filled[:, None]  # (total, width)
+            rows = np.where(is_filled[..., None], accent, secondary)  # (total, width, 4)
+            self._progress_strips[key] = np.ascontiguousarray(
+                np.broadcast_to(rows[:, None], (total, self.progress_bar_size[1]) + rows.shape[1:]))
+        return self._progress_strips[key]
+
+    def _card_base(self, background_path: str, meaning_size: int) -> Image.Image:
+        """Background and watermark with the theme layer, drawn once per generator and theme"""
+        key = (background_path, meaning_size)
+        if key not in self._card_bases:
+            base = super()._card_base(background_path, meaning_size)
+            if self.card_layer:
+                self.add_background_pattern(base, self.card_layer)
+        return self._card_bases[key]
+
+    def decorate_card(self, img: Image.Image, index: int, total: int) -> Image.Image:
+        """Draw the deck progress bar into the card image"""
+        bar = Image.fromarray(self.progress_bar_strip(total)[index - 1], 'RGBA')
+        x = (img.width - self.progress_bar_size[0]) // 2
+        img.paste(bar, (x, self.progress_bar_y), mask=bar)
+        return img
+
+    def draw_text_with_shadow(self, img: Image.Image, position: Tuple[int, int],
+                              text: str, font: ImageFont, color: str):
+        """Draw text with subtle shadow effect (rasterised once through the text cache)"""
+        shadow = (self.current_theme.shadow_rgb if color == self.current_theme.text
+                  else self.adjust_color_brightness(color, -30))
+        get_text_cache().draw(img, position, text, font, color, effect='shadow', effect_fill=shadow)
+
+    def draw_text_with_highlight(self, img: Image.Image, position: Tuple[int, int],
+                                 text: str, font: ImageFont, color: str, bg_color: str):
+        """Draw text with background highlight effect (rasterised once through the text cache)"""
+        highlight_color = (self.current_theme.highlight_rgb if bg_color == self.current_theme.bg
+                           else self.adjust_color_brightness(bg_color, -5))
+        get_text_cache().draw(img, position, text, font, color, effect='highlight',
+                              effect_fill=highlight_color)
+
+    def theme_layer(self, kind: str, size: Tuple[int, int] = (1280, 720)) -> Image.Image:
+        """
+        Decorative RGBA layer of the current theme, generated once per theme and size.
 
-            return bg
+        Args:
+            kind: 'pattern' (dot grid) or 'gradient' (secondary color rising
+                  towards the bottom edge)
+            size: Layer size in pixels
 
-        else:
-            # Default to simple crossfade if style not recognized
-            return ColorClip(
-                size=(1280, 720),
-                color=EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.bg)
-            ).set_duration(duration).crossfadein(0.4).crossfadeout(0.4)
-
-    def create_progress_bar(self, current: int, total: int, duration: float) -> ColorClip:
-        """Create animated progress bar using RGB colors"""
-        # Convert hex colors to RGB tuples
-        secondary_color = EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.secondary)
-        accent_color = EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.accent)
-
-        # Background bar
-        bg_width = 700
-        bg_height = 8
-        bg_bar = ColorClip(
-            size=(bg_width, bg_height),
-            color=secondary_color
-        ).set_opacity(0.3)
-
-        # Progress bar
-        progress_width = int(bg_width * (current / total))
-        progress = ColorClip(
-            size=(progress_width, bg_height),
-            color=accent_color
-        )
-
-        # Combine bars
-        composite = CompositeVideoClip([bg_bar, progress])
-        composite = composite.set_position(('center', 180))
-        return composite.set_duration(duration)
-
-    def draw_text_with_shadow(self, draw: ImageDraw, position: Tuple[int, int],
-                            text: str, font: ImageFont, color: str):
-        """Draw text with subtle shadow effect"""
-        x, y = position
-        # Draw shadow
-        shadow_offset = 2
-        draw.text((x + shadow_offset, y + shadow_offset), text,
-                 font=font, fill=self.adjust_color_brightness(color, -30), anchor="mm")
-        # Draw main text
-        draw.text((x, y), text, font=font, fill=color, anchor="mm")
-
-    def draw_text_with_highlight(self, draw: ImageDraw, position: Tuple[int, int],
-                               text: str, font: ImageFont, color: str, bg_color: str):
-        """Draw text with background highlight effect"""
-        x, y = position
-        # Calculate text size
-        bbox = draw.textbbox((x, y), text, font=font, anchor="mm")
-        padding = 20
-
-        # Draw highlight background
-        highlight_color = self.adjust_color_brightness(bg_color, -5)
-        draw.rectangle(
-            (bbox[0] - padding, bbox[1] - padding/2,
-             bbox[2] + padding, bbox[3] + padding/2),
-            fill=highlight_color
-        )
-
-        # Draw text
-        draw.text((x, y), text, font=font, fill=color, anchor="mm")
-
-    def add_background_pattern(self, draw: ImageDraw, color: str):
+        Returns:
+            Shared RGBA image; callers composite it and must not modify it
+        """
+        theme = self.current_theme
+        if kind == 'pattern':
+            return _dot_pattern(size, theme.pattern_rgba)
+        if kind == 'gradient':
+            return _gradient(size, theme.secondary_rgb + (0,), theme.secondary_rgb + (40,))
+        raise ValueError(f"Theme layer '{kind}' not found. Available layers: ['pattern', 'gradient']")
+
+    def add_background_pattern(self, img: Image.Image, kind: str = 'pattern') -> Image.Image:
         """Add subtle background pattern"""
-        pattern_color = self.adjust_color_brightness(color, 10)
-        spacing = 40
-        opacity = 30
-
-        for x in range(0, 1280, spacing):
-            for y in range(0, 720, spacing):
-                draw.ellipse(
-                    [x-2, y-2, x+2, y+2],
-                    fill=self.adjust_color_opacity(pattern_color, opacity)
+        layer = self.theme_layer(kind, img.size)
+        if img.mode == 'RGBA':
+            img.alpha_composite(layer)
+        else:
+            img.paste(layer, (0, 0), mask=layer)
+        return img
+
+    def create_card_clip(self, entry: WordEntry, idx: int, total: int) -> ImageClip:
+        """Narrated card: a single still layer (progress bar included) with its audio"""
+        audio_path = self.generate_audio(entry.word)
+        image_path = self.create_card_image(entry, position=(idx, total))
+
+        # Load audio and calculate duration
+        audio_clip = AudioFileClip(audio_path)
+        clip_duration = audio_clip.duration + 1.5
+
+        return (ImageClip(image_path)
+                .set_duration(clip_duration)
+                .set_audio(audio_clip))
+
+    def build_final_clip(self, entries: List[WordEntry], temp_clips: list,
+                         include_intro: bool = True,
+                         background_music: Optional[str] = None,
+                         progress: Optional[Callable[[str, float], None]] = None) -> Tuple[CompositeVideoClip, List[float]]:
+        """
+        Build the full (unencoded) flashcard clip.
+
+        Args:
+            entries: Word entries to render
+            temp_clips: List collecting every intermediate clip for cleanup
+            include_intro: Add intro and outro sequences
+            background_music: Optional music file mixed under the narration
+            progress: Optional callback receiving (stage, fraction) per card
+
+        Returns:
+            Final clip and the start time of every section (intro, cards, outro)
+        """
+        clips = []
+
+        # Add intro if requested
+        if include_intro:
+            intro, outro = self.create_intro_outro()
+            clips.append(intro)
+            temp_clips.extend([intro])
+
+        # Process each word entry
+        total_entries = len(entries)
+        for idx, entry in enumerate(entries, 1):
+            if progress:
+                progress('cards', (idx - 1) / total_entries)
+            try:
+                video_clip = self.create_card_clip(entry, idx, total_entries)
+                clips.append(video_clip)
+
+                # Track for cleanup
+                temp_clips.extend([video_clip.audio, video_clip])
+
+            except Exception as e:
+                print(f"Warning: Error processing entry {entry.word}: {str(e)}")
+                continue
+
+        # Add outro if intro was included
+        if include_intro:
+            clips.append(outro)
+            temp_clips.append(outro)
+
+        if not clips:
+            raise ValueError("No valid clips were created")
+
+        # Concatenate all clips (all 1280x720, so no compositing is needed)
+        final_clip = concatenate_videoclips(clips, method="chain")
+        temp_clips.append(final_clip)
+
+        # Add background music if provided
+        if background_music and os.path.exists(background_music):
+            try:
+                bg_music = AudioFileClip(background_music)
+                bg_music = bg_music.volumex(0.1).loop(duration=final_clip.duration)
+                final_with_music = CompositeVideoClip([final_clip])
+                final_with_music = final_with_music.set_audio(
+                    CompositeVideoClip([final_clip, bg_music]).audio
                 )
+                temp_clips.extend([bg_music, final_with_music])
+                final_clip = final_with_music
+            except Exception as e:
+                print(f"Warning: Could not add background music: {str(e)}")
+
+        return final_clip, card_start_times(clips)
 
     def create_video(self, entries: List[WordEntry], include_intro: bool = True,
-                background_music: Optional[str] = None) -> str:
+                background_music: Optional[str] = None,
+                profile: str = DEFAULT_PROFILE,
+                progress: Optional[Callable[[str, float], None]] = None,
+                transition: Optional[str] = None,
+                transition_duration: float = 0.5,
+                overlay: Optional[str] = None,
+                overlay_opacity: float = 0.35) -> str:
         """
         Create enhanced video with proper image resampling.
+
+        Args:
+            entries: Word entries to render
+            include_intro: Add intro and outro sequences
+            background_music: Optional music file mixed under the narration
+            profile: Encoding profile name (see EncodingProfiles.ENCODING_PROFILES)
+            progress: Optional callback receiving (stage, fraction) while
+                      cards are drawn ('cards') and encoded ('encoding')
+            transition: Optional transition between cards ('fade', 'slide' or 'zoom')
+            transition_duration: Length of each transition in seconds
+            overlay: Optional animated layer over the cards ('background',
+                     'particles' or 'geometric', see VideoOverlayManager)
+            overlay_opacity: Strength of the overlay (0-1)
         """
-        clips = []
+        if transition and overlay:
+            print("Warning: Overlays are not supported with transitions, skipping the overlay")
+            overlay = None
+        if transition:
+            if not background_music:
+                return self.create_video_with_transitions(
+                    entries, transition, transition_duration, include_intro, profile, progress)
+            print("Warning: Transitions are not supported with background music, skipping them")
+
         temp_clips = []  # Track temporary clips for cleanup
 
+        # Intro and outro are spliced in from the segment cache, unless music
+        # has to run underneath them and the whole video is encoded at once
+        use_segments = include_intro and not background_music
+
         try:
-            # Create base background with RGB tuple
-            bg_color = EnhancedFlashcardGenerator.hex_to_rgb(self.current_theme.secondary)
-            base_bg = ColorClip(
-                size=(1280, 720),
-                color=bg_color
-            ).set_duration(1)
-            print (base_bg);
-
-            # Add intro if requested
-            if include_intro:
-                intro, outro = self.create_intro_outro()
-                clips.append(intro)
-                temp_clips.extend([intro])
+            final_clip, keyframe_times = self.build_final_clip(
+                entries, temp_clips, include_intro and not use_segments,
+                background_music, progress)
+            # The body is spliced between the intro and outro segments by
+            # stream copy, so its last card has to keep its silent tail
+            final_clip = pad_audio(final_clip)
+
+            encode_profile = get_encoding_profile(profile)
+            if overlay:
+                overlays = VideoOverlayManager(*final_clip.size)
+                compositor = OverlayCompositor(final_clip.size, 'screen', overlay_opacity)
+                final_clip = compositor.apply(
+                    final_clip, overlays.cached_renderer(overlay, encode_profile.fps))
+                temp_clips.append(final_clip)
+                # Every frame changes, and mpdecimate would drop the subtle motion
+                encode_profile = replace(encode_profile, variable_frame_rate=False)
+
+            # Generate output path
+            output_path = os.path.join(self.output_dir, f"flashcards_{self.timestamp}.mp4")
+            encode_path = os.path.join(self.output_dir, "body.mp4") if use_segments else output_path
+
+            # Write final video
+            result = encode_clip(
+                final_clip, encode_path, encode_profile, keyframe_times=keyframe_times,
+                progress=(lambda fraction: progress('encoding', fraction)) if progress else None)
+            print(f"finish writing ({result.profile}: {result.encode_seconds:.1f}s, {result.size_mb:.2f} MB)")
+
+            if use_segments:
+                intro_path, outro_path = self.intro_outro_segments(profile)
+                concat_segments([intro_path, encode_path, outro_path], output_path)
+                os.remove(encode_path)
+            return output_path
 
-            # Create transition clip
-            # transition = self.create_transition()
-            # temp_clips.append(transition)
+        except RenderCancelled:
+            raise
 
-            # Process each word entry
+        except Exception as e:
+            raise RuntimeError(f"Error generating video: {str(e)}") from e
+
+        finally:
+            # Clean up all temporary clips
+            for clip in temp_clips:
+                try:
+                    clip.close()
+                except Exception:
+                    pass
+
+    def create_video_with_transitions(self, entries: List[WordEntry], style: str = 'slide',
+                                      duration: float = 0.5, include_intro: bool = True,
+                                      profile: str = DEFAULT_PROFILE,
+                                      progress: Optional[Callable[[str, float], None]] = None) -> str:
+        """
+        Create the video from per-card segments joined by cached transitions.
+
+        Every card is encoded as its own segment; the transition between two
+        cards comes from the TransitionEngine (rendered once per card pair)
+        and everything is joined by stream copy.
+
+        Returns:
+            Path to the video
+        """
+        segment_dir = os.path.join(self.output_dir, "segments")
+        os.makedirs(segment_dir, exist_ok=True)
+        segments = []
+        card_segments = []
+        previous_frame = None
+
+        try:
             total_entries = len(entries)
             for idx, entry in enumerate(entries, 1):
+                if progress:
+                    progress('cards', (idx - 1) / total_entries)
+                clip = narration = None
                 try:
-                    # Generate audio and image components
-                    audio_path = self.generate_audio(entry.word)
-                    image_path = self.create_card_image(entry)
-
-                    # Load audio and calculate duration
-                    audio_clip = AudioFileClip(audio_path)
-                    clip_duration = audio_clip.duration + 1.5
-
-                    # Create background for this clip
-                    clip_bg = base_bg.set_duration(clip_duration)
-                    print (clip_bg);
-
-                    # Load image
-                    pil_image = Image.open(image_path)
-                    print ("load image from " + image_path)
-                    # Calculate new dimensions while maintaining aspect ratio
-                    target_width = 1280
-                    ratio = target_width / pil_image.width
-                    target_height = int(pil_image.height * ratio)
-
-                    # Resize using LANCZOS resampling
-                    pil_image = pil_image.resize(
-                        (target_width, target_height),
-                        resample=Resampling.LANCZOS
-                    )
-
-                    # Save resized image
-                    resized_path = os.path.join(self.image_dir, f"resized_{os.path.basename(image_path)}")
-                    pil_image.save(resized_path)
-
-                    # Create movie clip from resized image
-                    image_clip = (ImageClip(resized_path)
-                                .set_duration(clip_duration)
-                                .set_position('center'))
-
-                    # Create progress bar
-                    progress = self.create_progress_bar(idx, total_entries, clip_duration)
-
-                    # Combine layers with background
-                    video_clip = CompositeVideoClip(
-                        [image_clip, progress],
-                        size=(1280, 720)
-                    )
-                    video_clip = video_clip.set_audio(audio_clip)
-
-                    # Add transition between cards
-                    # if idx > 1:
-                    #     clips.append(transition)
-                    clips.append(video_clip)
-                    print ("append to clips " + str(idx))
-
-                    # Track for cleanup
-                    temp_clips.extend([audio_clip, image_clip, progress, video_clip])
-
-                    # Clean up resized image
-                    try:
-                        os.remove(resized_path)
-                    except:
-                        pass
-
+                    clip = self.create_card_clip(entry, idx, total_entries)
+                    narration = clip.audio
+                    # A still card encodes as a single VFR frame, so the audio
+                    # track has to span the whole card for the segment to keep its length
+                    clip = pad_audio(clip)
+                    card_path = os.path.join(segment_dir, f"card_{idx:04d}.mp4")
+                    encode_clip(clip, card_path, profile, keyframe_times=[0.0])
+                    frame = clip.get_frame(0)
                 except Exception as e:
                     print(f"Warning: Error processing entry {entry.word}: {str(e)}")
                     continue
+                finally:
+                    if narration is not None:
+                        narration.close()
+                    if clip is not None:
+                        clip.close()
+
+                if previous_frame is not None:
+                    segments.append(self.create_transition(previous_frame, frame, duration, style, profile))
+                segments.append(card_path)
+                card_segments.append(card_path)
+                previous_frame = frame
+
+            if not card_segments:
+                raise ValueError("No valid clips were created")
 
-            # Add outro if intro was included
             if include_intro:
-                # clips.append(transition)
-                print("include outro")
-                clips.append(outro)
-                temp_clips.append(outro)
+                intro_path, outro_path = self.intro_outro_segments(profile)
+                segments = [intro_path] + segments + [outro_path]
 
-            if not clips:
-                raise ValueError("No valid clips were created")
+            output_path = os.path.join(self.output_dir, f"flashcards_{self.timestamp}.mp4")
+            concat_segments(segments, output_path)
+            return output_path
 
-            # Concatenate all clips
-            final_clip = concatenate_videoclips(clips, method="compose")
-            temp_clips.append(final_clip)
-            print("to final clip")
+        except RenderCancelled:
+            raise
 
-            # Add background music if provided
-            if background_music and os.path.exists(background_music):
+        except Exception as e:
+            raise RuntimeError(f"Error generating video: {str(e)}") from e
+
+        finally:
+            for path in card_segments:
                 try:
-                    bg_music = AudioFileClip(background_music)
-                    bg_music = bg_music.volumex(0.1).loop(duration=final_clip.duration)
-                    final_with_music = CompositeVideoClip([final_clip])
-                    final_with_music = final_with_music.set_audio(
-                        CompositeVideoClip([final_clip, bg_music]).audio
-                    )
-                    temp_clips.extend([bg_music, final_with_music])
-                    final_clip = final_with_music
-                except Exception as e:
-                    print(f"Warning: Could not add background music: {str(e)}")
+                    os.remove(path)
+                except OSError:
+                    pass
 
-            # Generate output path
-            output_path = os.path.join(self.output_dir, f"flashcards_{self.timestamp}.mp4")
+    def compare_encoding_profiles(self, entries: List[WordEntry],
+                                  profiles: Optional[List[str]] = None,
+                                  include_intro: bool = True) -> List[EncodeResult]:
+        """
+        Render a deck once and encode it with several profiles.
 
-            # Write final video
-            final_clip.write_videofile(
-                output_path,
-                fps=8,
-                codec='libx264',
-                audio_codec='aac',
-                audio_bitrate='192k',
-                threads=4,
-                logger=None
-            )
-            print("finish writing")
-            return output_path
+        Prints a report of encode time and output size per profile, written
+        to the 'profiles' folder of the output directory.
 
-        except Exception as e:
-            raise RuntimeError(f"Error generating video: {str(e)}") from e
+        Args:
+            entries: Word entries to render
+            profiles: Profile names to compare (default: all profiles)
+            include_intro: Add intro and outro sequences
 
+        Returns:
+            One EncodeResult per profile
+        """
+        temp_clips = []
+        try:
+            final_clip, keyframe_times = self.build_final_clip(entries, temp_clips, include_intro)
+            results = compare_profiles(
+                final_clip,
+                os.path.join(self.output_dir, "profiles"),
+                profiles,
+                keyframe_times=keyframe_times,
+                basename=f"flashcards_{self.timestamp}"
+            )
+            print(format_report(results))
+            return results
         finally:
-            # Clean up all temporary clips
             for clip in temp_clips:
                 try:
                     clip.close()
@@ -390,27 +601,17 @@ class EnhancedFlashcardGenerator(FlashcardGenerator):
     @staticmethod
     def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
         """Convert hex color to RGB tuple, ensuring numeric types"""
-        hex_color = hex_color.lstrip('#')
-        rgb = (
-            int(hex_color[0:2], 16),
-            int(hex_color[2:4], 16),
-            int(hex_color[4:6], 16)
-        )
-        print(f"Converting {hex_color} to RGB: {rgb}")  # Debug print
-        return rgb;
+        return _hex_to_rgb(hex_color)
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def adjust_color_brightness(hex_color: str, factor: int) -> str:
         """Adjust color brightness by a factor"""
-        rgb = EnhancedFlashcardGenerator.hex_to_rgb(hex_color)
-        new_rgb = tuple(
-            min(255, max(0, value + factor))
-            for value in rgb
-        )
+        new_rgb = _shift(_hex_to_rgb(hex_color), factor)
         return f'#{new_rgb[0]:02x}{new_rgb[1]:02x}{new_rgb[2]:02x}'
 
     @staticmethod
     def adjust_color_opacity(hex_color: str, opacity: int) -> str:
         """Adjust color opacity (0-255)"""
-        rgb = EnhancedFlashcardGenerator.hex_to_rgb(hex_color)
+        rgb = _hex_to_rgb(hex_color)
         return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}{opacity:02x}'
\ No newline at end of file
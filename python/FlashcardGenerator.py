@@ -12,35 +12,108 @@ import os
 import tempfile
 import shutil
 import os
+import hashlib
+import uuid
+from functools import lru_cache
 from datetime import datetime
 from OpenDictIPA import OpenDictIPA;
 import unicodedata
 import pandas as pd
 from WordEntry import WordEntry;
+from EncodingProfiles import DEFAULT_PROFILE, encode_clip, card_start_times
 
 
 from IPAFontManager import IPAFontManager
+from FontRegistry import get_font_registry, load_face
+from FontCoverage import get_glyph_coverage
+from TextRasterCache import get_text_cache
+from CardLayout import TextBox, get_layout_engine
+
+
+class RenderCancelled(Exception):
+    """Raised from a progress callback to stop a render between stages"""
+
+
+@lru_cache(maxsize=8)
+def _load_background(background_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+    """Load and resize a card background once per process"""
+    if not os.path.exists(background_path):
+        return None
+    background = Image.open(background_path)
+    background = background.convert('RGB')
+    return background.resize(size, Image.Resampling.LANCZOS)
+
+
+def _load_font(font_name: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a TrueType font by path or file name, resolved through the font index"""
+    if os.path.exists(font_name):
+        return load_face(font_name, size)
+    record = get_font_registry().find_file(font_name)
+    if record is None:
+        raise OSError(f"Font not found: {font_name}")
+    return load_face(record.path, size)
+
+
 class FlashcardGenerator:
-    def __init__(self):
+    audio_cache_dir = os.path.join("cache", "audio")
+    text_font_files = ("times.ttf", "arial.ttf")
+    # Text slots on the card's board (inner area x 236-1046, y 168-591)
+    center_x = 640
+    text_boxes = {
+        'word': TextBox(center_y=220, max_width=760, max_height=80),
+        'type': TextBox(center_y=300, max_width=760, max_height=50),
+        'pron': TextBox(center_y=380, max_width=760, max_height=70),
+        'meaning': TextBox(center_y=480, max_width=760, max_height=130, max_lines=2),
+        'watermark': TextBox(center_y=570, max_width=760, max_height=30)
+    }
+    watermark_text = "Created by Nguyễn Minh Nhựt - background designed by brgfx / Freepik"
+    card_png_compression = 1
+
+    def __init__(self, output_dir: Optional[str] = None):
+        """
+        Args:
+            output_dir: Directory for the deck's images, audio and video
+                        (default: flashcards_<timestamp> in the working directory)
+        """
         # Create output directories if they don't exist
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_dir = f"flashcards_{self.timestamp}"
+        # The random suffix keeps renders started in the same second apart
+        self.output_dir = output_dir or f"flashcards_{self.timestamp}_{uuid.uuid4().hex[:8]}"
         self.audio_dir = os.path.join(self.output_dir, "audio")
         self.image_dir = os.path.join(self.output_dir, "images")
         self.font_manager = IPAFontManager()
+        # Card layers and finished stills, reused across cards and variant decks
+        self._card_bases: Dict[tuple, Image.Image] = {}
+        self._rendered_cards: Dict[tuple, str] = {}
 
 
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(self.audio_dir, exist_ok=True)
         os.makedirs(self.image_dir, exist_ok=True)
 
+    @staticmethod
+    def preload(background_path: str = "bg.jpg"):
+        """Decode the card background and load the font index ahead of the first card"""
+        _load_background(background_path, (1280, 720))
+        get_font_registry()
+
+    def cached_audio_path(self, word: str, lang: str = 'en', tld: str = 'co.uk') -> str:
+        """Location of the shared TTS cache entry for a word"""
+        key = hashlib.sha1(f"{lang}|{tld}|{word}".encode('utf-8')).hexdigest()
+        return os.path.join(self.audio_cache_dir, f"{key}.mp3")
+
     def generate_audio(self, word: str) -> str:
-        """Generate audio file for a word"""
-        # Create safe filename
-        safe_word = "".join(c if c.isalnum() else "_" for c in word)
-        audio_path = os.path.join(self.audio_dir, f"{safe_word}.mp3")
+        """Generate audio file for a word, reusing the shared TTS cache"""
+        audio_path = self.cached_audio_path(word)
+        if os.path.exists(audio_path):
+            return audio_path
+
+        os.makedirs(self.audio_cache_dir, exist_ok=True)
+        # Write to a temporary name first so concurrent renders never read a partial file
+        tmp_path = f"{audio_path}.{os.getpid()}.tmp"
         tts = gTTS(text=word, lang='en',tld="co.uk")
-        tts.save(audio_path)
+        tts.save(tmp_path)
+        os.replace(tmp_path, audio_path)
         return audio_path
 
     def get_background_color(self):
@@ -51,100 +124,199 @@ class FlashcardGenerator:
                         type_size: int = 48,
                         pron_size: int = 48,
                         meaning_size: int = 56,
-                        background_path = "bg.jpg") -> str:
-        # Load and resize background image
-        if os.path.exists(background_path):
-            background = Image.open(background_path)
-            background = background.convert('RGB')
-            background = background.resize((1280, 720), Image.Resampling.LANCZOS)
-        else:
-            # Fallback to solid color if background image not found
-            background = Image.new('RGB', (1280, 720), color=self.get_background_color())
-
-        img = background;
-        # Create drawing object
-        draw = ImageDraw.Draw(img)
+                        background_path = "bg.jpg",
+                        position: Optional[Tuple[int, int]] = None) -> str:
+        """
+        Draw a card and save it as PNG.
 
-        try:
-            # Load fonts with error handling
-            fonts = {
-                'word': ImageFont.truetype("times.ttf", word_size),
-                'type': ImageFont.truetype("times.ttf", type_size),
-                'pron': self.font_manager.get_ipa_font(pron_size),
-                'meaning': ImageFont.truetype("times.ttf", meaning_size),
-                'watermark': ImageFont.truetype("times.ttf", meaning_size//2.3)
-            }
-        except OSError:
-            try:
-                # Fallback to Arial
-                fonts = {
-                    'word': ImageFont.truetype("arial.ttf", word_size),
-                    'type': ImageFont.truetype("arial.ttf", type_size),
-                    'pron': self.font_manager.get_ipa_font(pron_size),
-                    'meaning': ImageFont.truetype("arial.ttf", meaning_size),
-                    'watermark': ImageFont.truetype("arial.ttf", meaning_size//2.3)
-                }
-            except OSError:
-                # Last resort fallback to default font
-                print("Warning: Using default font as fallback")
-                default_font = ImageFont.load_default()
-                fonts = {k: default_font for k in ['word', 'type', 'pron', 'meaning', 'watermark']}
-
-        # Define vertical positions
-        positions = {
-            'word': 220,
-            'type': 300,
-            'pron': 380,
-            'meaning': 480,
-            'watermark': 570
-        }
-        center_x = 640
+        Cards already drawn by this generator (e.g. by create_card_variants)
+        are reused instead of being drawn again.
 
-        # Draw word (and irregular forms if present)
-        word_text = entry.word
-        if entry.irregular_forms:
-            word_text = " - ".join(entry.irregular_forms)
+        Args:
+            entry: Word entry to draw
+            position: Optional (index, total) of the card in the deck, passed
+                      to decorate_card for per-card decorations
+        """
+        key = self._card_key(entry, (word_size, type_size, pron_size, meaning_size),
+                             background_path, position)
+        img_path = self._rendered_cards.get(key)
+        if img_path and os.path.exists(img_path):
+            return img_path
+
+        img = self.draw_card_head(entry, word_size, type_size, pron_size,
+                                  meaning_size, background_path)
+        img_path = self.finish_card(img, entry, meaning_size, position, key)
+        get_glyph_coverage().save()  # Glyphs probed for this card's strings
+        return img_path
+
+    def create_card_variants(self, variants: List[Tuple['FlashcardGenerator', WordEntry]],
+                             word_size: int = 72,
+                             type_size: int = 48,
+                             pron_size: int = 48,
+                             meaning_size: int = 56,
+                             background_path = "bg.jpg",
+                             position: Optional[Tuple[int, int]] = None) -> List[str]:
+        """
+        Draw the same word for several decks that differ only in the meaning.
+
+        The head layer (background, word, type, IPA and watermark) is drawn
+        once by this generator; every variant copies it and only draws its
+        own meaning and decorations. Each card is saved to the variant
+        generator's image folder and reused by its create_card_image.
+
+        Args:
+            variants: (generator, entry) per deck; the entries share word,
+                      type and pronunciation
+            position: Optional (index, total) of the card in the decks
+
+        Returns:
+            Card image path per variant
+        """
+        sizes = (word_size, type_size, pron_size, meaning_size)
+        head = self.draw_card_head(variants[0][1], word_size, type_size, pron_size,
+                                   meaning_size, background_path)
+        paths = []
+        for generator, entry in variants:
+            key = generator._card_key(entry, sizes, background_path, position)
+            paths.append(generator.finish_card(head.copy(), entry, meaning_size, position, key))
+        get_glyph_coverage().save()  # Glyphs probed for this card's strings
+        return paths
 
-        # Draw each element with error handling for text rendering
+    def draw_card_head(self, entry: WordEntry, word_size: int = 72, type_size: int = 48,
+                       pron_size: int = 48, meaning_size: int = 56,
+                       background_path = "bg.jpg") -> Image.Image:
+        """Background, watermark, word, type and IPA: everything but the meaning"""
+        img = self._card_base(background_path, meaning_size).copy()
+
+        # Draw word (and irregular forms if present)
+        word_text = self._word_text(entry)
         try:
-            draw.text((center_x, positions['word']), word_text,
-                    font=fonts['word'], fill='black', anchor="mm")
+            self.draw_fitted(img, word_text, self.font_for(word_text, word_size),
+                             self.text_boxes['word'], 'black')
 
             if entry.word_type:
-                draw.text((center_x, positions['type']), f"({entry.word_type})",
-                        font=fonts['type'], fill='gray', anchor="mm")
+                type_text = f"({entry.word_type})"
+                self.draw_fitted(img, type_text, self.font_for(type_text, type_size),
+                                 self.text_boxes['type'], 'gray')
 
             if entry.pronunciation:
-                draw.text((center_x, positions['pron']), f"/{entry.pronunciation}/",
-                        font=fonts['pron'], fill='blue', anchor="mm")
-
-            draw.text((center_x, positions['meaning']), entry.meaning,
-                    font=fonts['meaning'], fill='black', anchor="mm")
-
-            # Draw watermark
-            watermark_text = "Created by Nguyễn Minh Nhựt - background designed by brgfx / Freepik"
-            draw.text((center_x, positions['watermark']), watermark_text,
-                    font=fonts['watermark'], fill='grey', anchor="mm")
+                pron_text = f"/{entry.pronunciation}/"
+                self.draw_fitted(img, pron_text, self.font_for(pron_text, pron_size, ipa=True),
+                                 self.text_boxes['pron'], 'blue')
         except Exception as e:
             print(f"Warning: Error drawing text: {str(e)}")
             # Continue with basic rendering if advanced text features fail
-            draw.text((center_x, positions['word']), word_text,
-                    font=ImageFont.load_default(), fill='black')
+            ImageDraw.Draw(img).text((self.center_x, self.text_boxes['word'].center_y), word_text,
+                                     font=ImageFont.load_default(), fill='black')
+        return img
 
-        # Save image with safe filename
+    def finish_card(self, img: Image.Image, entry: WordEntry, meaning_size: int = 56,
+                    position: Optional[Tuple[int, int]] = None,
+                    key: Optional[tuple] = None) -> str:
+        """Draw the meaning and decorations onto a card head and save it as PNG"""
+        try:
+            self.draw_fitted(img, entry.meaning, self.font_for(entry.meaning, meaning_size),
+                             self.text_boxes['meaning'], 'black')
+        except Exception as e:
+            print(f"Warning: Error drawing text: {str(e)}")
+
+        # Save image with safe filename (numbered, so repeated words never collide)
         safe_word = "".join(c if c.isalnum() else "_" for c in entry.word)
+        if position is not None:
+            safe_word = f"{position[0]:03d}_{safe_word}"
         img_path = os.path.join(self.image_dir, f"{safe_word}.png")
 
         # Use LANCZOS resampling if resizing is needed
         if img.size != (1280, 720):
             img = img.resize((1280, 720), Resampling.LANCZOS)
 
-        img.save(img_path)
+        # Static per-card decorations are drawn into the still itself
+        if position is not None:
+            img = self.decorate_card(img, *position)
+
+        # Stills are intermediates: fast zlib level, encoding dominates the card cost
+        img.save(img_path, compress_level=self.card_png_compression)
+        if key is not None:
+            self._rendered_cards[key] = img_path
         return img_path
 
+    def _card_base(self, background_path: str, meaning_size: int) -> Image.Image:
+        """Background with the watermark, drawn once per generator"""
+        key = (background_path, meaning_size)
+        if key not in self._card_bases:
+            # Load and resize background image (decoded once, copied per card)
+            background = _load_background(background_path, (1280, 720))
+            if background is not None:
+                base = background.copy()
+            else:
+                # Fallback to solid color if background image not found
+                base = Image.new('RGB', (1280, 720), color=self.get_background_color())
+            try:
+                self.draw_fitted(base, self.watermark_text,
+                                 self.font_for(self.watermark_text, int(meaning_size//2.3)),
+                                 self.text_boxes['watermark'], 'grey')
+            except Exception as e:
+                print(f"Warning: Error drawing text: {str(e)}")
+            self._card_bases[key] = base
+        return self._card_bases[key]
+
+    @staticmethod
+    def _word_text(entry: WordEntry) -> str:
+        if entry.irregular_forms:
+            return " - ".join(entry.irregular_forms)
+        return entry.word
+
+    def _card_key(self, entry: WordEntry, sizes: Tuple[int, ...], background_path: str,
+                  position: Optional[Tuple[int, int]]) -> tuple:
+        """Everything that affects a card's pixels"""
+        return (self._word_text(entry), entry.word_type, entry.pronunciation, entry.meaning,
+                sizes, background_path, position)
+
+    def draw_fitted(self, img: Image.Image, text: str, font: ImageFont.FreeTypeFont,
+                    box: TextBox, fill: str):
+        """Draw text centred in its box, wrapped and shrunk (down to half size) to fit"""
+        text_cache = get_text_cache()
+        if not isinstance(font, ImageFont.FreeTypeFont):
+            text_cache.draw(img, (self.center_x, box.center_y), text, font, fill)
+            return
+        fitted = get_layout_engine().fit(text, font.path, font.size, box)
+        if fitted.size != font.size:
+            font = load_face(font.path, fitted.size)
+        for line, y in zip(fitted.lines, fitted.line_centers(box.center_y)):
+            text_cache.draw(img, (self.center_x, y), line, font, fill)
+
+    def font_for(self, text: str, size: int, ipa: bool = False) -> ImageFont.FreeTypeFont:
+        """
+        Font able to draw every character of `text`.
+
+        Times New Roman, then Arial, then the IPA font are preferred (the IPA
+        font first for pronunciations); any other installed font covering the
+        string comes next and PIL's default font is the last resort.
+        """
+        preferred = self._preferred_fonts(ipa)
+        path = get_glyph_coverage().font_for(text, preferred)
+        if path is None:
+            if not preferred:
+                return ImageFont.load_default()
+            path = preferred[0]  # Draws what it can
+        return load_face(path, size)
+
+    def _preferred_fonts(self, ipa: bool) -> Tuple[str, ...]:
+        registry = get_font_registry()
+        text_fonts = [record.path for record in map(registry.find_file, self.text_font_files) if record]
+        try:
+            ipa_font = [self.font_manager.font_path()]
+        except RuntimeError:
+            ipa_font = []
+        return tuple(ipa_font + text_fonts) if ipa else tuple(text_fonts + ipa_font)
+
+    def decorate_card(self, img: Image.Image, index: int, total: int) -> Image.Image:
+        """Hook for per-card decorations (e.g. progress indicators); none by default"""
+        return img
+
 
-    def create_video(self, entries: List[WordEntry]) -> str:
-        """Create video from word entries"""
+    def create_video(self, entries: List[WordEntry], profile: str = DEFAULT_PROFILE) -> str:
+        """Create video from word entries using a named encoding profile"""
         clips = []
 
         for entry in entries:
@@ -173,7 +345,8 @@ class FlashcardGenerator:
         output_path = os.path.join(self.output_dir, f"flashcards_{self.timestamp}.mp4")
 
         try:
-            final_clip.write_videofile(output_path, fps=8, codec='libx264')
+            encode_clip(final_clip, output_path, profile,
+                        keyframe_times=card_start_times(clips), logger='bar')
             return output_path
         finally:
             final_clip.close()
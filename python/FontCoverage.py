@@ -0,0 +1,203 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from PIL import ImageFont
+
+from FontRegistry import FontRegistry, get_font_registry
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:  # fontTools is optional; coverage is then probed glyph by glyph
+    TTFont = None
+
+COVERAGE_VERSION = 1
+
+
+def _to_ranges(codepoints: Set[int]) -> List[Tuple[int, int]]:
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ranges
+
+
+def _from_ranges(ranges: List[List[int]]) -> Set[int]:
+    return {cp for start, end in ranges for cp in range(start, end + 1)}
+
+
+class _FontCoverage:
+    """Code points known to be present / missing in one font file"""
+
+    def __init__(self, path: str, size: int, mtime: float, covered: Set[int],
+                 missing: Set[int], complete: bool):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.covered = covered
+        self.missing = missing
+        self.complete = complete  # covered is the whole cmap
+        self._probe = None
+
+    @staticmethod
+    def _glyph(font: ImageFont.FreeTypeFont, cp: int) -> Tuple[Tuple[int, int], bytes]:
+        mask = font.getmask(chr(cp))
+        return mask.size, bytes(mask)
+
+    def covers(self, cp: int) -> bool:
+        if cp in self.covered:
+            return True
+        if self.complete or cp in self.missing:
+            return False
+
+        # Without a cmap, compare the glyph with the font's .notdef box
+        if self._probe is None:
+            font = ImageFont.truetype(self.path, 24)
+            self._probe = (font, self._glyph(font, 0xFFFF))  # a noncharacter: never mapped
+        font, notdef = self._probe
+        found = self._glyph(font, cp) != notdef
+        (self.covered if found else self.missing).add(cp)
+        return found
+
+
+class GlyphCoverage:
+    """
+    Which indexed fonts can draw which characters.
+
+    Coverage comes from each font's cmap (via fontTools when installed,
+    otherwise by probing glyphs on first use) and is cached on disk next to
+    the font index. font_for() picks, per distinct string, a font that
+    covers every character: the first covering preferred font, otherwise
+    the smallest (fastest loading) covering font in the registry.
+    Coverage learned by probing is written by save(), which callers run
+    once per batch of strings (e.g. per card).
+    """
+
+    def __init__(self, registry: FontRegistry,
+                 cache_path: str = os.path.join("cache", "font_coverage.json")):
+        self.registry = registry
+        self.cache_path = cache_path
+        self._fonts: Dict[str, _FontCoverage] = {}
+        self._checked: Set[str] = set()  # Fonts whose mtime was verified in this process
+        self._dirty = False
+        self._font_for: Dict[Tuple[str, Tuple[str, ...]], Optional[str]] = {}
+        self.max_strings = 4096  # Memoized font_for results
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cache.get('version') != COVERAGE_VERSION:
+            return
+        for path, entry in cache['fonts'].items():
+            self._fonts[path] = _FontCoverage(
+                path, entry['size'], entry['mtime'], _from_ranges(entry['covered']),
+                _from_ranges(entry['missing']), entry['complete'])
+
+    def save(self):
+        """Persist coverage learned since the last save"""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        cache = {
+            'version': COVERAGE_VERSION,
+            'fonts': {
+                path: {'size': font.size, 'mtime': font.mtime, 'complete': font.complete,
+                       'covered': _to_ranges(font.covered), 'missing': _to_ranges(font.missing)}
+                for path, font in self._fonts.items()
+            }
+        }
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def coverage(self, path: str) -> Optional[_FontCoverage]:
+        """Coverage of one font file, read from its cmap on first use (None if the file is gone)"""
+        font = self._fonts.get(path)
+        if path in self._checked:
+            return font
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None  # Stale registry entry or preferred path
+        self._checked.add(path)
+        if font is not None and font.mtime == stat.st_mtime:
+            return font
+
+        covered: Set[int] = set()
+        complete = False
+        if TTFont is not None:
+            try:
+                with TTFont(path, fontNumber=0, lazy=True) as tt:
+                    covered = set(tt.getBestCmap() or {})
+                complete = True
+            except Exception as e:
+                print(f"Warning: Could not read cmap of {path}: {str(e)}")
+        font = _FontCoverage(path, stat.st_size, stat.st_mtime, covered, set(), complete)
+        self._fonts[path] = font
+        self._dirty = True
+        return font
+
+    def covers(self, path: str, text: str) -> bool:
+        """True if the font has a glyph for every non-space character of text"""
+        font = self.coverage(path)
+        if font is None:
+            return False
+        known = len(font.covered) + len(font.missing)
+        try:
+            result = all(font.covers(ord(ch)) for ch in set(text) if not ch.isspace())
+        except OSError:
+            return False  # Removed since it was indexed
+        if len(font.covered) + len(font.missing) != known:
+            self._dirty = True  # Probed new code points
+        return result
+
+    def font_for(self, text: str, preferred: Tuple[str, ...] = ()) -> Optional[str]:
+        """
+        Path of a font able to draw `text` (memoized per string).
+
+        Args:
+            text: String to draw
+            preferred: Font paths to try first, in order
+
+        Returns:
+            Font path, or None if no indexed font covers the string
+        """
+        key = (text, preferred)
+        if key in self._font_for:
+            return self._font_for[key]
+
+        path = None
+        for candidate in preferred:
+            if self.covers(candidate, text):
+                path = candidate
+                break
+        else:
+            # Smallest first; fonts deleted since the registry was built are skipped
+            fallbacks = []
+            for record in self.registry.fonts:
+                font = self.coverage(record.path) if record.path not in preferred else None
+                if font is not None:
+                    fallbacks.append((font.size, record.path))
+            for _, candidate in sorted(fallbacks):
+                if self.covers(candidate, text):
+                    path = candidate
+                    break
+
+        if len(self._font_for) >= self.max_strings:
+            self._font_for.clear()
+        self._font_for[key] = path
+        return path
+
+
+@lru_cache(maxsize=1)
+def get_glyph_coverage() -> GlyphCoverage:
+    """Shared coverage index for this process (over the shared font registry)"""
+    return GlyphCoverage(get_font_registry())
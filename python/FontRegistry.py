@@ -0,0 +1,171 @@
+import json
+import os
+import platform
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from PIL import ImageFont
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+INDEX_VERSION = 1
+
+
+@dataclass
+class FontRecord:
+    path: str
+    family: str
+    style: str
+    mtime: float
+
+
+def system_font_dirs() -> Dict[str, Path]:
+    """Get system-specific font paths based on OS."""
+    system = platform.system().lower()
+
+    if system == 'windows':
+        return {
+            'system': Path('C:/Windows/Fonts'),
+            'user': Path(os.path.expanduser('~/AppData/Local/Microsoft/Windows/Fonts'))
+        }
+    elif system == 'darwin':  # macOS
+        return {
+            'system': Path('/Library/Fonts'),
+            'user': Path(os.path.expanduser('~/Library/Fonts'))
+        }
+    else:  # Linux and others
+        return {
+            'system': Path('/usr/share/fonts'),
+            'user': Path(os.path.expanduser('~/.local/share/fonts'))
+        }
+
+
+@lru_cache(maxsize=128)
+def load_face(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font file once per (path, size) and process"""
+    return ImageFont.truetype(path, size)
+
+
+class FontRegistry:
+    """
+    Index of the fonts installed in a set of directories.
+
+    The directories are scanned once and the index (path, family, style,
+    mtime) is saved to disk. Later runs load the index and only stat the
+    directories it recorded, rescanning when one of them changed, so
+    lookups are dictionary reads and never walk the font folders.
+    """
+
+    def __init__(self, font_dirs: Sequence[str],
+                 index_path: str = os.path.join("cache", "font_index.json")):
+        """
+        Args:
+            font_dirs: Directories searched (recursively) for font files
+            index_path: Where the index is persisted
+        """
+        self.font_dirs = [str(Path(d)) for d in font_dirs]
+        self.index_path = index_path
+        self.fonts: List[FontRecord] = []
+        self._dir_mtimes: Dict[str, float] = {}
+        if not self._load_index():
+            self.scan()
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if index.get('version') != INDEX_VERSION or index.get('font_dirs') != self.font_dirs:
+            return False
+
+        # Any added or removed file changes the mtime of its directory
+        for directory, mtime in index['dirs'].items():
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    return False
+            except OSError:
+                return False
+        for directory in self.font_dirs:
+            if directory not in index['dirs'] and os.path.isdir(directory):
+                return False
+
+        self._dir_mtimes = index['dirs']
+        self._set_fonts([FontRecord(**record) for record in index['fonts']])
+        return True
+
+    def scan(self):
+        """Rebuild the index from the font directories and save it"""
+        fonts = []
+        self._dir_mtimes = {}
+        for font_dir in self.font_dirs:
+            for root, _, files in os.walk(font_dir):
+                self._dir_mtimes[root] = os.stat(root).st_mtime
+                for name in sorted(files):
+                    if not name.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        family, style = ImageFont.truetype(path, 12).getname()
+                    except OSError:
+                        continue  # Unreadable or unsupported font file
+                    fonts.append(FontRecord(path=path, family=family or '', style=style or '',
+                                            mtime=os.stat(path).st_mtime))
+        self._set_fonts(fonts)
+        self._save_index()
+
+    def _save_index(self):
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        index = {
+            'version': INDEX_VERSION,
+            'font_dirs': self.font_dirs,
+            'dirs': self._dir_mtimes,
+            'fonts': [asdict(record) for record in self.fonts]
+        }
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _set_fonts(self, fonts: List[FontRecord]):
+        self.fonts = fonts
+        self._by_family: Dict[str, List[FontRecord]] = {}
+        self._by_file: Dict[str, FontRecord] = {}
+        for record in fonts:
+            self._by_family.setdefault(record.family.lower(), []).append(record)
+            # The first directory listed wins for duplicate file names
+            self._by_file.setdefault(os.path.basename(record.path).lower(), record)
+
+    def find(self, family: str, style: str = 'Regular') -> Optional[FontRecord]:
+        """Font of a family, preferring the given style"""
+        records = self._by_family.get(family.lower())
+        if not records:
+            return None
+        for record in records:
+            if record.style.lower() == style.lower():
+                return record
+        return records[0]
+
+    def find_file(self, filename: str) -> Optional[FontRecord]:
+        """Font by file name, e.g. 'arial.ttf' (case-insensitive)"""
+        return self._by_file.get(os.path.basename(filename).lower())
+
+    def search(self, text: str) -> List[FontRecord]:
+        """Fonts whose family or file name contains `text`"""
+        text = text.lower()
+        return [record for record in self.fonts
+                if text in record.family.lower() or text in os.path.basename(record.path).lower()]
+
+
+@lru_cache(maxsize=8)
+def get_font_registry(font_dirs: Optional[Sequence[str]] = None) -> FontRegistry:
+    """
+    Shared registry for this process.
+
+    Args:
+        font_dirs: Directories to index (default: ./fonts plus the system
+                   and user font folders). Must be hashable, e.g. a tuple.
+    """
+    if font_dirs is None:
+        font_dirs = ('fonts',) + tuple(str(d) for d in system_font_dirs().values())
+    return FontRegistry(font_dirs)
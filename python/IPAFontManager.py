@@ -1,14 +1,17 @@
-import os
-import platform
 import requests
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from PIL import ImageFont
 
+from FontRegistry import get_font_registry, load_face, system_font_dirs
+
 class IPAFontManager:
     def __init__(self, fonts_dir: str = './fonts'):
         """
-        Initialize font manager with automatic Noto Sans font download capability.
+        Initialize font manager with Noto Sans font download capability.
+
+        Fonts are resolved through the shared FontRegistry; downloading
+        only happens in ensure_font(), never while rendering.
 
         Args:
             fonts_dir: Directory to store fonts (default: './fonts')
@@ -25,26 +28,13 @@ class IPAFontManager:
 
         # System-specific font paths
         self.system_font_paths = self._get_system_font_paths()
+        self.registry = get_font_registry(
+            (str(self.fonts_dir),) + tuple(str(d) for d in self.system_font_paths.values()))
+        self._font_path: Optional[str] = None
 
     def _get_system_font_paths(self) -> Dict[str, Path]:
         """Get system-specific font paths based on OS."""
-        system = platform.system().lower()
-
-        if system == 'windows':
-            return {
-                'system': Path('C:/Windows/Fonts'),
-                'user': Path(os.path.expanduser('~/AppData/Local/Microsoft/Windows/Fonts'))
-            }
-        elif system == 'darwin':  # macOS
-            return {
-                'system': Path('/Library/Fonts'),
-                'user': Path(os.path.expanduser('~/Library/Fonts'))
-            }
-        else:  # Linux and others
-            return {
-                'system': Path('/usr/share/fonts'),
-                'user': Path(os.path.expanduser('~/.local/share/fonts'))
-            }
+        return system_font_dirs()
 
     def _find_font_in_dir(self) -> Path | None:
         """
@@ -81,6 +71,28 @@ class IPAFontManager:
             print(f"Error downloading font: {e}")
             return False
 
+    def _resolve_font_path(self) -> Optional[str]:
+        """Bundled Noto Sans, else an installed Noto font from the registry"""
+        font_path = self._find_font_in_dir()
+        if font_path:
+            return str(font_path)
+        record = self.registry.find('Noto Sans') or next(iter(self.registry.search('noto')), None)
+        return record.path if record else None
+
+    def ensure_font(self) -> bool:
+        """
+        Make sure an IPA capable font is available, downloading Noto Sans if needed.
+
+        Call this at startup (it may access the network); get_ipa_font
+        itself never downloads.
+
+        Returns:
+            bool: True if a font is available
+        """
+        if self._resolve_font_path():
+            return True
+        return self._download_font()
+
     def get_ipa_font(self, size: int = 48) -> ImageFont.FreeTypeFont:
         """
         Get Noto Sans font that correctly handles IPA characters.
@@ -92,38 +104,30 @@ class IPAFontManager:
             PIL ImageFont object
 
         Raises:
-            RuntimeError if font cannot be found or downloaded
+            RuntimeError if font cannot be found
         """
-        # Check project directory first
-        font_path = self._find_font_in_dir()
-        if font_path:
-            try:
-                return ImageFont.truetype(str(font_path), size)
-            except OSError:
-                print(f"Error loading existing font: {font_path}")
-
-        # Try downloading if not found
-        if self._download_font():
-            font_path = self.fonts_dir / self.font_source['filename']
-            try:
-                return ImageFont.truetype(str(font_path), size)
-            except OSError:
-                print("Error loading downloaded font")
-
-        # Try system fonts as last resort
-        for font_dir in self.system_font_paths.values():
-            if font_dir.exists():
-                for font_file in font_dir.rglob('*.[Tt][Tt][Ff]'):
-                    if 'noto' in font_file.name.lower():
-                        try:
-                            return ImageFont.truetype(str(font_file), size)
-                        except OSError:
-                            continue
-
-        raise RuntimeError(
-            "No Noto Sans font found and unable to download. "
-            "Please check your internet connection or manually install Noto Sans."
-        )
+        font_path = self.font_path()
+        try:
+            return load_face(font_path, size)
+        except OSError:
+            print(f"Error loading existing font: {font_path}")
+            raise RuntimeError(f"Could not load font: {font_path}")
+
+    def font_path(self) -> str:
+        """
+        Path of the IPA font (resolved once).
+
+        Raises:
+            RuntimeError if font cannot be found
+        """
+        if self._font_path is None:
+            self._font_path = self._resolve_font_path()
+        if not self._font_path:
+            raise RuntimeError(
+                "No Noto Sans font found. Run IPAFontManager().ensure_font() "
+                "with an internet connection or manually install Noto Sans."
+            )
+        return self._font_path
 
 # Example usage
 def test_font_manager():
@@ -131,6 +135,7 @@ def test_font_manager():
     font_manager = IPAFontManager()
 
     try:
+        font_manager.ensure_font()
         font = font_manager.get_ipa_font(size=48)
         print("Successfully loaded Noto Sans font")
 
@@ -0,0 +1,69 @@
+import os
+from typing import Callable, Dict, Tuple
+import numpy as np
+
+# Bump when an overlay's look changes so stale frame files are not reused
+OVERLAY_VERSION = 1
+
+
+class OverlayCache:
+    """
+    One loop period of an overlay effect, rendered once to disk.
+
+    Frames are stored as a uint8 (frames, height, width) .npy file per
+    (effect, resolution, fps, seed) and opened memory-mapped, so every
+    process rendering the same overlay shares the pages through the OS
+    cache and reading a frame is a memory read.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("cache", "overlays")):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._mapped: Dict[str, np.ndarray] = {}
+
+    def path_for(self, effect: str, size: Tuple[int, int], fps: int, seed: int) -> str:
+        """Cache location of an overlay's frames"""
+        width, height = size
+        return os.path.join(self.cache_dir,
+                            f"{effect}_{width}x{height}_{fps}fps_seed{seed}_v{OVERLAY_VERSION}.npy")
+
+    def frames(self, effect: str, size: Tuple[int, int], fps: int, seed: int,
+               period: float, render: Callable[[float], np.ndarray]) -> np.ndarray:
+        """
+        Memory-mapped frames covering one period, rendering them first if needed.
+
+        Args:
+            effect: Effect name, used in the filename
+            size: Frame size (width, height)
+            fps: Frames per second of the target video
+            seed: Seed the effect was created with
+            period: Loop length of the effect in seconds
+            render: Function returning the (height, width) uint8 frame at time t
+
+        Returns:
+            Read-only array of shape (frames, height, width); frame k is the
+            effect at t = k * period / frames
+        """
+        path = self.path_for(effect, size, fps, seed)
+        if path in self._mapped:
+            return self._mapped[path]
+
+        if not os.path.exists(path):
+            width, height = size
+            count = max(1, int(round(period * fps)))
+            # Write under a temporary name so concurrent workers never map a partial file
+            tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npy"
+            try:
+                frames = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint8,
+                                                   shape=(count, height, width))
+                for k in range(count):
+                    frames[k] = render(k * period / count)
+                frames.flush()
+                del frames
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        self._mapped[path] = np.load(path, mmap_mode='r')
+        return self._mapped[path]
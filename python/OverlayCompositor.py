@@ -0,0 +1,80 @@
+from typing import Callable, Optional, Tuple
+import numpy as np
+from moviepy.editor import VideoClip
+
+
+class OverlayCompositor:
+    """
+    Blends overlay layers onto uint8 card frames in place.
+
+    All intermediate arrays are allocated once for the frame size; each
+    call writes into the same uint8 output buffer, so compositing a frame
+    allocates nothing. Overlays may be grayscale (height, width) or RGB
+    (height, width, 3) uint8 frames.
+    """
+    BLEND_MODES = ('screen', 'alpha')
+
+    def __init__(self, size: Tuple[int, int], mode: str = 'screen', opacity: float = 0.35,
+                 mask: Optional[np.ndarray] = None):
+        """
+        Args:
+            size: Frame size (width, height)
+            mode: 'screen' lightens the card by the overlay, 'alpha' mixes
+                  the overlay over the card
+            opacity: Overall strength of the overlay (0-1)
+            mask: Optional per-pixel alpha (height, width), integer 0-255,
+                  float 0-1 or bool, limiting where the overlay shows
+        """
+        if mode not in self.BLEND_MODES:
+            raise ValueError(f"Blend mode '{mode}' not found. Available modes: {list(self.BLEND_MODES)}")
+        width, height = size
+        self.mode = mode
+        self.opacity = opacity
+
+        # Effective alpha per pixel, with a trailing axis to broadcast over RGB
+        alpha = np.full((height, width), opacity, np.float32)
+        if mask is not None:
+            # The scale follows the dtype, not the values (a dark uint8 mask is still 0-255)
+            if np.issubdtype(mask.dtype, np.integer):
+                alpha *= mask.astype(np.float32) / 255
+            else:
+                alpha *= mask.astype(np.float32)
+        self.alpha = alpha[:, :, None]
+
+        self._scratch = np.empty((height, width, 3), np.float32)
+        self._out = np.empty((height, width, 3), np.uint8)
+
+    def blend(self, base: np.ndarray, overlay: np.ndarray) -> np.ndarray:
+        """
+        Composite one overlay frame onto one card frame.
+
+        Returns:
+            uint8 (height, width, 3) frame; the buffer is reused by the next call
+        """
+        if overlay.ndim == 2:
+            overlay = overlay[:, :, None]
+        scratch = self._scratch
+        if self.mode == 'screen':
+            # base + overlay * (255 - base) / 255, scaled by alpha
+            np.subtract(255, base, out=scratch)
+            scratch *= overlay
+            scratch *= self.alpha
+            scratch *= 1 / 255
+        else:
+            # base + (overlay - base) * alpha
+            np.subtract(overlay, base, out=scratch, dtype=np.float32)
+            scratch *= self.alpha
+        scratch += base
+        np.copyto(self._out, scratch, casting='unsafe')
+        return self._out
+
+    def apply(self, clip: VideoClip, overlay: Callable[[float], np.ndarray]) -> VideoClip:
+        """
+        Clip with the overlay composited on every frame.
+
+        Args:
+            clip: Card clip (audio is kept)
+            overlay: Function returning the overlay frame at time t, e.g.
+                     VideoOverlayManager.cached_renderer
+        """
+        return clip.fl(lambda get_frame, t: self.blend(get_frame(t), overlay(t)))
@@ -0,0 +1,181 @@
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from WordEntry import WordEntry
+from WordParser import WordParser, load_ipa_lookup
+from Deck import Deck
+
+
+def format_word_entry(entry) -> str:
+    """Format a single word entry to standardized format"""
+    parts = []
+
+    # Handle irregular forms
+    if entry.irregular_forms:
+        parts.append(" - ".join(entry.irregular_forms))
+    else:
+        parts.append(entry.word)
+
+    # Add word type if exists
+    if entry.word_type:
+        parts.append(f"({entry.word_type})")
+
+    # Add meaning
+    parts.append(entry.meaning)
+
+    # Add pronunciation if exists
+    if entry.pronunciation:
+        parts.append(f"/{entry.pronunciation}/")
+
+    return ": ".join(parts[:2]) + " " + " ".join(parts[2:])
+
+
+@dataclass(frozen=True)
+class ParsedLine:
+    entry: Optional[WordEntry]  # None when the line is invalid
+    formatted: str  # Standardized text without the leading number
+    error: Optional[str] = None
+
+
+@dataclass
+class PreviewUpdate:
+    entries: List[WordEntry] = field(default_factory=list)
+    formatted_lines: List[str] = field(default_factory=list)
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (line number, message)
+    changed: List[int] = field(default_factory=list)  # Indices of formatted lines that differ from the previous update
+    reparsed: int = 0  # Lines parsed by this update (the rest came from the cache)
+
+    @property
+    def formatted_text(self) -> str:
+        return "\n".join(self.formatted_lines)
+
+
+@dataclass(frozen=True)
+class DeckSnapshot:
+    """Parsed deck (IPA resolved) together with the formatted text it was shown as"""
+    version: int
+    text_hash: str
+    deck: Deck
+
+    def matches(self, text: str) -> bool:
+        """True if text is still the text this deck was parsed from (i.e. not edited)"""
+        return self.text_hash == text_hash(text)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.strip().encode('utf-8')).hexdigest()
+
+
+class PreviewEngine:
+    """
+    Incremental parsing of a word list as it is edited.
+
+    Parse results are cached per line (keyed by a hash of its text), so each
+    edit only parses the lines that changed; dictionary lookups happen once
+    per distinct line. Results depend only on the line, so one engine is
+    shared by every session of the app.
+    """
+
+    def __init__(self, parser: WordParser, max_lines: int = 20000):
+        """
+        Args:
+            parser: Parser (with its IPA lookup) used for changed lines
+            max_lines: Parsed lines kept in the cache
+        """
+        self.parser = parser
+        self.max_lines = max_lines
+        self._lines: 'OrderedDict[str, ParsedLine]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions = itertools.count(1)
+
+    @staticmethod
+    def line_key(line: str) -> str:
+        return hashlib.sha1(line.encode('utf-8')).hexdigest()
+
+    def parse_line(self, line: str) -> Tuple[ParsedLine, bool]:
+        """Cached parse of one (stripped) line; the flag is True if it was parsed now"""
+        key = self.line_key(line)
+        with self._lock:
+            cached = self._lines.get(key)
+            if cached is not None:
+                self._lines.move_to_end(key)
+                return cached, False
+
+        try:
+            entry = self.parser.parse_line(line)
+            parsed = ParsedLine(entry, format_word_entry(entry))
+        except (ValueError, TypeError) as e:
+            parsed = ParsedLine(None, line, str(e))
+
+        with self._lock:
+            self._lines[key] = parsed
+            if len(self._lines) > self.max_lines:
+                self._lines.popitem(last=False)
+        return parsed, True
+
+    def update(self, text: str, previous: Optional[List[str]] = None) -> PreviewUpdate:
+        """
+        Parse an edited word list, reusing every unchanged line.
+
+        Args:
+            text: Current word list text
+            previous: formatted_lines of the previous update, to report which
+                      lines changed
+
+        Returns:
+            Entries (numbered by position unless the line gives a number),
+            numbered formatted lines, invalid lines and changed line indices
+        """
+        update = PreviewUpdate()
+        for line_number, line in enumerate(text.split("\n"), 1):
+            line = line.strip()
+            if not line:
+                continue
+            parsed, reparsed = self.parse_line(line)
+            update.reparsed += reparsed
+            if parsed.entry is None:
+                update.errors.append((line_number, parsed.error))
+                continue
+            position = len(update.entries) + 1
+            entry = parsed.entry
+            if entry.number is None:
+                entry = replace(entry, number=position)
+            update.entries.append(entry)
+            update.formatted_lines.append(f"{position}. {parsed.formatted}")
+
+        previous = previous or []
+        update.changed = [i for i, line in enumerate(update.formatted_lines)
+                          if i >= len(previous) or previous[i] != line]
+        return update
+
+    def snapshot(self, text: str, deck: Optional[Sequence[WordEntry]] = None) -> DeckSnapshot:
+        """
+        Versioned deck of a word list, handed from the preview to the render.
+
+        Args:
+            text: Word list text the deck is shown as
+            deck: Entries already parsed from text (e.g. by update() or an
+                  import); parsed from text when not given
+        """
+        if deck is None:
+            deck = self.update(text).entries
+        if not isinstance(deck, Deck):
+            deck = Deck.from_entries(deck)
+        return DeckSnapshot(next(self._versions), text_hash(text), deck)
+
+    def current(self, text: str, snapshot: Optional[DeckSnapshot]) -> DeckSnapshot:
+        """snapshot if text was not edited since it was taken, otherwise a new one"""
+        if snapshot is not None and snapshot.matches(text):
+            return snapshot
+        return self.snapshot(text)
+
+
+@lru_cache(maxsize=1)
+def get_preview_engine() -> PreviewEngine:
+    """Preview engine shared by every session, using the process-wide IPA dictionaries"""
+    return PreviewEngine(WordParser(ipa_lookup=load_ipa_lookup()))
@@ -0,0 +1,125 @@
+import os
+from typing import List, Tuple
+import numpy as np
+from PIL import Image
+from PIL.Image import Resampling
+from moviepy.editor import AudioFileClip, ImageClip, concatenate_videoclips
+
+from WordEntry import WordEntry
+from FlashcardGenerator import FlashcardGenerator
+from EncodingProfiles import encode_clip, card_start_times
+
+
+class PreviewRenderer:
+    """Quick, low-resolution previews of the first cards of a deck.
+
+    Previews only draw the card images (no intro, outro or TTS requests by
+    default) so teachers can check layout and IPA in a few seconds before
+    starting the full render.
+    """
+
+    def __init__(self, generator: FlashcardGenerator, max_cards: int = 6,
+                 size: tuple = (640, 360)):
+        """
+        Args:
+            generator: Generator used to draw the cards (and locate cached audio)
+            max_cards: Number of cards rendered from the start of the deck
+            size: Size of each preview frame / thumbnail
+        """
+        self.generator = generator
+        self.max_cards = max_cards
+        self.size = size
+        self.preview_dir = os.path.join(generator.output_dir, "preview")
+        os.makedirs(self.preview_dir, exist_ok=True)
+
+    def _card_thumbnails(self, entries: List[WordEntry]) -> List[Tuple[WordEntry, Image.Image]]:
+        """(entry, thumbnail) of the first cards; cards that fail to draw are skipped"""
+        thumbnails = []
+        for idx, entry in enumerate(entries[:self.max_cards], 1):
+            try:
+                image_path = self.generator.create_card_image(entry, position=(idx, len(entries)))
+                with Image.open(image_path) as card:
+                    thumbnails.append((entry, card.convert('RGB').resize(self.size, Resampling.BILINEAR)))
+            except Exception as e:
+                print(f"Warning: Error previewing entry {entry.word}: {str(e)}")
+        return thumbnails
+
+    def create_contact_sheet(self, entries: List[WordEntry], columns: int = 3,
+                             padding: int = 10) -> str:
+        """
+        Draw the first cards side by side on a single image.
+
+        Args:
+            entries: Word entries to preview
+            columns: Number of thumbnails per row
+            padding: Gap between thumbnails in pixels
+
+        Returns:
+            Path to the contact sheet PNG
+        """
+        thumbnails = self._card_thumbnails(entries)
+        if not thumbnails:
+            raise ValueError("No valid cards to preview")
+
+        columns = min(columns, len(thumbnails))
+        rows = (len(thumbnails) + columns - 1) // columns
+        width, height = self.size
+        sheet = Image.new('RGB', (columns * (width + padding) + padding,
+                                  rows * (height + padding) + padding), 'white')
+        for i, (_, thumb) in enumerate(thumbnails):
+            row, col = divmod(i, columns)
+            sheet.paste(thumb, (padding + col * (width + padding),
+                                padding + row * (height + padding)))
+
+        sheet_path = os.path.join(self.preview_dir, "contact_sheet.png")
+        sheet.save(sheet_path)
+        return sheet_path
+
+    def create_preview_video(self, entries: List[WordEntry], fetch_audio: bool = False,
+                             silent_duration: float = 2.0) -> str:
+        """
+        Encode the first cards as a small, ultrafast video.
+
+        Args:
+            entries: Word entries to preview
+            fetch_audio: Request TTS for words missing from the audio cache.
+                         When False those cards are shown silently.
+            silent_duration: Card duration when no audio is available
+
+        Returns:
+            Path to the preview video
+        """
+        clips = []
+        try:
+            for entry, thumb in self._card_thumbnails(entries):
+                audio_path = self.generator.cached_audio_path(entry.word)
+                if fetch_audio and not os.path.exists(audio_path):
+                    audio_path = self.generator.generate_audio(entry.word)
+
+                image_clip = ImageClip(np.asarray(thumb))
+                if os.path.exists(audio_path):
+                    audio_clip = AudioFileClip(audio_path)
+                    image_clip = (image_clip.set_duration(audio_clip.duration + 1.5)
+                                  .set_audio(audio_clip))
+                    clips.append(audio_clip)
+                else:
+                    image_clip = image_clip.set_duration(silent_duration)
+                clips.append(image_clip)
+
+            card_clips = [clip for clip in clips if isinstance(clip, ImageClip)]
+            if not card_clips:
+                raise ValueError("No valid cards to preview")
+
+            preview = concatenate_videoclips(card_clips, method="chain")
+            clips.append(preview)
+            output_path = os.path.join(self.preview_dir, "preview.mp4")
+            encode_clip(preview, output_path, 'preview',
+                        keyframe_times=card_start_times(card_clips))
+            return output_path
+        finally:
+            for clip in clips:
+                try:
+                    clip.close()
+                except Exception:
+                    pass
+
@@ -0,0 +1,275 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Sequence
+
+from WordEntry import WordEntry
+from DeckRenderer import render_deck, render_preview_deck, warm_up
+from EncodingProfiles import DEFAULT_PROFILE
+from FlashcardGenerator import RenderCancelled
+
+# Lower values run first
+PRIORITY_PREVIEW = 0
+PRIORITY_INTERACTIVE = 10
+
+
+@dataclass
+class RenderJob:
+    job_id: str
+    work_dir: str
+    kind: str = 'render'  # 'render' or 'preview'
+    priority: int = PRIORITY_INTERACTIVE
+    status: str = 'queued'  # queued, running, done, failed, cancelled
+    stage: str = 'queued'
+    progress: float = 0.0
+    result: Optional[str] = None
+    error: Optional[str] = None
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def describe(self) -> str:
+        """Short human readable status line"""
+        if self.status == 'running':
+            return f"Job {self.job_id}: {self.stage} ({self.progress:.0%})"
+        if self.status == 'failed':
+            return f"Job {self.job_id} failed: {self.error}"
+        return f"Job {self.job_id}: {self.status}"
+
+
+def _run_job(job_id: str, work_dir: str, kind: str, render_args: dict,
+             progress_table, cancel_table, check_interval: float = 0.5) -> dict:
+    """
+    Worker entry point: render one job and report progress through the shared table.
+
+    Cancellation is cooperative: the progress callback, called between
+    cards and while encoding, raises RenderCancelled once the job has been
+    flagged in the cancel table.
+    """
+    last_check = [0.0]
+
+    def report(stage: str, fraction: float):
+        # Drawing cards is roughly the first half of a render, encoding the second
+        overall = fraction / 2 if stage == 'cards' else 0.5 + fraction / 2
+        progress_table[job_id] = (stage, overall)
+        now = time.monotonic()
+        if now - last_check[0] >= check_interval or fraction == 0.0:
+            last_check[0] = now
+            if cancel_table.get(job_id):
+                raise RenderCancelled(job_id)
+
+    if cancel_table.get(job_id):
+        return {'status': 'cancelled', 'output_path': None, 'error': None}
+    if kind == 'preview':
+        result = render_preview_deck(job_id, work_dir, progress=report, **render_args)
+    else:
+        result = render_deck(job_id, work_dir, progress=report, **render_args)
+    return result.to_dict()
+
+
+class RenderJobQueue:
+    """
+    Render jobs executed in a pool of worker processes.
+
+    Every job gets a unique ID and its own working directory. Submitting
+    returns immediately; callers poll status() for progress and read the
+    output path from the finished job. Queued jobs run in priority order
+    (previews, then interactive renders) and any job can be cancelled;
+    running jobs stop at their next progress report. Finished jobs and
+    their working directories are removed finished_ttl seconds after they
+    finish.
+    """
+
+    def __init__(self, workers: int = 2, jobs_dir: str = 'jobs', data_dir: str = '.',
+                 finished_ttl: float = 3600.0):
+        """
+        Args:
+            workers: Number of render worker processes
+            jobs_dir: Parent directory of the per-job working directories
+            data_dir: Folder containing the IPA dictionaries
+            finished_ttl: Seconds a finished job (and its output) is kept
+        """
+        self.workers = workers
+        self.jobs_dir = jobs_dir
+        self.finished_ttl = finished_ttl
+        os.makedirs(jobs_dir, exist_ok=True)
+
+        self._manager = multiprocessing.Manager()
+        self._progress = self._manager.dict()
+        self._cancelled = self._manager.dict()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=warm_up,
+                                             initargs=(data_dir,))
+        self._jobs: Dict[str, RenderJob] = {}
+        self._pending = queue.PriorityQueue()
+        self._sequence = itertools.count()  # FIFO order within a priority
+        self._lock = threading.Lock()
+
+        # One dispatcher per worker: the pool never holds more jobs than it
+        # can run, so queued jobs stay visible (and ordered) in this process
+        self._dispatchers = [threading.Thread(target=self._dispatch, daemon=True)
+                             for _ in range(workers)]
+        for dispatcher in self._dispatchers:
+            dispatcher.start()
+
+    def submit(self, text: Optional[str] = None, entries: Optional[Sequence[WordEntry]] = None,
+               theme: str = 'green', profile: str = DEFAULT_PROFILE,
+               include_intro: bool = True, priority: int = PRIORITY_INTERACTIVE,
+               transition: Optional[str] = None) -> str:
+        """
+        Queue a deck for rendering.
+
+        Returns:
+            The job ID
+        """
+        render_args = dict(text=text, entries=entries, theme=theme, profile=profile,
+                           include_intro=include_intro, transition=transition)
+        return self._enqueue('render', render_args, priority)
+
+    def submit_preview(self, text: Optional[str] = None, entries: Optional[Sequence[WordEntry]] = None,
+                       theme: str = 'green', count: int = 6, mode: str = 'sheet',
+                       priority: int = PRIORITY_PREVIEW) -> str:
+        """
+        Queue a quick preview ('sheet' or 'video', see DeckRenderer.render_preview_deck).
+
+        Returns:
+            The job ID
+        """
+        render_args = dict(text=text, entries=entries, theme=theme, count=count, mode=mode)
+        return self._enqueue('preview', render_args, priority)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs are dropped; running jobs stop between
+        pipeline stages.
+
+        Returns:
+            False if the job had already finished
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            if job.status == 'queued':
+                # The dispatcher skips it when it reaches the front of the queue
+                job.status = 'cancelled'
+                job.stage = 'cancelled'
+                job.finished_at = time.time()
+                return True
+        self._cancelled[job_id] = True
+        return True
+
+    def purge(self, max_age: Optional[float] = None) -> int:
+        """
+        Forget jobs finished more than max_age seconds ago (default:
+        finished_ttl) and remove their working directories.
+
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = time.time() - (self.finished_ttl if max_age is None else max_age)
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.finished and job.finished_at is not None and job.finished_at <= cutoff]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            shutil.rmtree(job.work_dir, ignore_errors=True)
+        return len(expired)
+
+    def _enqueue(self, kind: str, render_args: dict, priority: int) -> str:
+        self.purge()
+        job_id = uuid.uuid4().hex[:12]
+        job = RenderJob(job_id=job_id, work_dir=os.path.join(self.jobs_dir, job_id),
+                        kind=kind, priority=priority, submitted_at=time.time())
+        with self._lock:
+            self._jobs[job_id] = job
+        self._pending.put((priority, next(self._sequence), job_id, render_args))
+        return job_id
+
+    def status(self, job_id: str) -> RenderJob:
+        """Snapshot of a job including its latest progress"""
+        with self._lock:
+            if job_id not in self._jobs:
+                raise KeyError(f"Unknown job: {job_id}")
+            job = replace(self._jobs[job_id])
+        if job.status == 'running' and job_id in self._progress:
+            job.stage, job.progress = self._progress[job_id]
+        return job
+
+    def result(self, job_id: str, timeout: Optional[float] = None,
+               poll_interval: float = 0.5) -> Optional[str]:
+        """
+        Wait for a job and return its output video path.
+
+        Raises:
+            RuntimeError if the job failed
+            TimeoutError if the job is not finished within the timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.status(job_id)
+            if job.status == 'done':
+                return job.result
+            if job.status == 'failed':
+                raise RuntimeError(job.error)
+            if job.status == 'cancelled':
+                raise RuntimeError(f"Job {job_id} was cancelled")
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError(f"Job {job_id} is still {job.status}")
+            time.sleep(poll_interval)
+
+    def _update(self, job_id: str, **changes):
+        with self._lock:
+            job = self._jobs[job_id]
+            for key, value in changes.items():
+                setattr(job, key, value)
+
+    def _dispatch(self):
+        while True:
+            _, _, job_id, render_args = self._pending.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != 'queued':
+                    continue  # Cancelled (and possibly purged) while waiting
+                job.status = 'running'
+                job.stage = 'starting'
+                job.started_at = time.time()
+            try:
+                future = self._executor.submit(_run_job, job_id, job.work_dir, job.kind,
+                                               render_args, self._progress, self._cancelled)
+                outcome = future.result()
+                if outcome['status'] == 'ok':
+                    self._update(job_id, status='done', stage='done', progress=1.0,
+                                 result=outcome['output_path'])
+                elif outcome['status'] == 'cancelled':
+                    self._update(job_id, status='cancelled', stage='cancelled')
+                else:
+                    self._update(job_id, status='failed', stage='failed', error=outcome['error'])
+            except Exception as e:
+                self._update(job_id, status='failed', stage='failed', error=str(e))
+            finally:
+                self._update(job_id, finished_at=time.time())
+                self._progress.pop(job_id, None)
+                self._cancelled.pop(job_id, None)
+
+    def shutdown(self):
+        """Stop the dispatchers and worker processes once queued jobs are done"""
+        for _ in self._dispatchers:
+            self._pending.put((float('inf'), next(self._sequence), None, None))
+        for dispatcher in self._dispatchers:
+            dispatcher.join()
+        self._executor.shutdown()
+        self._manager.shutdown()
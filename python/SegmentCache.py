@@ -0,0 +1,136 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+import time
+from typing import Callable, List, Sequence
+import numpy as np
+from moviepy.audio.AudioClip import AudioClip
+from moviepy.config import get_setting
+
+
+class SegmentCache:
+    """
+    Encoded video segments (intro, outro, transitions, ...) shared across renders.
+
+    Segments are stored under a hash of everything that affects their
+    pixels and encoding, so a segment is rendered once and then reused by
+    every deck, process and worker that asks for the same key. Each use
+    refreshes a segment's modification time, and once the cache grows past
+    max_bytes the least recently used segments are removed.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("cache", "segments"),
+                 max_bytes: int = 2 * 1024 ** 3, min_age: float = 3600.0):
+        """
+        Args:
+            cache_dir: Folder of the encoded segments
+            max_bytes: Total size the cache is trimmed to after a render
+            min_age: Seconds since its last use before a segment may be
+                     removed (other renders may be about to join it)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, kind: str, key: Sequence) -> str:
+        """Cache location of a segment"""
+        digest = hashlib.sha1(repr(tuple(key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{kind}_{digest}.mp4")
+
+    def get_or_render(self, kind: str, key: Sequence, render: Callable[[str], None]) -> str:
+        """
+        Return the cached segment, rendering it first if needed.
+
+        Args:
+            kind: Segment type, used as the filename prefix
+            key: Values identifying the segment (theme, size, text, profile, ...)
+            render: Function writing the segment to the path it is given
+
+        Returns:
+            Path to the encoded segment
+        """
+        path = self.path_for(kind, key)
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # Mark as recently used
+            except OSError:
+                pass
+            return path
+
+        # Render under a temporary name so concurrent workers never read a partial file
+        tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.mp4"
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """
+        Remove least recently used segments until the cache fits in max_bytes.
+
+        Returns:
+            Number of segments removed
+        """
+        segments = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.mp4') and '.tmp.' not in entry.name:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Removed by another process
+                segments.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in segments)
+        removed = 0
+        cutoff = time.time() - self.min_age
+        for mtime, size, path in sorted(segments):
+            if total <= self.max_bytes or mtime > cutoff:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # Removed by another process
+            total -= size
+            removed += 1
+        return removed
+
+
+def concat_segments(segment_paths: List[str], output_path: str) -> str:
+    """
+    Join encoded segments without re-encoding (ffmpeg concat demuxer, stream copy).
+
+    All segments must share codec, resolution, frame rate and audio layout,
+    i.e. be encoded with the same EncodingProfile.
+    """
+    ffmpeg = get_setting("FFMPEG_BINARY")
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_path = f.name
+
+    try:
+        subprocess.run(
+            [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+             '-i', list_path, '-c', 'copy', '-movflags', '+faststart', output_path],
+            check=True, capture_output=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Error joining segments: {e.stderr.decode('utf-8', 'replace')}") from e
+    finally:
+        os.remove(list_path)
+    return output_path
+
+
+def silent_audio(duration: float, fps: int = 44100) -> AudioClip:
+    """Stereo silence, so silent segments concatenate with narrated ones"""
+    def make_frame(t):
+        if np.ndim(t):
+            return np.zeros((len(t), 2))
+        return [0, 0]
+    return AudioClip(make_frame, duration=duration, fps=fps)
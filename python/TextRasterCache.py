@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+from PIL import Image, ImageDraw, ImageFont
+
+Color = Union[str, Tuple[int, ...]]
+
+
+@dataclass
+class TextCacheStats:
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TextRasterCache:
+    """
+    LRU cache of rasterized text for card strings that repeat.
+
+    Word types, the watermark and common meanings recur across cards and
+    decks; each distinct (text, font, size, color, effect) is shaped and
+    drawn once into an RGBA bitmap which is then pasted onto every card.
+    """
+    EFFECTS = ('plain', 'shadow', 'highlight')
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._bitmaps: 'OrderedDict[tuple, Tuple[Image.Image, Tuple[int, int]]]' = OrderedDict()
+        self.stats = TextCacheStats()
+
+    @staticmethod
+    def _render(text: str, font: ImageFont.FreeTypeFont, fill: Color, effect: str,
+                effect_fill: Optional[Color], shadow_offset: int = 2,
+                padding: Tuple[int, int] = (20, 10)) -> Tuple[Image.Image, Tuple[int, int]]:
+        """Draw text centred on (0, 0); returns the bitmap and its top-left offset"""
+        left, top, right, bottom = font.getbbox(text, anchor='mm')
+        if effect == 'shadow':
+            right, bottom = right + shadow_offset, bottom + shadow_offset
+        elif effect == 'highlight':
+            left, top = left - padding[0], top - padding[1]
+            right, bottom = right + padding[0], bottom + padding[1]
+        left, top = int(left), int(top)
+
+        bitmap = Image.new('RGBA', (max(1, int(right) - left + 1), max(1, int(bottom) - top + 1)))
+        draw = ImageDraw.Draw(bitmap)
+        origin = (-left, -top)
+        if effect == 'shadow':
+            draw.text((origin[0] + shadow_offset, origin[1] + shadow_offset), text,
+                      font=font, fill=effect_fill, anchor='mm')
+        elif effect == 'highlight':
+            draw.rectangle((0, 0, bitmap.width - 1, bitmap.height - 1), fill=effect_fill)
+        draw.text(origin, text, font=font, fill=fill, anchor='mm')
+        return bitmap, (left, top)
+
+    def bitmap(self, text: str, font: ImageFont.FreeTypeFont, fill: Color,
+               effect: str = 'plain', effect_fill: Optional[Color] = None) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Cached bitmap of a string.
+
+        Args:
+            text: String to draw
+            font: FreeType font (the cache key uses its file and size)
+            fill: Text color
+            effect: 'plain', 'shadow' (effect_fill drawn 2 px down-right) or
+                    'highlight' (effect_fill box behind the text)
+            effect_fill: Color of the shadow / highlight
+
+        Returns:
+            RGBA bitmap and the offset of its top-left corner from the text centre
+        """
+        if effect not in self.EFFECTS:
+            raise ValueError(f"Text effect '{effect}' not found. Available effects: {list(self.EFFECTS)}")
+        key = (text, font.path, font.size, fill, effect, effect_fill)
+        if key in self._bitmaps:
+            self._bitmaps.move_to_end(key)
+            self.stats.hits += 1
+            return self._bitmaps[key]
+
+        self.stats.misses += 1
+        self._bitmaps[key] = self._render(text, font, fill, effect, effect_fill)
+        if len(self._bitmaps) > self.max_entries:
+            self._bitmaps.popitem(last=False)
+        self.stats.entries = len(self._bitmaps)
+        return self._bitmaps[key]
+
+    def draw(self, img: Image.Image, xy: Tuple[int, int], text: str, font: ImageFont.FreeTypeFont,
+             fill: Color, effect: str = 'plain', effect_fill: Optional[Color] = None):
+        """Draw text centred at xy (like ImageDraw.text with anchor='mm')"""
+        if not isinstance(font, ImageFont.FreeTypeFont):
+            # Bitmap fallback fonts have no file to key on; draw directly
+            ImageDraw.Draw(img).text(xy, text, font=font, fill=fill)
+            return
+        bitmap, (left, top) = self.bitmap(text, font, fill, effect, effect_fill)
+        position = (int(xy[0]) + left, int(xy[1]) + top)
+        if img.mode == 'RGBA':
+            img.alpha_composite(bitmap, position)
+        else:
+            img.paste(bitmap, position, mask=bitmap)
+
+
+@lru_cache(maxsize=1)
+def get_text_cache() -> TextRasterCache:
+    """Text cache shared by every card rendered in this process"""
+    return TextRasterCache()
@@ -0,0 +1,145 @@
+import hashlib
+from collections import OrderedDict
+from typing import Union
+import numpy as np
+from moviepy.editor import VideoClip
+
+from EncodingProfiles import EncodingProfile, encode_clip, get_encoding_profile
+from SegmentCache import SegmentCache, silent_audio
+
+
+class TransitionEngine:
+    """
+    Transitions between two card stills, generated with NumPy.
+
+    Frames are computed by blending / slicing the two stills (no per-pixel
+    Python and no MoviePy compositing), kept in a small in-memory LRU and
+    encoded as short segments in the SegmentCache, keyed by
+    (style, duration, fps, card pair hash, profile).
+    """
+    STYLES = ('fade', 'slide', 'zoom')
+
+    def __init__(self, segment_cache: SegmentCache, max_cached: int = 16,
+                 zoom_scale: float = 1.05):
+        """
+        Args:
+            segment_cache: Cache storing the encoded transition segments
+            max_cached: Number of transitions whose frames stay in memory
+            zoom_scale: Final magnification of the outgoing card in 'zoom'
+        """
+        self.segment_cache = segment_cache
+        self.max_cached = max_cached
+        self.zoom_scale = zoom_scale
+        self._frames: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+
+    @staticmethod
+    def image_hash(image: np.ndarray) -> str:
+        return hashlib.sha1(np.ascontiguousarray(image).data).hexdigest()
+
+    @staticmethod
+    def _ease(n: int) -> np.ndarray:
+        """Smoothstep progress values at the centre of each of n frames"""
+        t = (np.arange(n, dtype=np.float32) + 0.5) / n
+        return t * t * (3 - 2 * t)
+
+    def _crossfade(self, first: np.ndarray, second: np.ndarray, progress: np.ndarray,
+                   out: np.ndarray):
+        first = first.astype(np.float32)
+        difference = second.astype(np.float32) - first
+        scratch = np.empty_like(first)
+        for i, p in enumerate(progress):
+            np.multiply(difference, p, out=scratch)
+            scratch += first
+            out[i] = scratch
+
+    def _slide(self, first: np.ndarray, second: np.ndarray, progress: np.ndarray,
+               out: np.ndarray):
+        """The next card pushes the current one out to the left"""
+        width = first.shape[1]
+        for i, p in enumerate(progress):
+            offset = int(round(width * p))
+            out[i, :, :width - offset] = first[:, offset:]
+            out[i, :, width - offset:] = second[:, :offset]
+
+    def _zoom(self, first: np.ndarray, second: np.ndarray, progress: np.ndarray,
+              out: np.ndarray):
+        """The current card zooms in slightly while fading into the next"""
+        height, width = first.shape[:2]
+        rows = np.arange(height, dtype=np.float32) - height / 2
+        cols = np.arange(width, dtype=np.float32) - width / 2
+        second_f = second.astype(np.float32)
+        scratch = np.empty(first.shape, np.float32)
+        for i, p in enumerate(progress):
+            scale = 1 + (self.zoom_scale - 1) * p
+            # Nearest-neighbour sampling through precomputed index vectors
+            y = np.clip((rows / scale + height / 2).astype(np.intp), 0, height - 1)
+            x = np.clip((cols / scale + width / 2).astype(np.intp), 0, width - 1)
+            zoomed = first[y[:, None], x[None, :]]
+            np.subtract(second_f, zoomed, out=scratch)
+            scratch *= p
+            scratch += zoomed
+            out[i] = scratch
+
+    def render_frames(self, first: np.ndarray, second: np.ndarray, style: str = 'fade',
+                      duration: float = 0.5, fps: int = 8) -> np.ndarray:
+        """
+        Frames of a transition from one card still to the next.
+
+        Args:
+            first: Outgoing card, uint8 (height, width, 3)
+            second: Incoming card, same shape
+            style: 'fade', 'slide' or 'zoom'
+            duration: Transition length in seconds
+            fps: Frame rate of the transition
+
+        Returns:
+            uint8 array of shape (frames, height, width, 3)
+        """
+        if style not in self.STYLES:
+            raise ValueError(f"Transition '{style}' not found. Available transitions: {list(self.STYLES)}")
+        if first.shape != second.shape:
+            raise ValueError(f"Card sizes differ: {first.shape} and {second.shape}")
+
+        key = (style, duration, fps, self.image_hash(first), self.image_hash(second))
+        if key in self._frames:
+            self._frames.move_to_end(key)
+            return self._frames[key]
+
+        count = max(1, int(round(duration * fps)))
+        frames = np.empty((count,) + first.shape, np.uint8)
+        render = {'fade': self._crossfade, 'slide': self._slide, 'zoom': self._zoom}[style]
+        render(first, second, self._ease(count), frames)
+
+        self._frames[key] = frames
+        if len(self._frames) > self.max_cached:
+            self._frames.popitem(last=False)
+        return frames
+
+    def segment(self, first: np.ndarray, second: np.ndarray, style: str = 'fade',
+                duration: float = 0.5,
+                profile: Union[str, EncodingProfile] = 'classroom') -> str:
+        """
+        Encoded transition segment (silent), rendered once per card pair.
+
+        The segment uses the profile's frame rate so it can be joined to card
+        segments encoded with the same profile by stream copy.
+
+        Returns:
+            Path to the cached segment
+        """
+        profile = get_encoding_profile(profile)
+        key = (style, duration, self.image_hash(first), self.image_hash(second),
+               first.shape, profile)
+
+        def render(path):
+            frames = self.render_frames(first, second, style, duration, profile.fps)
+            clip_duration = len(frames) / profile.fps
+            clip = VideoClip(lambda t: frames[min(int(t * profile.fps), len(frames) - 1)],
+                             duration=clip_duration)
+            clip = clip.set_audio(silent_audio(clip_duration))
+            try:
+                encode_clip(clip, path, profile, keyframe_times=[0.0])
+            finally:
+                clip.close()
+
+        return self.segment_cache.get_or_render(f"transition_{style}", key, render)
@@ -1,7 +1,6 @@
 import gradio as gr
-import re
 from dataclasses import dataclass
-from typing import List, Optional,Tuple, List, Dict
+from typing import Optional,Tuple, Dict
 from gtts import gTTS
 from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, AudioFileClip
 from moviepy.editor import ImageClip, concatenate_videoclips
@@ -13,12 +12,9 @@ import tempfile
 import shutil
 import os
 from datetime import datetime
-from OpenDictIPA import OpenDictIPA;
-import unicodedata
 import pandas as pd
 
 from IPAFontManager import IPAFontManager
-from WordEntry import WordEntry;
 
 # Configure MoviePy to use ImageMagick
 def configure_moviepy():
@@ -49,128 +45,21 @@ def configure_moviepy():
         "Download from: https://imagemagick.org/script/download.php#windows"
     )
 
-# Modify your WordParser class:
-class WordParser:
-    def __init__(self, ipa_lookup: Optional[OpenDictIPA] = None):
-        self.ipa_uk_lookup = ipa_lookup
-        self.ipa_us_lookup = ipa_lookup
-
-
-    def parse_line(self, line: str, line_number: int = None) -> WordEntry:
-        """Parse a single line of the word list"""
-        line = line.strip()
-
-        # Pattern for line with pronunciation at end
-        pattern1 = r'^(?:(\d+)\.\s+)?([^:]+):\s*(?:\(([a-z]+)\))?\s*([^/]+)(?:/([^/]+)/)?\s*$'
-
-        match = re.match(pattern1, line)
-        if not match:
-            raise ValueError(f"Invalid line format: {line}")
-
-        number = int(match.group(1)) if match.group(1) else line_number
-        word_part = match.group(2).strip()
-        word_type = match.group(3)
-        meaning = match.group(4).strip()
-        pronunciation = match.group(5).strip() if match.group(5) else None
-
-
-
-        # Check for irregular verb forms
-        irregular_forms = None
-        if " - " in word_part:
-            irregular_forms = [form.strip() for form in word_part.split(" - ")]
-            combined_pronunciation = None;
-            word = word_part
-            if (pronunciation is None):
-                for word in irregular_forms:
-                    # If no pronunciation provided in input, try to look it up
-                    if not pronunciation and self.ipa_uk_lookup:
-                        pronunciations = self.get_pronunciation(word)
-                        if pronunciations:
-                            # Use first pronunciation
-                            pronunciation = pronunciations[0]
-                            pronunciation = self.normalize_pronunciation(pronunciation);
-                    if not combined_pronunciation:
-                        combined_pronunciation = pronunciation;
-                    else:
-                        combined_pronunciation = combined_pronunciation +"-"+ pronunciation
-                    # print (pronunciation);
-                    pronunciation = None
-
-                if combined_pronunciation is not None:
-                    pronunciation = combined_pronunciation;
-
-        else:
-            word = word_part
-            # If no pronunciation provided in input, try to look it up
-            if not pronunciation and self.ipa_uk_lookup:
-                pronunciations = self.get_pronunciation(word)
-                if pronunciations:
-                    pronunciation = pronunciations[0]
-                    pronunciation = self.normalize_pronunciation(pronunciation);
-        return WordEntry(
-            number=number,
-            word=word,
-            word_type=word_type,
-            meaning=meaning,
-            pronunciation=pronunciation,
-            irregular_forms=irregular_forms
-        )
-
-    def get_pronunciation(self,word):
-        first = self.ipa_uk_lookup.get_pronunciation(word);
-        if len(first) > 0:
-            return first;
-        return first;
-
-
-    def normalize_pronunciation(self, ipa_text: str) -> str:
-        ipa_text = unicodedata.normalize("NFC",ipa_text).strip("/").strip("/");
-        """
-        Normalize stress marks to the standard IPA vertical line.
-        """
-        # Different possible stress mark characters
-        stress_marks = {
-            '\u02C8',  # ˈ MODIFIER LETTER VERTICAL LINE (preferred IPA)
-            '\u0027',  # ' APOSTROPHE
-            '\u2032',  # ′ PRIME
-        }
-        # Replace all variants with the standard IPA stress mark
-        for mark in stress_marks:
-            ipa_text = ipa_text.replace(mark, 'ˈ')  # Using standard IPA stress mark
-
-        ipa_text = ipa_text.replace('ɫ','l')
-
-        return ipa_text
-    def parse_text(self, text: str) -> List[WordEntry]:
-        """Parse the entire text input"""
-        lines = [line for line in text.strip().split("\n") if line.strip()]
-        entries = []
-
-        for i, line in enumerate(lines, 1):
-            try:
-                entry = self.parse_line(line, i)
-                entries.append(entry)
-            except ValueError as e:
-                print(f"Warning: Skipping invalid line {i}: {e}")
-
-        return entries
-
+from WordParser import load_ipa_lookup
+from DeckImporter import DeckImporter
+from PreviewEngine import DeckSnapshot, PreviewUpdate, format_word_entry, get_preview_engine
 
 from EnhancedFlashcardGenerator import EnhancedFlashcardGenerator
+from RenderJobQueue import RenderJobQueue, PRIORITY_INTERACTIVE
+import time
 
 def process_text(text: str) -> str:
     """Process input text and generate video"""
-    # Initialize the IPA lookup
-    ipa_lookup = OpenDictIPA(".")
-    ipa_lookup.load_ipa_dict("en_UK")  # Load American English pronunciations
-    ipa_lookup.load_ipa_dict("en_US")  # Load American English pronunciations
-    parser = WordParser(ipa_lookup=ipa_lookup);
-
     generator = EnhancedFlashcardGenerator()
 
     try:
-        entries = parser.parse_text(text)
+        # Lines already previewed are not parsed or looked up again
+        entries = get_preview_engine().update(text).entries
         if not entries:
             raise ValueError("No valid entries found in the input text")
         video_path = generator.create_video(entries)
@@ -184,64 +73,61 @@ def process_text(text: str) -> str:
 import gradio as gr
 from typing import Tuple
 
-def format_word_entry(entry) -> str:
-    """Format a single word entry to standardized format"""
-    parts = []
-
-    # Handle irregular forms
-    if entry.irregular_forms:
-        parts.append(" - ".join(entry.irregular_forms))
-    else:
-        parts.append(entry.word)
-
-    # Add word type if exists
-    if entry.word_type:
-        parts.append(f"({entry.word_type})")
-
-    # Add meaning
-    parts.append(entry.meaning)
-
-    # Add pronunciation if exists
-    if entry.pronunciation:
-        parts.append(f"/{entry.pronunciation}/")
-
-    return ": ".join(parts[:2]) + " " + " ".join(parts[2:])
-
-def parse_and_preview(text: str) -> Tuple[str, str]:
+def parse_and_preview(text: str) -> Tuple[str, str, Optional[DeckSnapshot]]:
     """
     Parse text and return standardized format
-    Returns formatted text and status message
+    Returns formatted text, status message and the parsed deck for rendering
     """
     if not text.strip():
-        return "", "Please enter some text to process"
+        return "", "Please enter some text to process", None
 
     try:
-        # Initialize the IPA lookup
-        ipa_lookup = OpenDictIPA(".")
-        ipa_lookup.load_ipa_dict("en_UK")
-        ipa_lookup.load_ipa_dict("en_US")
-        parser = WordParser(ipa_lookup=ipa_lookup)
-
-        # Parse entries
-        entries = parser.parse_text(text)
-        if not entries:
-            return "", "No valid entries found in the input text"
-
-        # Format entries to standardized text
-        formatted_lines = []
-        for i, entry in enumerate(entries, 1):
-            formatted_line = f"{i}. {format_word_entry(entry)}"
-            formatted_lines.append(formatted_line)
-
-        formatted_text = "\n".join(formatted_lines)
-        return (
-            formatted_text,
-            f"Found {len(entries)} words. Review the formatted text below and make any needed changes before creating the video."
-        )
+        # Unchanged lines come from the shared preview cache
+        engine = get_preview_engine()
+        update = engine.update(text)
+        if not update.entries:
+            return "", "No valid entries found in the input text", None
+        return (update.formatted_text, preview_status(update),
+                engine.snapshot(update.formatted_text, update.entries))
     except Exception as e:
-        return "", f"Error processing text: {str(e)}"
+        return "", f"Error processing text: {str(e)}", None
+
+def preview_status(update: PreviewUpdate, max_errors: int = 3) -> str:
+    """Status line of a preview update, listing the first invalid lines"""
+    status = f"Found {len(update.entries)} words. Review the formatted text below and make any needed changes before creating the video."
+    for line_number, error in update.errors[:max_errors]:
+        status += f"  \nSkipped line {line_number}: {error}"
+    if len(update.errors) > max_errors:
+        status += f"  \n... and {len(update.errors) - max_errors} more invalid lines"
+    return status
+
+def import_word_bank(path: Optional[str]) -> Tuple[str, str, Optional[DeckSnapshot]]:
+    """
+    Import a word bank file and return it in the standardized format
+    Returns formatted text, the import report and the imported deck for rendering
+    """
+    if not path:
+        return "", "", None
+    try:
+        deck, report = DeckImporter(load_ipa_lookup()).import_file(path)
+    except Exception as e:
+        return "", f"Error importing word bank: {str(e)}", None
+    if not len(deck):
+        return "", "No valid entries found in the word bank\n\n" + report.summary(), None
+    formatted_text = "\n".join(f"{i}. {format_word_entry(entry)}" for i, entry in enumerate(deck, 1))
+    # Markdown needs two trailing spaces for a line break
+    return (formatted_text, report.summary().replace("\n", "  \n"),
+            get_preview_engine().snapshot(formatted_text, deck))
+
+def create_interface(render_workers: int = 2):
+    """
+    Build the Gradio app.
+
+    Args:
+        render_workers: Number of background processes rendering videos
+    """
+    job_queue = RenderJobQueue(workers=render_workers)
 
-def create_interface():
     with gr.Blocks() as app:
         gr.Markdown("""
         # English Flashcard Video Generator
@@ -264,10 +150,37 @@ def create_interface():
                 placeholder="Enter your word list here..."
             )
 
+        with gr.Row():
+            import_file = gr.File(
+                label="Or import a word bank (TXT, CSV, XLSX or JSONL)",
+                file_types=[".txt", ".csv", ".xlsx", ".jsonl"],
+                type="filepath"
+            )
+
         with gr.Row():
             parse_btn = gr.Button("Format Text")
+            preview_btn = gr.Button("Quick Preview")
             generate_btn = gr.Button("Create Video")
 
+        with gr.Row():
+            preview_count = gr.Slider(
+                minimum=1,
+                maximum=20,
+                value=6,
+                step=1,
+                label="Cards to preview"
+            )
+            preview_mode = gr.Radio(
+                choices=["Contact sheet", "Video"],
+                value="Contact sheet",
+                label="Preview type"
+            )
+            transition_style = gr.Dropdown(
+                choices=["None", "fade", "slide", "zoom"],
+                value="None",
+                label="Transition between cards"
+            )
+
         # Status message
         status_msg = gr.Markdown("")
 
@@ -278,6 +191,17 @@ def create_interface():
                 placeholder="Processed text will appear here..."
             )
 
+        with gr.Row():
+            preview_image = gr.Image(
+                label="Card Preview",
+                type="filepath"
+            )
+            preview_video = gr.Video(
+                label="Preview Video",
+                height=360,
+                width=640
+            )
+
         with gr.Row():
             video_output = gr.Video(
                 label="Generated Flashcards",
@@ -285,41 +209,158 @@ def create_interface():
                 width=640
             )
 
-        def start_video_generation(text):
+        with gr.Row():
+            job_id_box = gr.Textbox(
+                label="Job ID",
+                placeholder="Filled in when a video is queued"
+            )
+            check_btn = gr.Button("Check Job")
+
+        # Jobs started from this browser session, by kind ('render' / 'preview')
+        session_jobs = gr.State({})
+        # Formatted lines last shown by the live preview
+        previewed_lines = gr.State([])
+        # Parsed deck behind the formatted list; renders use it unless the list was edited
+        previewed_deck = gr.State(None)
+
+        def cancel_session_jobs(jobs, kinds=('render', 'preview')):
+            for kind in kinds:
+                if kind in jobs:
+                    job_queue.cancel(jobs[kind])
+            return {kind: job_id for kind, job_id in jobs.items() if kind not in kinds}
+
+        def start_video_generation(text, transition, snapshot, jobs):
+            """Queue the render and stream its progress until it finishes"""
             if not text:
-                return None, "Please format the word list first before creating video."
+                yield None, "", "Please format the word list first before creating video.", snapshot, jobs
+                return
+            # The previewed deck is rendered as is; only an edited list is parsed again
+            snapshot = get_preview_engine().current(text, snapshot)
+            if not len(snapshot.deck):
+                yield None, "", "No valid entries found in the formatted word list.", snapshot, jobs
+                return
+            # A new click replaces this session's previous render
+            jobs = cancel_session_jobs(jobs, kinds=('render',))
+            job_id = job_queue.submit(entries=snapshot.deck, priority=PRIORITY_INTERACTIVE,
+                                      transition=None if transition == "None" else transition)
+            jobs = {**jobs, 'render': job_id}
+            job = job_queue.status(job_id)
+            while not job.finished:
+                yield None, job_id, f"Word list version {snapshot.version}: {job.describe()}", snapshot, jobs
+                time.sleep(1)
+                job = job_queue.status(job_id)
+            if job.status == 'done':
+                yield job.result, job_id, "Video generation complete!", snapshot, jobs
+            elif job.status == 'cancelled':
+                yield None, job_id, "Video generation cancelled because the word list changed.", snapshot, jobs
+            else:
+                yield None, job_id, f"Error generating video: {job.error}", snapshot, jobs
+
+        def check_job(job_id):
+            """Look up a queued job (e.g. after reloading the page)"""
             try:
-                video_path = process_text(text)
-                return video_path, "Video generation complete!"
-            except Exception as e:
-                return None, f"Error generating video: {str(e)}"
+                job = job_queue.status(job_id.strip())
+            except KeyError:
+                return None, f"Unknown job: {job_id}"
+            if job.status == 'done':
+                return job.result, "Video generation complete!"
+            return None, job.describe()
 
         # Parse and preview handling
         parse_btn.click(
             fn=parse_and_preview,
             inputs=[text_input],
-            outputs=[preview_text, status_msg]
+            outputs=[preview_text, status_msg, previewed_deck]
+        )
+
+        # Word banks are imported straight into the formatted list
+        import_file.change(
+            fn=import_word_bank,
+            inputs=[import_file],
+            outputs=[preview_text, status_msg, previewed_deck]
+        )
+
+        # Quick preview of the formatted list (or the raw input if not formatted yet)
+        def start_preview(formatted_text, raw_text, count, mode, snapshot, jobs):
+            """Queue a preview ahead of full renders and wait for it"""
+            text = formatted_text or raw_text
+            if not text.strip():
+                yield None, None, "Please enter some text to preview", jobs
+                return
+            jobs = cancel_session_jobs(jobs, kinds=('preview',))
+            entries = get_preview_engine().current(text, snapshot).deck
+            job_id = job_queue.submit_preview(
+                entries=entries, count=int(count), mode='video' if mode == "Video" else 'sheet')
+            jobs = {**jobs, 'preview': job_id}
+            job = job_queue.status(job_id)
+            while not job.finished:
+                yield None, None, job.describe(), jobs
+                time.sleep(0.25)
+                job = job_queue.status(job_id)
+            if job.status != 'done':
+                yield None, None, f"Error rendering preview: {job.error or job.status}", jobs
+            elif mode == "Video":
+                yield None, job.result, f"Preview of the first {int(count)} cards.", jobs
+            else:
+                yield job.result, None, f"Preview of the first {int(count)} cards.", jobs
+            # Gradio has copied the preview to its own cache by now
+            shutil.rmtree(job.work_dir, ignore_errors=True)
+
+        preview_btn.click(
+            fn=start_preview,
+            inputs=[preview_text, text_input, preview_count, preview_mode, previewed_deck, session_jobs],
+            outputs=[preview_image, preview_video, status_msg, session_jobs],
+            concurrency_limit=None
         )
 
         # Video generation handling
         generate_btn.click(
             fn=start_video_generation,
-            inputs=[preview_text],
+            inputs=[preview_text, transition_style, previewed_deck, session_jobs],
+            outputs=[video_output, job_id_box, status_msg, previewed_deck, session_jobs],
+            concurrency_limit=None
+        )
+
+        check_btn.click(
+            fn=check_job,
+            inputs=[job_id_box],
             outputs=[video_output, status_msg]
         )
 
-        # Reset interface when text input changes
-        def reset_interface():
-            return "", "Input changed. Click 'Format Text' to update."
+        # Live preview while typing: only edited lines are parsed again, and
+        # renders of the old list are dropped
+        def live_preview(text, previous_lines, snapshot, jobs):
+            if not text.strip():
+                return "", "", [], None, cancel_session_jobs(jobs)
+            engine = get_preview_engine()
+            update = engine.update(text, previous_lines)
+            if not update.changed and len(update.formatted_lines) == len(previous_lines):
+                # Edits that do not change the formatted list keep the user's own
+                # edits and any render of it that is still running
+                return gr.update(), preview_status(update), previous_lines, snapshot, jobs
+            jobs = cancel_session_jobs(jobs)
+            return (update.formatted_text, preview_status(update), update.formatted_lines,
+                    engine.snapshot(update.formatted_text, update.entries), jobs)
 
         text_input.change(
-            fn=reset_interface,
-            outputs=[preview_text, status_msg]
+            fn=live_preview,
+            inputs=[text_input, previewed_lines, previewed_deck, session_jobs],
+            outputs=[preview_text, status_msg, previewed_lines, previewed_deck, session_jobs],
+            trigger_mode="always_last",
+            show_progress="hidden"
         )
 
     return app
 
 if __name__ == "__main__":
-    configure_moviepy()
+    # Cards, intro and outro are drawn with PIL; ImageMagick is only needed
+    # for custom MoviePy TextClips
+    try:
+        configure_moviepy()
+    except RuntimeError as e:
+        print(f"Warning: {str(e)}")
+    # Download the IPA font now, if missing, rather than during a render
+    if not IPAFontManager().ensure_font():
+        print("Warning: No IPA font available; pronunciations may not render correctly")
     app = create_interface()
     app.launch()
\ No newline at end of file
@@ -1,102 +1,253 @@
 from moviepy.editor import VideoFileClip, CompositeVideoClip, ColorClip, VideoClip
-from moviepy.video.tools.drawing import circle, color_gradient
 import numpy as np
-from typing import Optional, List, Tuple
+from PIL import Image, ImageDraw
+from typing import Callable, Dict, Optional, List, Tuple
+
+from OverlayCache import OverlayCache
 
 class VideoOverlayManager:
-    def __init__(self, width: int = 1280, height: int = 720):
+    # Loop length (seconds) of every effect; all motion is periodic in these
+    EFFECT_PERIODS = {
+        'background': 4 * np.pi,
+        'particles': 2 * np.pi,
+        'geometric': 2 * np.pi,
+    }
+
+    def __init__(self, width: int = 1280, height: int = 720,
+                 overlay_cache: Optional[OverlayCache] = None):
         self.width = width
         self.height = height
+        self.overlay_cache = overlay_cache
 
-    def create_animated_background(self, duration: float, theme_color: str) -> VideoClip:
-        """Create an animated background with floating shapes and gradients"""
-        def make_frame(t):
-            frame = np.zeros((self.height, self.width, 3))
-
-            # Create gradient background
-            for y in range(self.height):
-                opacity = 1 - (y / self.height)
-                color_value = int(255 * opacity * 0.3)  # 30% max intensity
-                frame[y, :] = [color_value] * 3
-
-            # Add floating circles
-            num_circles = 5
-            for i in range(num_circles):
-                # Calculate position based on time
-                x = int(self.width * (0.2 + 0.6 * (np.sin(t + i) + 1) / 2))
-                y = int(self.height * (0.2 + 0.6 * (np.cos(t * 0.5 + i) + 1) / 2))
+    def _gray_clip(self, render: Callable[[float], np.ndarray], duration: float) -> VideoClip:
+        """Wrap a grayscale frame renderer into an RGB clip (output buffer reused per frame)"""
+        rgb = np.empty((self.height, self.width, 3), np.uint8)
 
-                # Draw circle with soft edges
-                radius = 50 + 20 * np.sin(t * 2 + i)
-                circle(frame, (x, y), radius, (255, 255, 255), blur=30)
-
-            return frame
-
-        return VideoClip(make_frame, duration=duration)
-
-    def create_geometric_overlay(self, duration: float) -> VideoClip:
-        """Create geometric patterns that move slowly"""
         def make_frame(t):
-            frame = np.zeros((self.height, self.width, 3))
-
-            # Create hexagonal grid
-            hex_size = 100
-            hex_spacing = hex_size * 1.5
-            offset = t * 20  # Slow movement
-
-            for row in range(-1, self.height // int(hex_spacing) + 2):
-                for col in range(-1, self.width // int(hex_spacing) + 2):
-                    x = col * hex_spacing + (row % 2) * (hex_spacing / 2) + offset
-                    y = row * hex_spacing * 0.866
-
-                    # Draw hexagon
-                    for i in range(6):
-                        angle1 = 2 * np.pi * i / 6
-                        angle2 = 2 * np.pi * (i + 1) / 6
-                        x1 = int(x + hex_size * np.cos(angle1))
-                        y1 = int(y + hex_size * np.sin(angle1))
-                        x2 = int(x + hex_size * np.cos(angle2))
-                        y2 = int(y + hex_size * np.sin(angle2))
-
-                        if 0 <= x1 < self.width and 0 <= y1 < self.height:
-                            opacity = 0.05 * (1 + np.sin(t + x/self.width * np.pi))
-                            frame[y1:y2, x1:x2] = np.maximum(frame[y1:y2, x1:x2], 255 * opacity)
-
-            return frame
+            np.copyto(rgb, render(t)[:, :, None])
+            return rgb
 
         return VideoClip(make_frame, duration=duration)
 
-    def create_particle_effect(self, duration: float) -> VideoClip:
-        """Create floating particle effect"""
-        num_particles = 50
-        particles = [(np.random.rand(), np.random.rand(), np.random.rand() * 2 * np.pi)
-                    for _ in range(num_particles)]
+    @staticmethod
+    def _radial_kernel(radius: int, blur: float) -> np.ndarray:
+        """Soft disc: 1 inside radius - blur, fading linearly to 0 at radius"""
+        d = np.arange(-radius, radius + 1, dtype=np.float32)
+        distance = np.sqrt(d[:, None] ** 2 + d[None, :] ** 2)
+        return np.clip((radius - distance) / blur, 0.0, 1.0).astype(np.float32)
+
+    def _background_renderer(self, num_circles: int = 5, blur: float = 30.0) -> Callable[[float], np.ndarray]:
+        """
+        Grayscale renderer for the animated background.
+
+        The uint8 gradient and one falloff kernel per integer radius are
+        computed up front; each frame copies the gradient into a reused
+        buffer and blends the circles in place on their bounding boxes only.
+        """
+        height, width = self.height, self.width
+        # Vertical gradient, 30% max intensity at the top
+        rows = (255 * (1 - np.arange(height) / height) * 0.3).astype(np.uint8)
+        gradient = np.ascontiguousarray(np.broadcast_to(rows[:, None], (height, width)))
+
+        radii = range(29, 71)  # radius = 50 + 20 * sin(...)
+        kernels: Dict[int, np.ndarray] = {r: self._radial_kernel(r, blur) for r in radii}
+        scratch = np.empty((2 * max(radii) + 1,) * 2, np.float32)
+        out = np.empty((height, width), np.uint8)
+        phases = np.arange(num_circles, dtype=np.float64)
+        centres_x = np.empty(num_circles)
+        centres_y = np.empty(num_circles)
+        sizes = np.empty(num_circles)
+
+        def render(t):
+            np.copyto(out, gradient)
+
+            # Circle positions and radii for this frame, all at once
+            np.sin(t + phases, out=centres_x)
+            np.cos(t * 0.5 + phases, out=centres_y)
+            np.sin(t * 2 + phases, out=sizes)
+            for cx, cy, size in zip(width * (0.2 + 0.3 * (centres_x + 1)),
+                                    height * (0.2 + 0.3 * (centres_y + 1)),
+                                    50 + 20 * sizes):
+                x, y, radius = int(cx), int(cy), int(size)
+                kernel = kernels[radius]
+                # Clip the kernel's bounding box to the frame
+                x0, y0 = max(x - radius, 0), max(y - radius, 0)
+                x1, y1 = min(x + radius + 1, width), min(y + radius + 1, height)
+                if x0 >= x1 or y0 >= y1:
+                    continue
+                k = kernel[y0 - y + radius:y1 - y + radius, x0 - x + radius:x1 - x + radius]
+                region = out[y0:y1, x0:x1]
+                tmp = scratch[:y1 - y0, :x1 - x0]
+                # Blend towards white: region + (255 - region) * k
+                np.subtract(255, region, out=tmp)
+                tmp *= k
+                tmp += region
+                np.copyto(region, tmp, casting='unsafe')
+
+            return out
+
+        return render
 
-        def make_frame(t):
-            frame = np.zeros((self.height, self.width, 3))
-
-            for base_x, base_y, angle in particles:
-                # Calculate position with smooth movement
-                x = int(self.width * (base_x + 0.1 * np.sin(t + angle)))
-                y = int(self.height * (base_y + 0.1 * np.cos(t + angle)))
-
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    # Create glowing particle
-                    size = int(5 + 3 * np.sin(t * 2 + angle))
-                    opacity = 0.15 * (1 + np.sin(t + angle)) / 2
-
-                    for dy in range(-size, size + 1):
-                        for dx in range(-size, size + 1):
-                            if x + dx < 0 or x + dx >= self.width or y + dy < 0 or y + dy >= self.height:
-                                continue
-                            distance = np.sqrt(dx*dx + dy*dy)
-                            if distance <= size:
-                                pixel_opacity = opacity * (1 - distance/size)
-                                frame[y + dy, x + dx] = np.maximum(
-                                    frame[y + dy, x + dx],
-                                    [255 * pixel_opacity] * 3
-                                )
-
-            return frame
+    def create_animated_background(self, duration: float, theme_color: str) -> VideoClip:
+        """Create an animated background with floating shapes and gradients"""
+        return self._gray_clip(self._background_renderer(), duration)
+
+    def _hex_mask(self, hex_size: int = 100, line_width: int = 2) -> Tuple[np.ndarray, int]:
+        """
+        Rasterize the hexagon grid once.
+
+        Every row of the grid repeats every `hex_spacing` pixels: one period
+        is drawn (with the neighbouring hexagons that cross into it) and
+        tiled to one period wider than the frame, so any horizontal scroll
+        is a slice of the mask.
+
+        Returns:
+            uint8 mask (1 on hexagon edges) of shape (height, width + period)
+            and the period in pixels
+        """
+        hex_spacing = hex_size * 1.5
+        period = int(hex_spacing)
+        # Three periods wide; the middle one is complete
+        canvas = Image.new('L', (3 * period, self.height), 0)
+        draw = ImageDraw.Draw(canvas)
+
+        angles = 2 * np.pi * np.arange(7) / 6
+        unit = np.stack([np.cos(angles), np.sin(angles)], axis=1) * hex_size
+        for row in range(-1, int(self.height / (hex_spacing * 0.866)) + 2):
+            for col in range(-1, 4):
+                x = col * hex_spacing + (row % 2) * (hex_spacing / 2)
+                y = row * hex_spacing * 0.866
+                points = [tuple(p) for p in np.rint(unit + (x, y)).astype(int)]
+                draw.line(points, fill=1, width=line_width, joint='curve')
+
+        tile = np.asarray(canvas)[:, period:2 * period]
+        repeats = -(-(self.width + period) // period)
+        return np.ascontiguousarray(np.tile(tile, (1, repeats))[:, :self.width + period]), period
+
+    def _geometric_renderer(self) -> Callable[[float], np.ndarray]:
+        """
+        Grayscale renderer for the scrolling hexagon grid.
+
+        Each frame is a slice of the precomputed mask multiplied by a column
+        opacity ramp (uint8, no per-frame trigonometry on the grid). The grid
+        scrolls one tile per loop so the effect repeats every 2*pi seconds.
+        """
+        mask, period = self._hex_mask()
+        speed = period / self.EFFECT_PERIODS['geometric']
+        width = self.width
+        column_phase = np.arange(width) / width * np.pi
+        ramp = np.empty(width, np.float64)
+        ramp_u8 = np.empty(width, np.uint8)
+        out = np.empty((self.height, width), np.uint8)
+
+        def render(t):
+            shift = int(t * speed) % period
+            np.add(column_phase, t, out=ramp)
+            np.sin(ramp, out=ramp)
+            np.add(ramp, 1, out=ramp)
+            np.multiply(ramp, 255 * 0.05, out=ramp)
+            np.copyto(ramp_u8, ramp, casting='unsafe')
+            np.multiply(mask[:, period - shift:period - shift + width], ramp_u8, out=out)
+            return out
+
+        return render
 
-        return VideoClip(make_frame, duration=duration)
+    def create_geometric_overlay(self, duration: float) -> VideoClip:
+        """Create geometric patterns that move slowly"""
+        return self._gray_clip(self._geometric_renderer(), duration)
+
+    @staticmethod
+    def _glow_sprite(size: int) -> np.ndarray:
+        """Particle glow: 1 at the centre fading linearly to 0 at `size` pixels"""
+        d = np.arange(-size, size + 1, dtype=np.float32)
+        distance = np.sqrt(d[:, None] ** 2 + d[None, :] ** 2)
+        return np.clip(1 - distance / size, 0.0, 1.0).astype(np.float32)
+
+    def _particle_renderer(self, num_particles: int = 50, seed: int = 0) -> Callable[[float], np.ndarray]:
+        """
+        Grayscale renderer for floating particles.
+
+        Particle positions, sizes and opacities are computed as arrays per
+        frame and each particle is stamped from a precomputed glow sprite
+        (one per integer size) with np.maximum on its slice of the frame.
+        """
+        height, width = self.height, self.width
+        rng = np.random.default_rng(seed)
+        base_x = rng.random(num_particles)
+        base_y = rng.random(num_particles)
+        angles = rng.random(num_particles) * 2 * np.pi
+
+        sizes = range(2, 9)  # size = 5 + 3 * sin(...)
+        sprites: Dict[int, np.ndarray] = {size: self._glow_sprite(size) for size in sizes}
+        scratch = np.empty((2 * max(sizes) + 1,) * 2, np.float32)
+        out = np.empty((height, width), np.uint8)
+
+        def render(t):
+            out.fill(0)
+            xs = (width * (base_x + 0.1 * np.sin(t + angles))).astype(int)
+            ys = (height * (base_y + 0.1 * np.cos(t + angles))).astype(int)
+            particle_sizes = (5 + 3 * np.sin(t * 2 + angles)).astype(int)
+            intensities = 255 * 0.15 * (1 + np.sin(t + angles)) / 2
+            visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+
+            for x, y, size, intensity in zip(xs[visible], ys[visible],
+                                             particle_sizes[visible], intensities[visible]):
+                sprite = sprites[size]
+                x0, y0 = max(x - size, 0), max(y - size, 0)
+                x1, y1 = min(x + size + 1, width), min(y + size + 1, height)
+                region = out[y0:y1, x0:x1]
+                tmp = scratch[:y1 - y0, :x1 - x0]
+                np.multiply(sprite[y0 - y + size:y1 - y + size, x0 - x + size:x1 - x + size],
+                            intensity, out=tmp)
+                np.maximum(tmp, region, out=tmp)
+                np.copyto(region, tmp, casting='unsafe')
+
+            return out
+
+        return render
+
+    def create_particle_effect(self, duration: float, num_particles: int = 50,
+                               seed: int = 0) -> VideoClip:
+        """Create floating particle effect (the same seed gives the same particles)"""
+        return self._gray_clip(self._particle_renderer(num_particles, seed), duration)
+
+    def _renderer(self, effect: str, seed: int = 0) -> Callable[[float], np.ndarray]:
+        if effect == 'background':
+            return self._background_renderer()
+        if effect == 'particles':
+            return self._particle_renderer(seed=seed)
+        if effect == 'geometric':
+            return self._geometric_renderer()
+        raise ValueError(f"Overlay '{effect}' not found. Available overlays: {list(self.EFFECT_PERIODS)}")
+
+    def cached_renderer(self, effect: str, fps: int = 8, seed: int = 0) -> Callable[[float], np.ndarray]:
+        """
+        Grayscale frame function backed by a cached loop of pre-rendered frames.
+
+        One period of the effect is rendered once per (effect, resolution,
+        fps, seed) into the OverlayCache; afterwards every frame is an index
+        into the memory-mapped loop.
+
+        Args:
+            effect: 'background', 'particles' or 'geometric'
+            fps: Frame rate the overlay will be written at
+            seed: Particle seed (ignored by the other effects)
+
+        Returns:
+            Function returning the (height, width) uint8 frame at time t
+        """
+        if effect not in self.EFFECT_PERIODS:
+            raise ValueError(f"Overlay '{effect}' not found. Available overlays: {list(self.EFFECT_PERIODS)}")
+        if self.overlay_cache is None:
+            self.overlay_cache = OverlayCache()
+
+        period = self.EFFECT_PERIODS[effect]
+        frames = self.overlay_cache.frames(effect, (self.width, self.height), fps, seed,
+                                           period, self._renderer(effect, seed))
+        count = len(frames)
+        return lambda t: frames[int(round(t * count / period)) % count]
+
+    def create_cached_overlay(self, effect: str, duration: float, fps: int = 8,
+                              seed: int = 0) -> VideoClip:
+        """Overlay clip played from a cached loop (see cached_renderer)"""
+        return self._gray_clip(self.cached_renderer(effect, fps, seed), duration)
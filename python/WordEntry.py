@@ -1,13 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Optional,List
-import os
+from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class WordEntry:
     word: str
     word_type: Optional[str]
     meaning: str
     pronunciation: Optional[str] = None
     number: Optional[int] = None
-    irregular_forms: List[str] = None
\ No newline at end of file
+    irregular_forms: Optional[List[str]] = None
@@ -0,0 +1,145 @@
+import re
+import unicodedata
+from typing import List, Optional
+from OpenDictIPA import OpenDictIPA
+from WordEntry import WordEntry
+from Deck import Deck
+
+_ipa_lookup: Optional[OpenDictIPA] = None
+
+# Pattern for line with pronunciation at end
+LINE_PATTERN = re.compile(r'^(?:(\d+)\.\s+)?([^:]+):\s*(?:\(([a-z]+)\))?\s*([^/]+)(?:/([^/]+)/)?\s*$')
+
+def load_ipa_lookup(data_dir: str = ".") -> OpenDictIPA:
+    """Load the UK/US pronunciation dictionaries once per process"""
+    global _ipa_lookup
+    if _ipa_lookup is None:
+        ipa_lookup = OpenDictIPA(data_dir)
+        ipa_lookup.load_ipa_dict("en_UK")
+        ipa_lookup.load_ipa_dict("en_US")
+        _ipa_lookup = ipa_lookup
+    return _ipa_lookup
+
+
+class WordParser:
+    def __init__(self, ipa_lookup: Optional[OpenDictIPA] = None):
+        self.ipa_uk_lookup = ipa_lookup
+        self.ipa_us_lookup = ipa_lookup
+
+
+    def parse_line(self, line: str, line_number: int = None) -> WordEntry:
+        """Parse a single line of the word list"""
+        line = line.strip()
+
+        match = LINE_PATTERN.match(line)
+        if not match:
+            raise ValueError(f"Invalid line format: {line}")
+
+        number = int(match.group(1)) if match.group(1) else line_number
+        word_part = match.group(2).strip()
+        word_type = match.group(3)
+        meaning = match.group(4).strip()
+        pronunciation = match.group(5).strip() if match.group(5) else None
+
+
+
+        # Check for irregular verb forms
+        irregular_forms = None
+        if " - " in word_part:
+            irregular_forms = [form.strip() for form in word_part.split(" - ")]
+            combined_pronunciation = None;
+            word = word_part
+            if (pronunciation is None):
+                for form in irregular_forms:
+                    # If no pronunciation provided in input, try to look it up
+                    if not pronunciation and self.ipa_uk_lookup:
+                        pronunciations = self.get_pronunciation(form)
+                        if pronunciations:
+                            # Use first pronunciation
+                            pronunciation = pronunciations[0]
+                            pronunciation = self.normalize_pronunciation(pronunciation);
+                    if not combined_pronunciation:
+                        combined_pronunciation = pronunciation;
+                    else:
+                        combined_pronunciation = combined_pronunciation +"-"+ pronunciation
+                    # print (pronunciation);
+                    pronunciation = None
+
+                if combined_pronunciation is not None:
+                    pronunciation = combined_pronunciation;
+
+        else:
+            word = word_part
+            # If no pronunciation provided in input, try to look it up
+            if not pronunciation and self.ipa_uk_lookup:
+                pronunciations = self.get_pronunciation(word)
+                if pronunciations:
+                    pronunciation = pronunciations[0]
+                    pronunciation = self.normalize_pronunciation(pronunciation);
+        return WordEntry(
+            number=number,
+            word=word,
+            word_type=word_type,
+            meaning=meaning,
+            pronunciation=pronunciation,
+            irregular_forms=irregular_forms
+        )
+
+    def get_pronunciation(self,word):
+        first = self.ipa_uk_lookup.get_pronunciation(word);
+        if len(first) > 0:
+            return first;
+        return first;
+
+
+    def normalize_pronunciation(self, ipa_text: str) -> str:
+        ipa_text = unicodedata.normalize("NFC",ipa_text).strip("/").strip("/");
+        """
+        Normalize stress marks to the standard IPA vertical line.
+        """
+        # Different possible stress mark characters
+        stress_marks = {
+            '\u02C8',  # ˈ MODIFIER LETTER VERTICAL LINE (preferred IPA)
+            '\u0027',  # ' APOSTROPHE
+            '\u2032',  # ′ PRIME
+        }
+        # Replace all variants with the standard IPA stress mark
+        for mark in stress_marks:
+            ipa_text = ipa_text.replace(mark, 'ˈ')  # Using standard IPA stress mark
+
+        ipa_text = ipa_text.replace('ɫ','l')
+
+        return ipa_text
+    def parse_text(self, text: str) -> List[WordEntry]:
+        """Parse the entire text input"""
+        lines = [line for line in text.strip().split("\n") if line.strip()]
+        entries = []
+
+        for i, line in enumerate(lines, 1):
+            try:
+                entry = self.parse_line(line, i)
+                entries.append(entry)
+            except ValueError as e:
+                print(f"Warning: Skipping invalid line {i}: {e}")
+
+        return entries
+
+    def parse_deck(self, text: str, deck: Optional[Deck] = None) -> Deck:
+        """
+        Parse the entire text input into a compact Deck.
+
+        Lines are parsed one at a time straight into the deck's columns, so
+        large word banks never exist as a list of entry objects.
+
+        Args:
+            text: Word list text
+            deck: Deck to append to (default: a new one)
+        """
+        deck = deck if deck is not None else Deck()
+        lines = (line for line in text.strip().split("\n") if line.strip())
+        for i, line in enumerate(lines, 1):
+            try:
+                deck.append(self.parse_line(line, i))
+            except ValueError as e:
+                print(f"Warning: Skipping invalid line {i}: {e}")
+        return deck
@@ -0,0 +1,12 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def _work_dir(tmp_path, monkeypatch):
+    # Caches (cache/...) and generator folders are created relative to the working directory
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from EnhancedFlashcardGenerator import EnhancedFlashcardGenerator
+from WordEntry import WordEntry
+
+ENTRY = WordEntry(word='apple', word_type='n', meaning='quả táo', pronunciation='ˈæpl', number=1)
+
+
+def _render(tmp_path, layer, theme='green'):
+    generator = EnhancedFlashcardGenerator(str(tmp_path / f"{layer}_{theme}"))
+    generator.card_layer = layer
+    generator.set_theme(theme)
+    # No background image: the card starts from the theme's solid background color
+    path = generator.create_card_image(ENTRY, background_path='missing.jpg')
+    with Image.open(path) as card:
+        return generator, np.asarray(card.convert('RGB')).astype(int)
+
+
+def test_card_without_layer_is_flat(tmp_path):
+    generator, card = _render(tmp_path, None)
+    assert tuple(card[5, 5]) == generator.current_theme.bg_rgb
+    assert tuple(card[715, 5]) == generator.current_theme.bg_rgb
+
+
+def test_gradient_layer_tints_the_bottom_of_the_card(tmp_path):
+    generator, card = _render(tmp_path, 'gradient')
+    theme = generator.current_theme
+    assert tuple(card[5, 5]) == theme.bg_rgb  # transparent at the top
+    bottom = card[715, 5]
+    # Blended towards the secondary color at about 40/255
+    expected = np.array(theme.bg_rgb) + (np.array(theme.secondary_rgb) - theme.bg_rgb) * 40 / 255
+    assert np.abs(bottom - expected).max() <= 2
+
+
+def test_pattern_layer_draws_dots(tmp_path):
+    _, card = _render(tmp_path, 'pattern')
+    _, flat = _render(tmp_path, None)
+    # Away from the text, only the dots differ from the flat card
+    region = (slice(600, 720), slice(0, 200))
+    assert (card[region] != flat[region]).any()
@@ -0,0 +1,20 @@
+from DeckImporter import DeckImporter
+
+
+def _import(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    deck, report = DeckImporter().import_file(str(path))
+    assert not report.errors
+    return list(deck)
+
+
+def test_irregular_verb_imports_the_same_from_text_and_csv(tmp_path):
+    # No pronunciation, so the text parser walks the forms to look them up
+    text = _import(tmp_path, 'verbs.txt', "1. go - went - gone: (v) đi\n")
+    table = _import(tmp_path, 'verbs.csv', "word,type,meaning\ngo - went - gone,v,đi\n")
+
+    assert text[0].word == table[0].word == 'go - went - gone'
+    assert text[0].irregular_forms == table[0].irregular_forms == ['go', 'went', 'gone']
+    assert (text[0].word_type, text[0].meaning, text[0].pronunciation) == \
+        (table[0].word_type, table[0].meaning, table[0].pronunciation)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from moviepy.editor import ImageClip, concatenate_videoclips
+from moviepy.audio.AudioClip import AudioClip
+
+from EncodingProfiles import encode_clip, probe_duration
+
+
+def _tone(duration):
+    def make_frame(t):
+        if np.ndim(t):
+            return np.stack([np.sin(2 * np.pi * 440 * t)] * 2, axis=-1)
+        return [0, 0]
+    return AudioClip(make_frame, duration=duration, fps=44100)
+
+
+@pytest.mark.parametrize('profile', ['preview', 'classroom'])
+def test_still_outlasting_its_audio_keeps_its_length(tmp_path, profile):
+    # Two 3 s stills, narration only under the first second: mpdecimate
+    # drops the repeated frames, so the padded audio has to keep the length
+    first = ImageClip(np.zeros((72, 128, 3), np.uint8)).set_duration(3).set_audio(_tone(1))
+    second = ImageClip(np.full((72, 128, 3), 200, np.uint8)).set_duration(3)
+    clip = concatenate_videoclips([first, second], method="chain")
+
+    output_path = str(tmp_path / 'deck.mp4')
+    result = encode_clip(clip, output_path, profile, keyframe_times=[0.0, 3.0])
+
+    assert probe_duration(output_path) == pytest.approx(6.0, abs=0.15)
+    assert result.duration == pytest.approx(probe_duration(output_path))
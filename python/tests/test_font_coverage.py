@@ -0,0 +1,35 @@
+import os
+import shutil
+
+from FontCoverage import GlyphCoverage
+from FontRegistry import FontRecord
+
+DEJAVU = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+
+
+def _any_font():
+    if os.path.exists(DEJAVU):
+        return DEJAVU
+    from FontRegistry import get_font_registry
+    return get_font_registry().fonts[0].path
+
+
+class _Registry:
+    def __init__(self, fonts):
+        self.fonts = fonts
+
+
+def _record(path):
+    return FontRecord(path=path, family='Test', style='Regular', mtime=0.0)
+
+
+def test_stale_registry_entry_does_not_break_the_fallback(tmp_path):
+    font_path = str(tmp_path / 'font.ttf')
+    shutil.copy(_any_font(), font_path)
+    stale = str(tmp_path / 'deleted.ttf')
+    registry = _Registry([_record(stale), _record(font_path)])
+
+    coverage = GlyphCoverage(registry, str(tmp_path / 'coverage.json'))
+    assert coverage.font_for('abc') == font_path
+    # A preferred font that no longer exists is skipped too
+    assert coverage.font_for('xyz', (stale,)) == font_path
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageFont
+
+from EnhancedFlashcardGenerator import EnhancedFlashcardGenerator
+from TextRasterCache import get_text_cache
+
+
+@pytest.fixture
+def generator(tmp_path):
+    generator = EnhancedFlashcardGenerator(str(tmp_path / "cards"))
+    generator.set_theme('green')
+    font = generator.font_for('Shadow', 72)
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        pytest.skip("No FreeType font installed")
+    return generator
+
+
+def _card(generator):
+    return Image.new('RGB', (400, 200), generator.current_theme.bg_rgb)
+
+
+def test_shadow_is_drawn_from_the_text_cache(generator):
+    theme = generator.current_theme
+    font = generator.font_for('Shadow', 72)
+    stats = get_text_cache().stats
+    misses = stats.misses
+
+    first, second = _card(generator), _card(generator)
+    generator.draw_text_with_shadow(first, (200, 100), 'Shadow', font, theme.text)
+    hits = stats.hits
+    generator.draw_text_with_shadow(second, (200, 100), 'Shadow', font, theme.text)
+
+    assert stats.misses == misses + 1
+    assert stats.hits == hits + 1
+    assert np.array_equal(np.asarray(first), np.asarray(second))
+    assert (np.asarray(first) == theme.shadow_rgb).all(axis=-1).any()
+
+
+def test_highlight_box_surrounds_the_text(generator):
+    theme = generator.current_theme
+    font = generator.font_for('Mark', 48)
+    img = _card(generator)
+    generator.draw_text_with_highlight(img, (200, 100), 'Mark', font, theme.text, theme.bg)
+
+    left, _, right, _ = font.getbbox('Mark', anchor='mm')
+    # Inside the 20 px padding, left of the text
+    assert img.getpixel((200 + int(left) - 10, 100)) == theme.highlight_rgb
+    assert img.getpixel((5, 5)) == theme.bg_rgb
@@ -0,0 +1,27 @@
+import DeckRenderer
+from DeckRenderer import render_variants
+
+
+def _render(monkeypatch, variants):
+    monkeypatch.setattr(DeckRenderer, 'load_ipa_lookup', lambda: None)
+    return render_variants('unit', 'out', variants, include_intro=False)
+
+
+def test_variants_differing_in_word_type_are_rejected(monkeypatch):
+    results = _render(monkeypatch, {
+        'vi': "1. record: (n) hồ sơ /ˈrek.ɔːd/\n",
+        'en': "1. record: (v) to store information /ˈrek.ɔːd/\n",
+    })
+
+    assert [r.status for r in results] == ['failed', 'failed']
+    assert "Variant 'en' does not list the same words" in results[1].error
+
+
+def test_variants_differing_in_irregular_forms_are_rejected(monkeypatch):
+    results = _render(monkeypatch, {
+        'vi': "1. learn - learnt - learnt: (v) học /lɜːn/\n",
+        'en': "1. learn - learned - learned: (v) to study /lɜːn/\n",
+    })
+
+    assert all(r.status == 'failed' for r in results)
+    assert "Variant 'en' does not list the same words" in results[0].error
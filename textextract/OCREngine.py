@@ -0,0 +1,143 @@
+import importlib.util
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+
+try:
+    import pytesseract
+except ImportError:  # Only needed by the command line backend
+    pytesseract = None
+
+BACKENDS = ['auto', 'tesserocr', 'pytesseract']
+
+# Page segmentation / engine mode and variables used for every page
+DEFAULT_PSM = 6  # Single uniform block of text
+DEFAULT_OEM = 3  # Default engine (LSTM when available)
+DEFAULT_VARIABLES = {'preserve_interword_spaces': '1'}
+
+
+class OCREngine(ABC):
+    """Turns a PIL image into text; backends keep whatever state makes repeated pages cheap"""
+    name = 'base'
+
+    @abstractmethod
+    def image_to_string(self, img, lang='eng'):
+        """Text of one page image"""
+
+    def warm_up(self, lang='eng'):
+        """Load what the first page would otherwise load (e.g. language models)"""
+
+    def close(self):
+        """Release native resources"""
+
+
+class TesserocrEngine(OCREngine):
+    """
+    Tesseract in this process through its C API (tesserocr).
+
+    One API instance per language is initialized on first use and kept
+    warm, so language models load once per process and every page costs
+    only recognition time instead of a tesseract process start.
+    """
+    name = 'tesserocr'
+
+    def __init__(self, tessdata_path=None, psm=DEFAULT_PSM, oem=DEFAULT_OEM, variables=None):
+        # Imported here, not at module level: OpenMP reads OMP_THREAD_LIMIT
+        # when Tesseract is loaded, which has to happen after a worker sets it
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.tessdata_path = tessdata_path
+        self.psm = psm
+        self.oem = oem
+        self.variables = DEFAULT_VARIABLES if variables is None else variables
+        self._apis = {}
+        # An API instance must not be used by two threads at once
+        self._lock = threading.Lock()
+
+    def _api(self, lang):
+        api = self._apis.get(lang)
+        if api is None:
+            options = {'lang': lang, 'psm': self.psm, 'oem': self.oem}
+            if self.tessdata_path:
+                options['path'] = self.tessdata_path
+            api = self._tesserocr.PyTessBaseAPI(**options)
+            for name, value in self.variables.items():
+                api.SetVariable(name, value)
+            self._apis[lang] = api
+        return api
+
+    def image_to_string(self, img, lang='eng'):
+        with self._lock:
+            api = self._api(lang)
+            api.SetImage(img)
+            return api.GetUTF8Text()
+
+    def warm_up(self, lang='eng'):
+        with self._lock:
+            self._api(lang)
+
+    def close(self):
+        with self._lock:
+            for api in self._apis.values():
+                api.End()
+            self._apis.clear()
+
+
+class PytesseractEngine(OCREngine):
+    """Tesseract command line through pytesseract (one process per page)"""
+    name = 'pytesseract'
+
+    def __init__(self, tesseract_path=None, psm=DEFAULT_PSM, oem=DEFAULT_OEM, variables=None):
+        if pytesseract is None:
+            raise RuntimeError("pytesseract is not installed: pip install pytesseract")
+        if tesseract_path:
+            if not os.path.exists(tesseract_path):
+                raise FileNotFoundError(f"Tesseract not found at: {tesseract_path}")
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        variables = DEFAULT_VARIABLES if variables is None else variables
+        self.config = f"--oem {oem} --psm {psm}" + "".join(
+            f" -c {name}={value}" for name, value in variables.items())
+
+    def image_to_string(self, img, lang='eng'):
+        return pytesseract.image_to_string(img, lang=lang, config=self.config)
+
+
+def tessdata_dir(tesseract_path):
+    """tessdata folder installed next to a tesseract executable, if any"""
+    if not tesseract_path:
+        return None
+    path = os.path.join(os.path.dirname(tesseract_path), 'tessdata')
+    return path if os.path.isdir(path) else None
+
+
+def create_engine(backend='auto', tesseract_path=None, lang='eng'):
+    """
+    Create an OCR engine.
+
+    Args:
+        backend: 'tesserocr' (warm in-process API), 'pytesseract' (command
+                 line) or 'auto' (tesserocr when installed and able to load
+                 lang, otherwise pytesseract)
+        tesseract_path: tesseract executable; its tessdata folder is also
+                        used by the in-process backend
+        lang: Language loaded ahead of the first page
+
+    Returns:
+        An OCREngine
+    """
+    logger = logging.getLogger(__name__)
+    if backend not in BACKENDS:
+        raise ValueError(f"OCR backend '{backend}' not found. Available backends: {BACKENDS}")
+
+    if backend == 'tesserocr' or (backend == 'auto' and importlib.util.find_spec('tesserocr')):
+        try:
+            engine = TesserocrEngine(tessdata_dir(tesseract_path))
+            engine.warm_up(lang)
+            return engine
+        except Exception as e:
+            if backend == 'tesserocr':
+                raise
+            logger.warning(f"tesserocr unavailable ({str(e)}), falling back to pytesseract")
+
+    return PytesseractEngine(tesseract_path)
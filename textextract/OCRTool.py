@@ -1,23 +1,83 @@
 import os
 import sys
-import pytesseract
+import multiprocessing
+import multiprocessing.util
 from PIL import Image
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import re
+from OCREngine import create_engine
+
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']
+
+# OCR tool of a worker process, created once by _init_worker
+_worker_tool = None
+
+
+def _init_worker(tesseract_path, backend, thread_limit):
+    """Process pool initializer: one warm OCR tool per worker, Tesseract limited to its share of cores"""
+    global _worker_tool
+    os.environ['OMP_THREAD_LIMIT'] = str(thread_limit)
+    _worker_tool = OCRTool(tesseract_path, backend)
+    _worker_tool.engine  # Load the engine now rather than on the worker's first page
+    # Pool workers leave through os._exit, which skips atexit but runs these finalizers
+    multiprocessing.util.Finalize(_worker_tool, _worker_tool.close, exitpriority=10)
 
-class OCRTool:
-    def __init__(self, tesseract_path=r"C:\Program Files\Tesseract-OCR\tesseract.exe"):
-        """Initialize OCR tool with Tesseract path"""
-        if not os.path.exists(tesseract_path):
-            raise FileNotFoundError(f"Tesseract not found at: {tesseract_path}")
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
 
+def _extract_in_worker(job):
+    image_path, lang = job
+    return _worker_tool.extract_text(image_path, lang)
+
+
+def _natural_key(path):
+    """Sort key placing page2 before page10"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', path.name)]
+
+class OCRTool:
+    def __init__(self, tesseract_path=r"C:\Program Files\Tesseract-OCR\tesseract.exe", backend='auto'):
+        """
+        Initialize OCR tool with Tesseract path
+
+        Args:
+            tesseract_path: tesseract executable (required by the pytesseract backend)
+            backend: 'auto', 'tesserocr' or 'pytesseract' (see OCREngine.create_engine)
+        """
         # Set up logging
         logging.basicConfig(level=logging.INFO,
                           format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
+        # Engine (and, for tesserocr, its language model) is loaded once and reused per page
+        self.tesseract_path = tesseract_path
+        self.backend = backend
+        self._engine = None
+
+    @property
+    def engine(self):
+        """OCR engine, created on first use (never in a process that only hands pages to workers)"""
+        if self._engine is None:
+            self._engine = create_engine(self.backend, self.tesseract_path)
+        return self._engine
+
+    def close(self):
+        """Release the OCR engine (e.g. tesserocr's loaded language models)"""
+        engine, self._engine = getattr(self, '_engine', None), None
+        if engine is not None:
+            engine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def preprocess_image(self, image_path):
         """Preprocess image for better OCR results"""
         try:
@@ -94,17 +154,14 @@ class OCRTool:
                 raise FileNotFoundError(f"Image file not found: {image_path}")
 
             # Check file extension
-            if path.suffix.lower() not in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
+            if path.suffix.lower() not in IMAGE_EXTENSIONS:
                 raise ValueError(f"Unsupported file format: {path.suffix}")
 
             # Preprocess the image
             img = self.preprocess_image(image_path)
 
-            # Configure OCR parameters for better results
-            custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
-
-            # Perform OCR
-            text = pytesseract.image_to_string(img, lang=lang, config=custom_config)
+            # Perform OCR (--oem 3 --psm 6, preserving interword spaces)
+            text = self.engine.image_to_string(img, lang=lang)
 
             # Format the text
             text = self.format_text(text)
@@ -116,23 +173,59 @@ class OCRTool:
             self.logger.error(f"Error processing {image_path}: {str(e)}")
             return f"Error: {str(e)}"
 
-    def extract_from_directory(self, directory, extensions=None):
-        """Extract text from all images in a directory"""
-        if extensions is None:
-            extensions = ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']
+    def list_images(self, directory, extensions=None):
+        """Images in a directory (one listing, any extension case), in natural page order"""
+        extensions = {ext.lower() for ext in (extensions or IMAGE_EXTENSIONS)}
 
         directory_path = Path(directory)
         if not directory_path.is_dir():
             raise NotADirectoryError(f"Directory not found: {directory}")
 
-        results = {}
-        for ext in extensions:
-            for file_path in directory_path.glob(f"*{ext}"):
-                try:
-                    text = self.extract_text(str(file_path))
-                    results[file_path.name] = text
-                except Exception as e:
-                    results[file_path.name] = f"Error: {str(e)}"
-                    self.logger.error(f"Failed to process {file_path}: {str(e)}")
-
-        return results
\ No newline at end of file
+        files = [path for path in directory_path.iterdir()
+                 if path.is_file() and path.suffix.lower() in extensions]
+        return sorted(files, key=_natural_key)
+
+    @staticmethod
+    def default_workers():
+        """
+        Worker processes for parallel OCR: one per core, divided by the
+        threads each Tesseract may use (OMP_THREAD_LIMIT, default 1)
+        """
+        thread_limit = int(os.environ.get('OMP_THREAD_LIMIT', '1') or 1)
+        return max(1, (os.cpu_count() or 1) // max(1, thread_limit))
+
+    def iter_directory(self, directory, extensions=None, lang='eng', workers=None):
+        """
+        Extract text from all images in a directory, yielding pages as they complete.
+
+        Args:
+            directory: Folder of page images
+            extensions: Image extensions to include (default: all supported)
+            lang: OCR language
+            workers: Worker processes (default: default_workers(); 1 runs in this process)
+
+        Yields:
+            (file name, text) in page order; a page is yielded as soon as it
+            and every page before it are done
+        """
+        files = self.list_images(directory, extensions)
+        workers = min(workers or self.default_workers(), max(1, len(files)))
+
+        if workers == 1:
+            for file_path in files:
+                yield file_path.name, self.extract_text(str(file_path), lang)
+            return
+
+        thread_limit = max(1, int(os.environ.get('OMP_THREAD_LIMIT', '1') or 1))
+        # Spawned workers load Tesseract after _init_worker sets their thread limit
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(self.tesseract_path, self.backend, thread_limit)) as executor:
+            jobs = [(str(file_path), lang) for file_path in files]
+            # map() yields in submission order while later pages keep running
+            for file_path, text in zip(files, executor.map(_extract_in_worker, jobs)):
+                yield file_path.name, text
+
+    def extract_from_directory(self, directory, extensions=None, lang='eng', workers=1):
+        """Extract text from all images in a directory"""
+        return dict(self.iter_directory(directory, extensions, lang, workers))
\ No newline at end of file
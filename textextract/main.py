@@ -6,6 +6,7 @@ import argparse
 import logging
 from pathlib import Path
 from OCRTool import OCRTool
+from OCREngine import BACKENDS
 
 def test_installation():
     """Test Tesseract installation and print version info"""
@@ -22,44 +23,59 @@ def main():
     parser.add_argument('input', help='Image file or directory path')
     parser.add_argument('--lang', default='eng', help='OCR language (default: eng)')
     parser.add_argument('--test', action='store_true', help='Test Tesseract installation')
+    parser.add_argument('--backend', choices=BACKENDS, default='auto',
+                        help='OCR backend: warm in-process tesserocr or the pytesseract command line (default: auto)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel OCR processes for a directory (default: one per core)')
+    parser.add_argument('--output', default=None,
+                        help='Folder to save each page\'s text to as it completes')
     args = parser.parse_args()
 
     if args.test:
         test_installation()
+        try:
+            with OCRTool(backend=args.backend) as ocr:
+                print(f"OCR backend: {ocr.engine.name}")
+        except Exception as e:
+            print(f"OCR backend unavailable: {str(e)}")
         return
 
     try:
-        ocr = OCRTool()
+        with OCRTool(backend=args.backend) as ocr:
+            input_path = Path(args.input)
 
-        input_path = Path(args.input)
-
-        if input_path.is_file():
-            # Process single file
-            text = ocr.extract_text(str(input_path), args.lang)
-            if not text.startswith("Error:"):
-                print(f"\nExtracted text from {input_path.name}:")
-                print("-" * 50)
-                print(text)
-                print("-" * 50)
-            else:
-                print(f"\nError processing {input_path.name}:")
-                print(text)
-
-        elif input_path.is_dir():
-            # Process directory
-            results = ocr.extract_from_directory(str(input_path))
-            for filename, text in results.items():
+            if input_path.is_file():
+                # Process single file
+                text = ocr.extract_text(str(input_path), args.lang)
                 if not text.startswith("Error:"):
-                    print(f"\nFile: {filename}")
+                    print(f"\nExtracted text from {input_path.name}:")
                     print("-" * 50)
                     print(text)
                     print("-" * 50)
                 else:
-                    print(f"\nError processing {filename}:")
+                    print(f"\nError processing {input_path.name}:")
                     print(text)
 
-        else:
-            print(f"Error: '{args.input}' is not a valid file or directory")
+            elif input_path.is_dir():
+                # Process directory, printing (and saving) pages in order as they complete
+                if args.output:
+                    os.makedirs(args.output, exist_ok=True)
+                results = ocr.iter_directory(str(input_path), lang=args.lang, workers=args.workers)
+                for filename, text in results:
+                    if not text.startswith("Error:"):
+                        if args.output:
+                            output_path = Path(args.output) / f"{Path(filename).stem}.txt"
+                            output_path.write_text(text, encoding='utf-8')
+                        print(f"\nFile: {filename}")
+                        print("-" * 50)
+                        print(text)
+                        print("-" * 50)
+                    else:
+                        print(f"\nError processing {filename}:")
+                        print(text)
+
+            else:
+                print(f"Error: '{args.input}' is not a valid file or directory")
 
     except Exception as e:
         print(f"Error: {str(e)}")